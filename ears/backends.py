@@ -0,0 +1,106 @@
+"""Speech-to-text backends for WhisperManager.
+
+Each loader returns a WhisperBackend whose `model` exposes the HuggingFace
+`generate(input_features, ...)` interface, so WhisperManager.decode_batch
+works the same way whichever backend is selected:
+
+- torch: fp32 PyTorch model, on CUDA when available
+- int8:  PyTorch model with dynamically quantized int8 Linear layers (CPU)
+- onnx:  encoder/decoder exported once to ONNX and run with ONNX Runtime (CPU)
+"""
+import logging
+from pathlib import Path
+
+import torch
+from transformers import WhisperProcessor, WhisperForConditionalGeneration
+
+BACKENDS = ("torch", "int8", "onnx")
+# Weight precision of each backend; only torch can be switched (e.g. float16 on GPU)
+DEFAULT_DTYPES = {"torch": "float32", "int8": "int8", "onnx": "float32"}
+ONNX_CACHE_DIR = Path("model_cache") / "onnx"
+
+
+class WhisperBackend:
+    def __init__(self, name, processor, model, device, export_dir=None):
+        self.name = name
+        self.processor = processor
+        self.model = model
+        self.device = device
+        self.export_dir = export_dir  # Where exported graphs live (onnx only)
+
+
+def _load_torch(model_name, dtype):
+    processor = WhisperProcessor.from_pretrained(model_name)
+    model = WhisperForConditionalGeneration.from_pretrained(model_name)
+    device = "cpu"
+
+    # Use GPU if available
+    if torch.cuda.is_available():
+        model = model.to("cuda")
+        device = "cuda"
+        logging.info("Using CUDA for Whisper model")
+    if dtype != "float32":
+        model = model.to(getattr(torch, dtype))
+    return WhisperBackend("torch", processor, model.eval(), device)
+
+
+def _load_int8(model_name, dtype):
+    processor = WhisperProcessor.from_pretrained(model_name)
+    model = WhisperForConditionalGeneration.from_pretrained(model_name).eval()
+
+    # Weights stored as int8, activations quantized on the fly; CPU only
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    logging.info("Using int8 dynamically quantized Whisper model")
+    return WhisperBackend("int8", processor, model, "cpu")
+
+
+def onnx_export_dir(model_name):
+    return ONNX_CACHE_DIR / model_name.replace("/", "--")
+
+
+def _load_onnx(model_name, dtype):
+    try:
+        from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+    except ImportError as e:
+        raise ImportError(
+            "The onnx backend needs optimum[onnxruntime]: pip install optimum[onnxruntime]"
+        ) from e
+
+    processor = WhisperProcessor.from_pretrained(model_name)
+    export_dir = onnx_export_dir(model_name)
+
+    if (export_dir / "config.json").exists():
+        model = ORTModelForSpeechSeq2Seq.from_pretrained(export_dir, provider="CPUExecutionProvider")
+    else:
+        # One-shot export of encoder and decoder graphs, cached for later runs
+        logging.info(f"Exporting {model_name} to ONNX at {export_dir} (first run only)")
+        model = ORTModelForSpeechSeq2Seq.from_pretrained(
+            model_name, export=True, provider="CPUExecutionProvider"
+        )
+        export_dir.mkdir(parents=True, exist_ok=True)
+        model.save_pretrained(export_dir)
+    logging.info("Using ONNX Runtime Whisper model")
+    return WhisperBackend("onnx", processor, model, "cpu", export_dir=export_dir)
+
+
+_LOADERS = {
+    "torch": _load_torch,
+    "int8": _load_int8,
+    "onnx": _load_onnx,
+}
+
+
+def resolve_dtype(name, dtype=None):
+    """Validate a backend/dtype pair, filling in the backend's default precision"""
+    if name not in _LOADERS:
+        raise ValueError(f"Unknown STT backend '{name}', expected one of {BACKENDS}")
+    if dtype is None:
+        return DEFAULT_DTYPES[name]
+    if name != "torch" and dtype != DEFAULT_DTYPES[name]:
+        raise ValueError(f"The {name} backend does not support dtype '{dtype}'")
+    return dtype
+
+
+def load_backend(name, model_name="openai/whisper-small", dtype=None):
+    """Load processor and model for the named backend"""
+    return _LOADERS[name](model_name, resolve_dtype(name, dtype))
@@ -0,0 +1,50 @@
+import numpy as np
+import torch
+
+
+class LogMelExtractor:
+    """Whisper log-mel features without re-running the full 30 s STFT.
+
+    Produces the same `input_features` as the HuggingFace
+    WhisperFeatureExtractor: audio is zero-padded (or cut) to the model's
+    30 s window, then a centered Hann STFT, mel projection, log10, an 8 dB
+    dynamic range clamp under the clip's peak and (x + 4) / 4 scaling.
+
+    The Hann window and mel filterbank are built once as tensors. Because the
+    padding is silence, frames past the end of the audio always have zero
+    power, so the STFT only runs over the real audio (plus one window of
+    padding) and the remaining frames are filled with the clamp value.
+    """
+
+    def __init__(self, feature_extractor):
+        # Match whichever Whisper variant the processor was loaded for
+        self.n_fft = feature_extractor.n_fft
+        self.hop_length = feature_extractor.hop_length
+        self.n_samples = feature_extractor.n_samples
+        self.n_frames = feature_extractor.nb_max_frames
+        self.window = torch.hann_window(self.n_fft)
+        self.mel_filters = torch.from_numpy(np.asarray(feature_extractor.mel_filters, dtype=np.float32)).T.contiguous()
+
+    def __call__(self, audio_arrays):
+        """(batch, n_mels, n_frames) float32 tensor for a list of 16 kHz arrays"""
+        with torch.inference_mode():
+            return torch.stack([self._extract(audio) for audio in audio_arrays])
+
+    def _extract(self, audio):
+        audio = torch.from_numpy(np.asarray(audio, dtype=np.float32).reshape(-1)[:self.n_samples])
+
+        # Enough trailing zeros that the centered STFT's reflect padding only
+        # ever mirrors silence, exactly as in the full-length signal
+        length = min(self.n_samples, audio.numel() + self.n_fft)
+        padded = torch.zeros(length)
+        padded[:audio.numel()] = audio
+
+        stft = torch.stft(padded, self.n_fft, self.hop_length, window=self.window, return_complex=True)
+        power = stft.abs() ** 2
+        frames = min(power.shape[1], self.n_frames)
+
+        mel = torch.zeros(self.mel_filters.shape[0], self.n_frames)
+        mel[:, :frames] = self.mel_filters @ power[:, :frames]
+        log_spec = torch.clamp(mel, min=1e-10).log10()
+        log_spec = torch.maximum(log_spec, log_spec.max() - 8.0)
+        return (log_spec + 4.0) / 4.0
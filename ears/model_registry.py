@@ -0,0 +1,115 @@
+"""Process-wide registry so each STT model is loaded once and shared.
+
+Every WhisperManager acquires its backend here instead of loading its own
+copy. Entries are keyed on (model name, backend, dtype), reference-counted,
+and dropped when the last user releases them.
+"""
+import logging
+import os
+import threading
+from pathlib import Path
+
+import torch
+
+from ears.backends import load_backend, resolve_dtype
+
+
+class _Entry:
+    def __init__(self, key):
+        self.key = key
+        self.backend = None
+        self.refcount = 0
+        self.load_lock = threading.Lock()  # Held while this entry loads
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def key(self, model_name, backend="torch", dtype=None):
+        """Registry key with the backend's default dtype filled in"""
+        return (model_name, backend, resolve_dtype(backend, dtype))
+
+    def acquire(self, model_name, backend="torch", dtype=None):
+        """Return the shared backend for this key, loading it on first use"""
+        key = self.key(model_name, backend, dtype)
+        model_name, backend, dtype = key
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(key)
+            entry.refcount += 1
+
+        # Load outside the registry lock so other keys aren't blocked
+        try:
+            with entry.load_lock:
+                if entry.backend is None:
+                    logging.info(f"Loading STT model {key}")
+                    entry.backend = load_backend(backend, model_name, dtype)
+                else:
+                    logging.info(f"Reusing loaded STT model {key} (users: {entry.refcount})")
+        except Exception:
+            self.release(model_name, backend, dtype)
+            raise
+        return entry.backend
+
+    def release(self, model_name, backend="torch", dtype=None):
+        """Drop one reference; the model is freed once nobody uses it"""
+        key = self.key(model_name, backend, dtype)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refcount -= 1
+            if entry.refcount > 0:
+                return
+            del self._entries[key]
+        logging.info(f"Unloaded STT model {key}")
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def report(self):
+        """Describe what is resident: one dict per loaded model plus process RSS"""
+        with self._lock:
+            entries = [e for e in self._entries.values() if e.backend is not None]
+            models = [{
+                "model": e.key[0],
+                "backend": e.key[1],
+                "dtype": e.key[2],
+                "device": e.backend.device,
+                "users": e.refcount,
+                "weight_bytes": _weight_bytes(e.backend)
+            } for e in entries]
+        return {
+            "models": models,
+            "total_weight_bytes": sum(m["weight_bytes"] for m in models),
+            "process_rss_bytes": _process_rss()
+        }
+
+
+def _weight_bytes(backend):
+    if backend.name == "onnx":
+        # ONNX Runtime owns the weights; the exported graphs are a close proxy
+        return sum(f.stat().st_size for f in Path(backend.export_dir).glob("*.onnx*"))
+    tensors = list(backend.model.parameters()) + list(backend.model.buffers())
+    total = sum(t.numel() * t.element_size() for t in tensors)
+    # Dynamically quantized Linear layers keep their packed weights outside parameters()
+    for module in backend.model.modules():
+        if isinstance(module, torch.ao.nn.quantized.dynamic.Linear):
+            weight, bias = module._weight_bias()
+            total += weight.numel() * weight.element_size()
+            if bias is not None:
+                total += bias.numel() * bias.element_size()
+    return total
+
+
+def _process_rss():
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss
+    except ImportError:
+        return None
+
+
+registry = ModelRegistry()
@@ -0,0 +1,111 @@
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+import scipy.signal
+
+
+@lru_cache(maxsize=8)
+def polyphase_filter(up, down, half_width=10, beta=8.0):
+    """Design the Kaiser-windowed sinc anti-aliasing FIR for an up/down ratio.
+
+    Returns (taps, taps_per_phase, delay) where delay is the group delay in
+    upsampled samples. Cached per rate pair, so resamplers share one design.
+    """
+    cutoff = 1.0 / max(up, down)
+    num_taps = 2 * half_width * max(up, down) + 1
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    taps = (cutoff * np.sinc(cutoff * n) * np.kaiser(num_taps, beta) * up).astype(np.float32)
+    taps.setflags(write=False)  # Shared between resamplers via the cache
+    return taps, -(-num_taps // up), (num_taps - 1) // 2
+
+
+class PolyphaseResampler:
+    """Stateful rational-ratio resampler that can be fed block by block.
+
+    Output sample n corresponds to input time n * down / up; the filter's
+    group delay is compensated so a flushed stream lines up with the input
+    and has ceil(len(input) * up / down) samples.
+    """
+
+    def __init__(self, orig_sample_rate, target_sample_rate):
+        orig_sample_rate = int(orig_sample_rate)
+        target_sample_rate = int(target_sample_rate)
+        divisor = gcd(orig_sample_rate, target_sample_rate)
+        self.up = target_sample_rate // divisor
+        self.down = orig_sample_rate // divisor
+        self.taps, self.taps_per_phase, self.delay = polyphase_filter(self.up, self.down)
+        # up is invertible mod down, used to align upfirdn's output grid with ours
+        self._up_inverse = pow(self.up, -1, self.down) if self.down > 1 else 0
+        self.reset()
+
+    def reset(self):
+        """Clear stream state"""
+        # History holds the last taps_per_phase - 1 inputs before `self.consumed`
+        self.history = np.zeros(self.taps_per_phase - 1, dtype=np.float32)
+        self.consumed = 0  # Input samples seen
+        self.produced = 0  # Output samples emitted
+        self.flushed = False
+
+    def _ready_outputs(self, available):
+        """Number of outputs whose newest input sample is below `available`"""
+        # Output n needs input index (n * down + delay) // up
+        last = (available * self.up - self.delay - 1) // self.down
+        return max(0, last + 1 - self.produced)
+
+    def process(self, block, final=False):
+        """Feed a block of input samples and return every output now computable"""
+        if self.flushed:
+            raise RuntimeError("Resampler was flushed; call reset() before reuse")
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        if self.up == self.down:
+            if final:
+                self.flushed = True
+            return block.copy()
+
+        total_in = self.consumed + block.size
+        if final:
+            expected = -(-total_in * self.up // self.down)
+            # Zero lookahead so the last outputs see a full filter
+            block = np.concatenate([block, np.zeros(self.delay // self.up + 1, dtype=np.float32)])
+
+        available = self.consumed + block.size
+        count = max(0, expected - self.produced) if final else self._ready_outputs(available)
+
+        if count:
+            # Output n sits at upsampled position n * down + delay. upfirdn only
+            # emits positions that are multiples of `down` from its first input,
+            # so prepend `pad` zeros to land our grid on its grid.
+            base = self.consumed - self.history.size  # Absolute index of history[0]
+            offset = self.produced * self.down + self.delay - base * self.up
+            pad = (-offset * self._up_inverse) % self.down
+            first = (offset + pad * self.up) // self.down
+            # Inputs up to the newest sample the last output needs
+            last_input = ((self.produced + count - 1) * self.down + self.delay) // self.up - base + 1
+            extended = np.concatenate([np.zeros(pad, dtype=np.float32), self.history, block[:last_input - self.history.size]])
+            out = scipy.signal.upfirdn(self.taps, extended, self.up, self.down)[first:first + count]
+            out = out.astype(np.float32, copy=False)
+        else:
+            out = np.zeros(0, dtype=np.float32)
+
+        self.produced += count
+        if final:
+            self.flushed = True
+        else:
+            self.consumed = available
+            keep = self.taps_per_phase - 1
+            joined = np.concatenate([self.history, block])
+            self.history = joined[joined.size - keep:].copy()
+        return out
+
+    def flush(self):
+        """Emit the remaining outputs for the samples fed so far"""
+        return self.process(np.zeros(0, dtype=np.float32), final=True)
+
+
+def resample(audio_array, orig_sample_rate, target_sample_rate):
+    """One-shot polyphase resampling of a whole segment"""
+    if int(orig_sample_rate) == int(target_sample_rate):
+        return np.asarray(audio_array, dtype=np.float32)
+    resampler = PolyphaseResampler(orig_sample_rate, target_sample_rate)
+    return resampler.process(audio_array, final=True)
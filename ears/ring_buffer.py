@@ -0,0 +1,73 @@
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Fixed-capacity float32 ring buffer for mono capture audio.
+
+    Every sample is written twice (at ``i`` and ``i + capacity``) so any window
+    of up to ``capacity`` samples is a contiguous slice of the backing array.
+    That lets ``view`` hand out segments without copying or concatenating.
+
+    Positions are absolute sample counts since the last ``reset``. A view stays
+    valid until the write position moves more than ``capacity`` samples past
+    its start, so size the buffer with headroom over the longest segment.
+    """
+
+    def __init__(self, capacity):
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+        self.capacity = int(capacity)
+        self._data = np.zeros(2 * self.capacity, dtype=np.float32)
+        self.position = 0
+
+    def reset(self):
+        """Forget all history without reallocating"""
+        self.position = 0
+
+    @property
+    def oldest_position(self):
+        """Oldest absolute position still held in the buffer"""
+        return max(0, self.position - self.capacity)
+
+    def write(self, block):
+        """Append a block of mono samples with slice copies"""
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        n = block.size
+        if n == 0:
+            return self.position
+
+        # Only the newest `capacity` samples can survive the write
+        if n > self.capacity:
+            self.position += n - self.capacity
+            block = block[-self.capacity:]
+            n = self.capacity
+
+        start = self.position % self.capacity
+        first = min(n, self.capacity - start)
+
+        # Primary copy
+        self._data[start:start + first] = block[:first]
+        self._data[:n - first] = block[first:]
+        # Mirror copy so reads never have to wrap
+        self._data[start + self.capacity:start + self.capacity + first] = block[:first]
+        self._data[self.capacity:self.capacity + n - first] = block[first:]
+
+        self.position += n
+        return self.position
+
+    def view(self, start, end=None):
+        """Return a zero-copy view of samples in [start, end)"""
+        if end is None:
+            end = self.position
+        if start < self.oldest_position or end > self.position or start > end:
+            raise IndexError(
+                f"Requested [{start}, {end}) outside buffered range "
+                f"[{self.oldest_position}, {self.position})"
+            )
+        offset = start % self.capacity
+        return self._data[offset:offset + (end - start)]
+
+    def latest(self, num_samples):
+        """Return a view of the most recent `num_samples` (or fewer if not yet written)"""
+        start = max(self.oldest_position, self.position - int(num_samples))
+        return self.view(start)
@@ -0,0 +1,140 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+
+class SegmentWriter:
+    """Persists captured speech segments on a background thread.
+
+    `submit` picks the file name up front and returns immediately, so the
+    capture path never waits on the disk. Segments are peak-normalized and
+    encoded as FLAC (16-bit) by default. Retention keeps the directory under
+    `max_total_bytes` and drops files older than `max_age_seconds`.
+    """
+
+    def __init__(self, directory="whisper_audio", enabled=True, file_format="FLAC", subtype="PCM_16",
+                 max_age_seconds=7 * 24 * 3600, max_total_bytes=2 * 1024 ** 3, max_pending=32):
+        self.directory = Path(directory)
+        self.enabled = enabled
+        self.file_format = file_format
+        self.subtype = subtype
+        self.extension = ".flac" if file_format.upper() == "FLAC" else ".wav"
+        self.max_age_seconds = max_age_seconds
+        self.max_total_bytes = max_total_bytes
+
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.dropped = 0  # Segments skipped because the writer was behind
+        self._written = {}  # path -> Event set once the file is on disk (or failed)
+        self._written_lock = threading.Lock()
+        self._files = deque()  # (path, size, mtime), oldest first
+        self._total_bytes = 0
+
+        self.thread = None
+        if self.enabled:
+            self.directory.mkdir(exist_ok=True)
+            self._scan_existing()
+            self.thread = threading.Thread(target=self._run, name="segment-writer", daemon=True)
+            self.thread.start()
+
+    def _scan_existing(self):
+        files = []
+        for path in self.directory.glob("whisper_segment_*"):
+            try:
+                stat = path.stat()
+                files.append((str(path), stat.st_size, stat.st_mtime))
+            except OSError:
+                continue
+        files.sort(key=lambda f: f[2])
+        self._files.extend(files)
+        self._total_bytes = sum(f[1] for f in files)
+        self._apply_retention()
+
+    def submit(self, audio_array, sample_rate):
+        """Queue a segment for writing; returns its future path, or None if not persisted"""
+        if not self.enabled:
+            return None
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        path = str(self.directory / f"whisper_segment_{timestamp}{self.extension}")
+        done = threading.Event()
+        with self._written_lock:
+            self._written[path] = done
+        try:
+            # The array may be a ring buffer view; copy so later writes can't alter it
+            self.pending.put_nowait((path, np.array(audio_array, dtype=np.float32), sample_rate))
+        except queue.Full:
+            self.dropped += 1
+            logging.warning(f"Segment writer behind, not saving segment ({self.dropped} dropped)")
+            with self._written_lock:
+                self._written.pop(path, None)
+            return None
+        return path
+
+    def wait_for(self, path, timeout=2.0):
+        """Block until `path` has been written; returns False if it never will be in time"""
+        if path is None:
+            return False
+        with self._written_lock:
+            done = self._written.get(path)
+        if done is None:
+            return Path(path).exists()
+        return done.wait(timeout) and Path(path).exists()
+
+    def _run(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            path, audio_array, sample_rate = item
+            try:
+                peak = np.abs(audio_array).max() if audio_array.size else 0
+                if peak > 0:
+                    audio_array /= peak
+                sf.write(path, audio_array, sample_rate, subtype=self.subtype, format=self.file_format)
+                stat = Path(path).stat()
+                self._files.append((path, stat.st_size, stat.st_mtime))
+                self._total_bytes += stat.st_size
+                self._apply_retention()
+            except Exception as e:
+                logging.error(f"Error saving audio segment: {e}")
+            finally:
+                with self._written_lock:
+                    done = self._written.pop(path, None)
+                if done is not None:
+                    done.set()
+
+    def _apply_retention(self):
+        cutoff = time.time() - self.max_age_seconds if self.max_age_seconds else None
+        while self._files and (
+            (cutoff is not None and self._files[0][2] < cutoff) or
+            (self.max_total_bytes and self._total_bytes > self.max_total_bytes)
+        ):
+            path, size, _ = self._files.popleft()
+            self._total_bytes -= size
+            try:
+                Path(path).unlink()
+            except OSError:
+                pass
+
+    def get_stats(self):
+        return {
+            "enabled": self.enabled,
+            "pending": self.pending.qsize(),
+            "dropped": self.dropped,
+            "files": len(self._files),
+            "total_bytes": self._total_bytes
+        }
+
+    def close(self, timeout=5):
+        """Finish queued writes and stop the writer thread"""
+        if self.thread is not None:
+            self.pending.put(None)
+            self.thread.join(timeout=timeout)
+            self.thread = None
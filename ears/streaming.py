@@ -0,0 +1,155 @@
+import logging
+import queue
+import re
+import threading
+import time
+
+from ears.transcript_channel import TranscriptChannel
+
+
+def _normalize_word(word):
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def agreed_prefix_length(previous_words, current_words):
+    """Number of leading words two hypotheses agree on (case/punctuation-insensitive)"""
+    count = 0
+    for a, b in zip(previous_words, current_words):
+        if _normalize_word(a) != _normalize_word(b):
+            break
+        count += 1
+    return count
+
+
+class StreamingTranscriber:
+    """Re-decodes the open speech segment while the user is still talking.
+
+    Every `partial_interval` seconds the audio captured so far for the current
+    segment is decoded again. Words that two consecutive hypotheses agree on
+    are committed and never retracted. Partial results go to `partial_queue`;
+    when the capture worker closes the segment, the final transcript is put on
+    `final_queue` (a TranscriptChannel, shared with the manager when given).
+    Partials and finals are decoded with the manager's decoding profile
+    unless `profile` pins the partials to another one. If the last partial
+    was decoded with the final's profile and already covered the final
+    spoken audio (the usual case, since a segment only closes after a stretch
+    of silence), that hypothesis is reused and no extra decode is needed.
+    """
+
+    def __init__(self, whisper, partial_interval=0.5, profile=None, results=None):
+        self.whisper = whisper
+        self.partial_interval = partial_interval
+        self.profile = profile  # None follows whisper.decoding_profile
+
+        self.partial_queue = queue.Queue()
+        self.final_queue = results if results is not None else TranscriptChannel()
+        self._closed_segments = queue.Queue()
+
+        self.thread = None
+        self.stop_event = threading.Event()
+        self._reset_hypothesis(None)
+
+    def _reset_hypothesis(self, segment_id):
+        self.segment_id = segment_id
+        self.committed_words = []
+        self.previous_words = []
+        self.hypothesis = ""
+        self.hypothesis_profile = None  # Profile the last hypothesis was decoded with
+        self.covered_until = 0.0  # Stream time (s) the last hypothesis heard up to
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="whisper-streaming", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+
+    def segment_closed(self, segment):
+        """Called by the capture worker when a segment ends"""
+        self._closed_segments.put(segment)
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                segment = self._closed_segments.get(timeout=self.partial_interval)
+            except queue.Empty:
+                self._decode_partial()
+                continue
+            self._finalize(segment)
+
+    def _decode_partial(self):
+        snapshot = self.whisper.current_segment()
+        if snapshot is None:
+            return
+        segment_id, audio, end_time = snapshot
+        if segment_id != self.segment_id:
+            self._reset_hypothesis(segment_id)
+
+        profile = self.profile or self.whisper.decoding_profile
+        text = self._decode(audio, profile)
+        if text is None:
+            return
+
+        words = text.split()
+        agreed = agreed_prefix_length(self.previous_words, words)
+        # The committed prefix only ever grows
+        if agreed > len(self.committed_words):
+            self.committed_words = words[:agreed]
+        self.previous_words = words
+        self.hypothesis = text
+        self.hypothesis_profile = profile
+        self.covered_until = end_time
+
+        committed = " ".join(self.committed_words)
+        tentative = " ".join(words[len(self.committed_words):])
+        self.partial_queue.put({
+            "segment_id": segment_id,
+            "committed": committed,
+            "tentative": tentative,
+            "text": text
+        })
+        logging.debug(f"Partial transcript [{segment_id}]: {committed} | {tentative}")
+
+    def _finalize(self, segment):
+        closed_at = time.perf_counter()
+        segment_id = segment["segment_id"]
+
+        # A partial only stands in for the final when it was decoded the same way
+        profile = self.whisper.decoding_profile
+        if (profile == self.hypothesis_profile and segment_id == self.segment_id and self.hypothesis and
+                self.covered_until >= segment["last_speech_time"]):
+            # Last partial already heard all the speech; only silence followed
+            text = self.hypothesis
+        else:
+            text = self._decode(segment["array"], profile, segment) or ""
+
+        self.final_queue.put({
+            "segment_id": segment_id,
+            "text": text,
+            "audio_file": segment.get("audio_file")
+        })
+        logging.info(f"Final transcript [{segment_id}] ready in "
+                     f"{(time.perf_counter() - closed_at) * 1000:.0f} ms: {text}")
+        self._reset_hypothesis(None)
+
+    def _decode(self, audio, profile, segment=None):
+        try:
+            audio = self.whisper.prepare_audio({
+                "array": audio,
+                "sampling_rate": self.whisper.model_sample_rate,
+                # Lets prepare_audio spot a closed segment that capture has overwritten
+                "ring": segment.get("ring") if segment else None,
+                "ring_start": segment.get("ring_start") if segment else None
+            })
+            if audio is None:
+                return None
+            return self.whisper.decode(audio, profile=profile)
+        except Exception as e:
+            logging.error(f"Streaming decode failed: {e}")
+            return None
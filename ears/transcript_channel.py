@@ -0,0 +1,83 @@
+import asyncio
+import threading
+from collections import deque
+
+
+class TranscriptChannel:
+    """Hands finished transcripts to consumers the moment they exist.
+
+    Producers (the streaming transcriber or the batch worker) call `put`.
+    Consumers block in `get` on a condition variable, or `await get_async()`
+    from an event loop, and wake exactly when a transcript arrives or the
+    channel is closed. Both return None on close or timeout; there is no
+    "nothing yet" value to filter out.
+    """
+
+    def __init__(self):
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._async_waiters = []  # (loop, future) pairs parked in get_async
+        self.closed = False
+
+    def put(self, item):
+        with self._condition:
+            if self.closed:
+                return
+            self._items.append(item)
+            self._condition.notify()
+            self._wake_async_waiters()
+
+    def get(self, timeout=None):
+        """Next transcript, waiting up to `timeout` seconds (forever if None)"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._items or self.closed, timeout)
+            return self._items.popleft() if self._items else None
+
+    def get_nowait(self):
+        with self._condition:
+            return self._items.popleft() if self._items else None
+
+    async def get_async(self):
+        """Awaitable `get`: parks on a future instead of a thread"""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self._items:
+                    return self._items.popleft()
+                if self.closed:
+                    return None
+                # Registered under the lock, so a put can't slip in unnoticed
+                future = loop.create_future()
+                self._async_waiters.append((loop, future))
+            try:
+                await future
+            finally:
+                with self._condition:
+                    if (loop, future) in self._async_waiters:
+                        self._async_waiters.remove((loop, future))
+
+    def _wake_async_waiters(self):
+        waiters, self._async_waiters = self._async_waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+
+    def close(self):
+        """Wake every waiter; further puts are ignored until `reopen`"""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+            self._wake_async_waiters()
+
+    def reopen(self):
+        """Start a new session with nothing pending"""
+        with self._condition:
+            self._items.clear()
+            self.closed = False
+
+    def qsize(self):
+        return len(self._items)
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,115 @@
+import logging
+import queue
+import threading
+import time
+
+from ears.transcript_channel import TranscriptChannel
+
+
+class BatchTranscriptionWorker:
+    """Drains WhisperManager.audio_queue and decodes pending segments together.
+
+    The worker blocks until one segment is queued, then keeps collecting
+    whatever else arrives within `batch_window` seconds (up to
+    `max_batch_size`) and runs a single batched processor + generate call.
+    Results are put on `results` (a TranscriptChannel) in the order the
+    segments were queued.
+    """
+
+    def __init__(self, whisper, max_batch_size=4, batch_window=0.05, results=None):
+        self.whisper = whisper
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.results = results if results is not None else TranscriptChannel()
+
+        self.thread = None
+        self.stop_event = threading.Event()
+
+        # Throughput counters
+        self.batches = 0
+        self.segments = 0
+        self.decode_seconds = 0.0
+
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="whisper-transcription", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=10)
+            self.thread = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def _collect_batch(self):
+        """Block for the first segment, then take what arrives within the batch window"""
+        try:
+            batch = [self.whisper.audio_queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        deadline = time.perf_counter() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(self.whisper.audio_queue.get(timeout=remaining))
+                else:
+                    batch.append(self.whisper.audio_queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            for segment, text in zip(batch, self.transcribe_batch(batch)):
+                self.results.put({
+                    "text": text,
+                    "audio_file": segment.get("audio_file")
+                })
+
+    def transcribe_batch(self, segments):
+        """Decode a list of audio dicts in one call; returns texts in the same order"""
+        texts = [""] * len(segments)
+        prepared, indices = [], []
+        for i, segment in enumerate(segments):
+            audio = self.whisper.prepare_audio(segment)
+            if audio is not None:
+                prepared.append(audio)
+                indices.append(i)
+        if not prepared:
+            return texts
+
+        start = time.perf_counter()
+        try:
+            decoded = self.whisper.decode_batch(prepared)
+        except Exception as e:
+            logging.error(f"Batched generation failed: {e}")
+            return texts
+        elapsed = time.perf_counter() - start
+
+        self.batches += 1
+        self.segments += len(prepared)
+        self.decode_seconds += elapsed
+        logging.info(f"Decoded batch of {len(prepared)} segments in {elapsed:.2f}s")
+
+        for i, text in zip(indices, decoded):
+            texts[i] = text
+        return texts
+
+    def get_stats(self):
+        return {
+            "batches": self.batches,
+            "segments": self.segments,
+            "segments_per_second": self.segments / self.decode_seconds if self.decode_seconds else 0.0,
+            "pending_segments": self.whisper.audio_queue.qsize()
+        }
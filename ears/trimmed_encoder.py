@@ -0,0 +1,63 @@
+"""Whisper encoder pass over only the real audio of a short segment.
+
+The stock encoder insists on a 3000-frame (30 s) input, so a 2 s utterance
+pays for 28 s of padding. encode_trimmed runs the same layers on a shorter
+mel window, adding only the matching slice of the positional embeddings, and
+returns encoder outputs that `generate(encoder_outputs=...)` accepts.
+
+Whisper was trained on full windows, so trimmed decodes are checked with
+looks_unreliable and redone on the full window when they fail.
+"""
+import math
+import zlib
+
+from torch import nn
+from transformers.modeling_outputs import BaseModelOutput
+
+# Whisper's own fallback thresholds: highly repetitive output compresses well
+MAX_COMPRESSION_RATIO = 2.4
+# Conversational speech rarely exceeds ~4 words/s; far more means hallucination
+MAX_WORDS_PER_SECOND = 6.0
+
+
+def supports_trimming(model):
+    """Only PyTorch Whisper models (fp32, fp16 or dynamic int8) expose the encoder layers"""
+    encoder = getattr(getattr(model, "model", None), "encoder", None)
+    return encoder is not None and hasattr(encoder, "embed_positions")
+
+
+def trimmed_frame_count(duration, frames_per_second, max_frames, padding_seconds=1.0):
+    """Mel frames to keep: the audio plus some trailing silence, rounded up to whole seconds"""
+    seconds = math.ceil(duration + padding_seconds)
+    # Whole seconds keep the number of distinct shapes small; even for the stride-2 conv
+    frames = int(seconds * frames_per_second)
+    return min(max_frames, frames + frames % 2)
+
+
+def encode_trimmed(model, input_features):
+    """WhisperEncoder.forward for a (batch, n_mels, frames) window shorter than 30 s"""
+    encoder = model.model.encoder
+    input_features = input_features.to(encoder.conv1.weight.dtype)
+    hidden_states = nn.functional.gelu(encoder.conv1(input_features))
+    hidden_states = nn.functional.gelu(encoder.conv2(hidden_states)).permute(0, 2, 1)
+    hidden_states = hidden_states + encoder.embed_positions.weight[:hidden_states.shape[1]]
+
+    for layer in encoder.layers:
+        outputs = layer(hidden_states, None, layer_head_mask=None)
+        hidden_states = outputs[0] if isinstance(outputs, tuple) else outputs
+    return BaseModelOutput(last_hidden_state=encoder.layer_norm(hidden_states))
+
+
+def compression_ratio(text):
+    data = text.encode("utf-8")
+    return len(data) / len(zlib.compress(data))
+
+
+def looks_unreliable(text, duration):
+    """True when a trimmed decode should be redone on the full window"""
+    if not text.strip():
+        return True
+    if compression_ratio(text) > MAX_COMPRESSION_RATIO:
+        return True
+    return len(text.split()) / max(duration, 0.5) > MAX_WORDS_PER_SECOND
+
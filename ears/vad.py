@@ -0,0 +1,238 @@
+from collections import deque
+
+import numpy as np
+import scipy.signal
+
+# Segments whose mean speech probability over their speech frames falls
+# below this never reach Whisper
+DEFAULT_MIN_SEGMENT_CONFIDENCE = 0.7
+
+
+class FrameVAD:
+    """Frame-level voice activity detection with an adaptive noise floor.
+
+    Audio (at `sample_rate`, normally the 16 kHz capture rate) is cut into
+    10 ms frames. For every frame, in one vectorized pass, it computes log
+    energy, the share of energy in the 300-3400 Hz voice band, spectral
+    flatness, how much the energy fluctuates over the last 200 ms
+    (syllables make speech loudness swing), and harmonic stability.
+
+    Harmonic stability is the similarity of the fine spectral structure
+    (a 64 ms spectrum with its smoothed envelope removed, leaving the
+    harmonics) to the one 50 ms earlier, as a median over 300 ms. Held notes
+    keep their harmonics in place while the pitch of speech keeps gliding:
+    on recorded clips loud speech frames sit around 0.05-0.15 and music
+    around 0.4-0.5. Frames above 0.3, or inside a stretch of music whose
+    stability averaged over the last second of loud frames is above 0.3,
+    are not speech however loud they are; the second catches the note
+    changes of a quick melody.
+
+    The other features are combined into a speech probability relative to a
+    noise floor that follows the quiet frames: it drops at once and rises
+    slowly, but quickly over harmonically stable sound, so steady music or
+    hum becomes part of the floor. Speech state uses hysteresis: it turns on
+    above `on_threshold` and off below `off_threshold`.
+    """
+
+    def __init__(self, sample_rate=16000, frame_ms=10, on_threshold=0.6, off_threshold=0.35,
+                 min_rms=0.0, floor_rise_db_per_second=5.0, stable_floor_rise_db_per_second=20.0,
+                 history_seconds=10.0):
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.on_threshold = on_threshold
+        self.off_threshold = off_threshold
+        self.min_energy_db = 20 * np.log10(min_rms) if min_rms > 0 else -np.inf
+        self.floor_rise_db_per_frame = floor_rise_db_per_second * frame_ms / 1000
+        self.stable_floor_rise_db_per_frame = stable_floor_rise_db_per_second * frame_ms / 1000
+        self.modulation_frames = max(2, int(200 / frame_ms))
+        self.stability_lag = max(1, int(50 / frame_ms))
+        self.stability_frames = max(1, int(300 / frame_ms))
+        self.context_frames = max(1, int(1000 / frame_ms))
+
+        # Spectral analysis setup, computed once
+        self.n_fft = 1 << (self.frame_length - 1).bit_length()
+        self.window = np.hanning(self.frame_length).astype(np.float32)
+        freqs = np.fft.rfftfreq(self.n_fft, 1.0 / sample_rate)
+        self.voice_band = (freqs >= 300) & (freqs <= 3400)
+
+        # Harmonic stability: 64 ms windows resolve individual harmonics
+        self.harmonic_length = 1 << (int(0.064 * sample_rate) - 1).bit_length()
+        self.harmonic_window = np.hanning(self.harmonic_length).astype(np.float32)
+        harmonic_freqs = np.fft.rfftfreq(self.harmonic_length, 1.0 / sample_rate)
+        self.harmonic_band = (harmonic_freqs >= 100) & (harmonic_freqs <= 3000)
+        # Envelope smoothing across ~140 Hz, wider than a harmonic peak
+        self.envelope_bins = max(3, int(round(140 / harmonic_freqs[1])) | 1)
+
+        # Latest (stream time, probability) per frame for anyone watching
+        self.probabilities = deque(maxlen=int(history_seconds * 1000 / frame_ms))
+        self.reset()
+
+    def reset(self):
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self.noise_floor_db = None
+        self._recent_energy_db = np.zeros(0)  # Tail of the previous block for the modulation window
+        self._recent_audio = np.zeros(self.harmonic_length - self.frame_length, dtype=np.float32)
+        self._recent_fine = np.zeros((self.stability_lag, int(self.harmonic_band.sum())), dtype=np.float32)
+        self._recent_power = np.zeros(self.stability_lag)
+        self._recent_similarity = np.zeros(self.stability_frames - 1)
+        self._context_sums = np.zeros(2)  # Decayed (sum of stability, count) over loud frames
+        self.harmonic_context = 0.0
+        self.in_speech = False
+        self.frames_seen = 0
+
+    def process(self, audio):
+        """Classify complete frames in `audio`; returns (probabilities, speech_states)"""
+        audio = np.concatenate([self._remainder, np.asarray(audio, dtype=np.float32).reshape(-1)])
+        n_frames = audio.size // self.frame_length
+        self._remainder = audio[n_frames * self.frame_length:]
+        if n_frames == 0:
+            return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=bool)
+
+        frames = audio[:n_frames * self.frame_length].reshape(n_frames, self.frame_length)
+        probabilities = self._probabilities(frames)
+        states = self._hysteresis(probabilities)
+
+        start = self.frames_seen
+        self.frames_seen += n_frames
+        frame_seconds = self.frame_length / self.sample_rate
+        self.probabilities.extend(zip((start + np.arange(n_frames)) * frame_seconds, probabilities.tolist()))
+        return probabilities, states
+
+    def _probabilities(self, frames):
+        frame_power = np.mean(frames ** 2, axis=1)
+        energy_db = 10 * np.log10(frame_power + 1e-10)
+
+        power = np.abs(np.fft.rfft(frames * self.window, n=self.n_fft, axis=1)) ** 2 + 1e-12
+        band_ratio = power[:, self.voice_band].sum(axis=1) / power.sum(axis=1)
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+
+        # NaN where the last 300 ms held nothing to compare
+        stability = self._harmonic_stability(frames, frame_power)
+        known = ~np.isnan(stability)
+        stability = np.nan_to_num(stability)
+        floor = self._update_noise_floor(energy_db, stability)
+        snr_db = energy_db - floor
+        modulation_db = self._energy_modulation(energy_db)
+
+        # Loudness above the floor dominates; voice-band share, tonality and
+        # syllabic loudness swings refine it
+        score = ((snr_db - 6.0) / 3.0 + 4.0 * (band_ratio - 0.6) + 4.0 * (0.4 - flatness)
+                 + (modulation_db - 3.0) / 1.5)
+        # Held pitches veto a frame however loud it is, and so does a run of
+        # music whose note changes alone would pass
+        harmonic = np.maximum(stability, self._harmonic_context(stability, known & (snr_db > 10.0)))
+        probabilities = 1.0 / (1.0 + np.exp(-score)) / (1.0 + np.exp((harmonic - 0.3) / 0.03))
+        probabilities[energy_db < self.min_energy_db] = 0.0
+        return probabilities.astype(np.float32)
+
+    def _harmonic_stability(self, frames, frame_power):
+        """Similarity of each frame's harmonic structure to 50 ms earlier, as a median over 300 ms"""
+        audio = np.concatenate([self._recent_audio, frames.reshape(-1)])
+        self._recent_audio = audio[-(self.harmonic_length - self.frame_length):]
+        windows = np.lib.stride_tricks.sliding_window_view(audio, self.harmonic_length)[::self.frame_length]
+        log_power = np.log(np.abs(np.fft.rfft(windows * self.harmonic_window, axis=1)) ** 2 + 1e-10)
+
+        # Subtract the smoothed envelope so only the harmonic peaks remain
+        half = self.envelope_bins // 2
+        padded = np.pad(log_power, ((0, 0), (half + 1, half)), mode='edge')
+        summed = np.cumsum(padded, axis=1)
+        envelope = (summed[:, self.envelope_bins:] - summed[:, :-self.envelope_bins]) / self.envelope_bins
+        fine = (log_power - envelope)[:, self.harmonic_band]
+        fine -= fine.mean(axis=1, keepdims=True)
+        fine /= np.linalg.norm(fine, axis=1, keepdims=True) + 1e-10
+
+        history = np.concatenate([self._recent_fine, fine.astype(np.float32)])
+        self._recent_fine = history[-self.stability_lag:]
+        similarity = np.einsum('ij,ij->i', history[self.stability_lag:], history[:-self.stability_lag])
+
+        # Comparing a sound with the quieter audio before it says nothing about
+        # the sound, so onsets are left out, and so is background near the floor
+        power = np.concatenate([self._recent_power, frame_power])
+        self._recent_power = power[-self.stability_lag:]
+        current, earlier = power[self.stability_lag:], power[:-self.stability_lag]
+        quiet = 10 ** ((self.noise_floor_db + 6.0) / 10) if self.noise_floor_db is not None else 0.0
+        similarity[(current > 10 * earlier + 1e-10) | (np.minimum(current, earlier) < quiet)] = np.nan
+
+        # Median, so a note change is only a brief dip
+        history = np.concatenate([self._recent_similarity, similarity])
+        self._recent_similarity = history[-(self.stability_frames - 1):]
+        # np.nanmedian goes through masked arrays, so sort instead (NaNs sort last)
+        windows = np.sort(np.lib.stride_tricks.sliding_window_view(history, self.stability_frames), axis=1)
+        counts = np.maximum(np.count_nonzero(~np.isnan(windows), axis=1), 1)
+        rows = np.arange(windows.shape[0])
+        return 0.5 * (windows[rows, (counts - 1) // 2] + windows[rows, counts // 2])
+
+    def _harmonic_context(self, stability, loud):
+        """Running mean of harmonic stability over loud frames, with a ~1 s time constant"""
+        values = stability[loud]
+        if values.size == 0:
+            return np.full(stability.size, self.harmonic_context)
+        # Exponential sums of the values and of their weights; the ratio is a
+        # plain mean over the first loud frames rather than starting from zero
+        decay = np.exp(-1.0 / self.context_frames)
+        sums, _ = scipy.signal.lfilter([1.0], [1.0, -decay], np.stack([values, np.ones_like(values)]),
+                                       axis=1, zi=decay * self._context_sums[:, None])
+        smoothed = sums[0] / sums[1]
+        # Quiet frames hold the value of the last loud frame before them
+        latest = np.cumsum(loud) - 1
+        context = np.where(latest >= 0, smoothed[np.maximum(latest, 0)], self.harmonic_context)
+        self._context_sums = sums[:, -1]
+        self.harmonic_context = float(smoothed[-1])
+        return context
+
+    def _update_noise_floor(self, energy_db, stability):
+        """Per-frame floor: drops at once to quieter frames, rises slowly, faster over stable pitch"""
+        if self.noise_floor_db is None:
+            self.noise_floor_db = float(np.percentile(energy_db, 10))
+
+        # Held notes and hum are background however loud they are
+        stable = np.clip((stability - 0.2) / 0.15, 0.0, 1.0)
+        rise = (self.floor_rise_db_per_frame
+                + stable * (self.stable_floor_rise_db_per_frame - self.floor_rise_db_per_frame))
+
+        # Closed form of floor[i] = min(energy[i], floor[i-1] + rise[i]), so the
+        # recurrence runs as one cumulative minimum instead of a Python loop
+        ramp = np.cumsum(rise)
+        running = np.minimum.accumulate(np.concatenate([[self.noise_floor_db], energy_db - ramp]))
+        floor = running[1:] + ramp
+        self.noise_floor_db = float(floor[-1])
+        return floor
+
+    def _energy_modulation(self, energy_db):
+        """Standard deviation of frame energy over a sliding window ending at each frame"""
+        history = np.concatenate([self._recent_energy_db, energy_db])
+        self._recent_energy_db = history[-(self.modulation_frames - 1):]
+        missing = self.modulation_frames - 1 + energy_db.size - history.size
+        if missing > 0:
+            # Start of the stream: repeat the first frame so every frame gets a window
+            history = np.concatenate([np.full(missing, history[0]), history])
+        windows = np.lib.stride_tricks.sliding_window_view(history, self.modulation_frames)
+        return windows.std(axis=1)[-energy_db.size:]
+
+    def _hysteresis(self, probabilities):
+        """Vectorized two-threshold state machine"""
+        # +1 forces speech, 0 forces silence, -1 keeps the previous state
+        decisive = np.where(probabilities >= self.on_threshold, 1,
+                            np.where(probabilities < self.off_threshold, 0, -1))
+        indices = np.where(decisive >= 0, np.arange(decisive.size), -1)
+        last = np.maximum.accumulate(indices)
+        states = np.where(last >= 0, decisive[np.maximum(last, 0)] == 1, self.in_speech)
+        self.in_speech = bool(states[-1])
+        return states
+
+    def score_segment(self, audio):
+        """(mean speech probability, seconds of speech) for a standalone clip, using fresh state.
+
+        Like WhisperManager, the mean covers speech frames only, so pauses
+        and the closing silence of a segment don't count against it.
+        """
+        self.reset()
+        probabilities, states = self.process(audio)
+        self.reset()
+        if not states.any():
+            return 0.0, 0.0
+        return float(probabilities[states].mean()), float(states.sum() * self.frame_length / self.sample_rate)
+
+    @property
+    def latest_probability(self):
+        return self.probabilities[-1][1] if self.probabilities else 0.0
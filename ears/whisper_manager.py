@@ -1,86 +1,163 @@
-from transformers import WhisperProcessor, WhisperForConditionalGeneration
 import sounddevice as sd
 import numpy as np
 import logging
 import threading
 import queue
-import time
 import torch
-import scipy.signal
 import os
 from pathlib import Path
-from datetime import datetime
-# Save audio file
-import soundfile as sf
+from ears.ring_buffer import AudioRingBuffer
+from ears.resampler import PolyphaseResampler, resample
+from ears.streaming import StreamingTranscriber
+from ears.transcription_worker import BatchTranscriptionWorker
+from ears.transcript_channel import TranscriptChannel
+from ears.model_registry import registry
+from ears.segment_writer import SegmentWriter
+from ears.features import LogMelExtractor
+from ears.trimmed_encoder import encode_trimmed, looks_unreliable, supports_trimming, trimmed_frame_count
+from ears.vad import DEFAULT_MIN_SEGMENT_CONFIDENCE, FrameVAD
+from ears.decoding_profiles import DEFAULT_PROFILE, generation_kwargs, get_profile
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class WhisperManager:
-    def __init__(self, threshold=0.03, input_device=None):
+    def __init__(self, threshold=0.03, input_device=None, streaming=False, partial_interval=0.5,
+                 max_batch_size=4, decoding_profile=DEFAULT_PROFILE, backend="torch",
+                 model_name="openai/whisper-small", dtype=None, persist_segments=True,
+                 segment_retention_seconds=7 * 24 * 3600, segment_retention_bytes=2 * 1024 ** 3,
+                 min_segment_confidence=DEFAULT_MIN_SEGMENT_CONFIDENCE, trimmed_encoder=False,
+                 trim_max_seconds=10.0):
         try:
-            # Load Whisper model
-            self.processor = WhisperProcessor.from_pretrained("openai/whisper-small")
-            self.model = WhisperForConditionalGeneration.from_pretrained("openai/whisper-small")
-            
-            # Use GPU if available
-            if torch.cuda.is_available():
-                self.model = self.model.to("cuda")
-                logging.info("Using CUDA for Whisper model")
+            # Shared Whisper model for the selected backend (torch, int8 or onnx);
+            # loaded once per process however many managers exist
+            self.model_key = registry.key(model_name, backend, dtype)
+            self.backend = registry.acquire(*self.model_key)
+            self.processor = self.backend.processor
+            self.model = self.backend.model
+            self.device = self.backend.device
+            # Cached-window torch STFT; same features as the processor, less work
+            self.feature_extractor = LogMelExtractor(self.processor.feature_extractor)
+
+            # Decoding settings
+            self.decoding_profile = None
+            self.set_decoding_profile(decoding_profile)
+
+            # Opt-in: encode only the real audio of segments up to trim_max_seconds
+            self.trimmed_encoder = trimmed_encoder and supports_trimming(self.model)
+            if trimmed_encoder and not self.trimmed_encoder:
+                logging.warning(f"Trimmed encoder not supported by the {backend} backend, using full window")
+            self.trim_max_seconds = trim_max_seconds
+            self.trimmed_decodes = 0
+            self.trim_fallbacks = 0  # Trimmed results redone on the full window
 
             # Audio settings
             self.threshold = threshold
             self.input_device = input_device  # This should be CABLE Output
             self.audio_queue = queue.Queue()
-            self.buffer = []
+            self.ring = None  # Allocated once the device sample rate is known
+            self.resampler = None  # Device rate -> model rate, fed per block
             self.sample_rate = None  # Will be set when starting stream
             self.model_sample_rate = 16000  # Required by Whisper
             self.device_sample_rate = 44100.0
             self.stream = None
 
-            # Speech detection settings
+            # Callback -> capture worker handoff
+            self.block_queue = queue.Queue(maxsize=256)
+            self.capture_thread = None
+            self.capture_stop = threading.Event()
+            self.dropped_blocks = 0  # Handoff full, block discarded
+            self.overflowed_blocks = 0  # PortAudio reported input overflow
+
+            # Speech detection: frame VAD with an adaptive noise floor; `threshold`
+            # remains an absolute RMS below which nothing counts as speech
+            self.vad = FrameVAD(self.model_sample_rate, min_rms=threshold)
+            self.min_segment_confidence = min_segment_confidence
+            self.segment_probability_sum = 0.0  # Over the segment's speech frames only
+            self.segment_speech_frames = 0
+            self.rejected_segments = 0  # Low-confidence segments kept away from Whisper
+            self.overwritten_segments = 0  # Queued views capture wrapped over before decoding
             self.is_buffering = False
             self.last_speech_time = None
             self.silence_duration = 0.8
             self.min_speech_duration = 0.2
             self.speech_start_time = None
+            self.segment_start = None
+            self.pre_roll_duration = 0.2
+            self.max_segment_duration = 30.0  # Whisper's window; longer speech is split
+            self.ring_headroom = 30.0  # Time a queued segment view stays valid
+            self.segment_id = 0
+            self.segment_lock = threading.Lock()  # Guards segment state read by streaming
 
-            # Add audio file tracking
+            # Streaming mode decodes while the user is still speaking
+            # Finished transcripts from either path; consumers block on it
+            self.transcripts = TranscriptChannel()
+            self.streaming = StreamingTranscriber(
+                self, partial_interval, results=self.transcripts
+            ) if streaming else None
+
+            # Queued segments are decoded in batches by a worker thread
+            self.transcription_worker = BatchTranscriptionWorker(
+                self, max_batch_size=max_batch_size, results=self.transcripts
+            )
+
+            # Add audio file tracking; segments are written in the background as
+            # FLAC with age/size retention, or not at all when persistence is off
             self.last_audio_file = None
             self.audio_save_dir = Path("whisper_audio")
-            self.audio_save_dir.mkdir(exist_ok=True)
+            self.segment_writer = SegmentWriter(
+                self.audio_save_dir,
+                enabled=persist_segments,
+                max_age_seconds=segment_retention_seconds,
+                max_total_bytes=segment_retention_bytes
+            )
             
         except Exception as e:
             logging.error(f"Failed to initialize WhisperManager: {e}")
+            if getattr(self, 'backend', None) is not None:
+                registry.release(*self.model_key)
             raise
 
     def save_audio_segment(self, audio_array, sample_rate):
-        """Save audio segment to WAV file and return the path"""
+        """Queue an audio segment for background saving and return its path (None if not saved)"""
+        return self.segment_writer.submit(audio_array, sample_rate)
+
+    def resolve_audio_file(self, path, timeout=2.0):
+        """Wait until a queued segment file exists; returns the path, or None if unavailable"""
+        return path if self.segment_writer.wait_for(path, timeout) else None
+
+    def audio_callback(self, indata, frames, time_info, status):
+        """Realtime PortAudio callback: hand the block to the capture worker and return"""
+        if status and status.input_overflow:
+            self.overflowed_blocks += 1
+
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-            filename = f"whisper_segment_{timestamp}.wav"
-            filepath = self.audio_save_dir / filename
-            
-            # Ensure audio is float32 and normalized
-            audio_array = audio_array.astype(np.float32)
-            if np.abs(audio_array).max() > 0:
-                audio_array = audio_array / np.abs(audio_array).max()
-            
-            sf.write(str(filepath), audio_array, sample_rate)
-            
-            return str(filepath)
-            
-        except Exception as e:
-            logging.error(f"Error saving audio segment: {e}")
-            return None
+            self.block_queue.put_nowait(indata.copy())
+        except queue.Full:
+            # Never block the audio thread; the worker is behind
+            self.dropped_blocks += 1
 
-    def audio_callback(self, outdata, frames, time_info, status):
-        if status:
-            logging.warning(f"Sounddevice status: {status}")
-        
+    def _capture_loop(self):
+        """Capture worker: VAD, segmentation and queueing outside the audio callback"""
+        reported_drops = 0
+        while not self.capture_stop.is_set():
+            try:
+                block = self.block_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if block is None:
+                break
+
+            self.process_block(block)
+
+            lost = self.dropped_blocks + self.overflowed_blocks
+            if lost != reported_drops:
+                logging.warning(f"Audio capture lost blocks - dropped: {self.dropped_blocks}, "
+                                f"overflowed: {self.overflowed_blocks}")
+                reported_drops = lost
+
+    def process_block(self, audio):
+        """Run speech detection on one captured block and close finished segments"""
         try:
-            # Get the audio data from the output stream
-            audio = outdata.copy()
-            
             # Convert stereo to mono if needed
             if audio.ndim > 1:
                 audio = np.mean(audio, axis=1)
@@ -91,150 +168,266 @@ class WhisperManager:
                 return
             
             # Convert to mono if needed and ensure float32
-            audio = audio.astype(np.float32)
+            audio = audio.astype(np.float32, copy=False)
             
-            # Calculate RMS level
-            rms = np.sqrt(np.mean(audio**2))
-            current_time = time.time()
-
-            if rms > self.threshold:
-                if not self.is_buffering:
-                    logging.info(f"Speech detected! RMS: {rms:.6f}")
-                    self.is_buffering = True
-                    self.speech_start_time = current_time
-                    # Add a small pre-buffer
-                    pre_buffer = np.zeros(int(0.2 * self.sample_rate), dtype=np.float32)
-                    self.buffer.extend(pre_buffer.tolist())
-                self.buffer.extend(audio.tolist())
-                self.last_speech_time = current_time
-            else:
+            # Resample as we go so closed segments are already at the model rate
+            audio = self.resampler.process(audio)
+
+            # Per-10 ms speech probabilities and hysteresis states for this block
+            probabilities, speech_frames = self.vad.process(audio)
+            is_speech = bool(speech_frames.any())
+
+            # Stream time from the sample count, so a backlog doesn't distort durations
+            current_time = (self.ring.position + audio.size) / self.model_sample_rate
+
+            # Record every block so the pre-roll is real history, not zeros
+            block_start = self.ring.position
+            self.ring.write(audio)
+
+            with self.segment_lock:
+                if is_speech:
+                    if not self.is_buffering:
+                        logging.info(f"Speech detected! Probability: {probabilities.max():.2f}")
+                        self.is_buffering = True
+                        self.segment_id += 1
+                        self.segment_probability_sum = 0.0
+                        self.segment_speech_frames = 0
+                        self.speech_start_time = current_time
+                        pre_roll = int(self.pre_roll_duration * self.model_sample_rate)
+                        self.segment_start = max(self.ring.oldest_position, block_start - pre_roll)
+                    self.last_speech_time = current_time
+
                 if self.is_buffering:
-                    self.buffer.extend(audio.tolist())
+                    # Confidence covers speech frames only, so pauses between
+                    # words and the closing silence don't count against it
+                    self.segment_probability_sum += float(probabilities[speech_frames].sum())
+                    self.segment_speech_frames += int(speech_frames.sum())
+
+                if not is_speech and self.is_buffering:
                     speech_duration = current_time - self.speech_start_time if self.speech_start_time else 0
                     silence_duration = current_time - self.last_speech_time if self.last_speech_time else 0
-                    
-                    if (speech_duration >= self.min_speech_duration and 
+
+                    if (speech_duration >= self.min_speech_duration and
                         silence_duration >= self.silence_duration):
                         logging.info(f"Speech ended - Duration: {speech_duration:.2f}s")
-                        self.is_buffering = False
-                        
-                        # Convert buffer to numpy array
-                        full_audio = np.array(self.buffer, dtype=np.float32)
-                        self.buffer = []  # Clear buffer
-                        
-                        if full_audio.size > 0:
-                            # Save audio segment
-                            audio_file = self.save_audio_segment(full_audio, self.sample_rate)
-                            if audio_file:
-                                self.last_audio_file = audio_file
-                            
-                            # Normalize audio
-                            if np.abs(full_audio).max() > 0:
-                                full_audio = full_audio / np.abs(full_audio).max()
-                            
-                            self.audio_queue.put({
-                                "array": full_audio,
-                                "sampling_rate": self.sample_rate
-                            })
-                            logging.info(f"Added audio segment to queue. Length: {len(full_audio)/self.sample_rate:.2f}s")
-                        else:
-                            logging.warning("Empty audio segment discarded")
-                        
-                        self.speech_start_time = None
-                        
+                        self._finalize_segment()
+                        return
+
+                # Split very long speech so a segment never outlives its ring slot
+                if (self.is_buffering and
+                    self.ring.position - self.segment_start >= self.max_segment_duration * self.model_sample_rate):
+                    logging.info("Maximum segment duration reached, splitting segment")
+                    self._finalize_segment()
+
         except Exception as e:
-            logging.error(f"Error in audio callback: {str(e)}", exc_info=True)
+            logging.error(f"Error processing audio block: {str(e)}", exc_info=True)
+
+    def _finalize_segment(self):
+        """Queue the current segment as a view into the ring buffer"""
+        self.is_buffering = False
+        segment_start = self.segment_start
+        full_audio = self.ring.view(segment_start)
+        self.segment_start = None
+        self.speech_start_time = None
+
+        # Only confident speech is worth a Whisper call
+        confidence = (self.segment_probability_sum / self.segment_speech_frames
+                      if self.segment_speech_frames else 0.0)
+        speech_seconds = self.segment_speech_frames * self.vad.frame_length / self.model_sample_rate
+        if confidence < self.min_segment_confidence or speech_seconds < self.min_speech_duration:
+            self.rejected_segments += 1
+            logging.info(f"Discarded low-confidence segment - confidence: {confidence:.2f}, "
+                         f"speech: {speech_seconds:.2f}s ({self.rejected_segments} rejected so far)")
+            return
+
+        if full_audio.size > 0:
+            # Save audio segment (written by the segment writer thread)
+            audio_file = self.save_audio_segment(full_audio, self.model_sample_rate)
+            self.last_audio_file = audio_file
+
+            if self.streaming is not None:
+                # Streaming already has a hypothesis for most of this audio
+                self.streaming.segment_closed({
+                    "segment_id": self.segment_id,
+                    "array": full_audio,
+                    "ring": self.ring,
+                    "ring_start": segment_start,
+                    "last_speech_time": self.last_speech_time,
+                    "audio_file": audio_file
+                })
+                return
+
+            # Normalization happens in prepare_audio, which copies anyway and
+            # checks that capture hasn't overwritten the view in the meantime
+            self.audio_queue.put({
+                "array": full_audio,
+                "sampling_rate": self.model_sample_rate,
+                "ring": self.ring,
+                "ring_start": segment_start,
+                "audio_file": audio_file
+            })
+            logging.info(f"Added audio segment to queue. Length: {len(full_audio)/self.model_sample_rate:.2f}s")
+        else:
+            logging.warning("Empty audio segment discarded")
+
+    def get_speech_probability(self):
+        """Most recent frame's speech probability from the VAD"""
+        return self.vad.latest_probability
+
+    def current_segment(self):
+        """Snapshot of the open segment: (segment_id, audio view, stream time) or None"""
+        with self.segment_lock:
+            if not self.is_buffering or self.segment_start is None:
+                return None
+            end = self.ring.position
+            return self.segment_id, self.ring.view(self.segment_start, end), end / self.model_sample_rate
 
     def resample_audio(self, audio_array, orig_sample_rate):
         """Resample audio to match Whisper's expected sample rate"""
         if orig_sample_rate != self.model_sample_rate:
-            # Calculate number of samples for target length
-            target_length = int(len(audio_array) * self.model_sample_rate / orig_sample_rate)
-            # Resample audio
-            resampled_audio = scipy.signal.resample(audio_array, target_length)
-            return resampled_audio
+            # Polyphase filter with cached taps per rate pair
+            return resample(audio_array, orig_sample_rate, self.model_sample_rate)
         return audio_array
 
-    def transcribe_audio(self, audio_input):
+    def prepare_audio(self, audio_input):
+        """Validate an audio dict and return a normalized float32 array at the model rate"""
+        # Input validation
+        if not isinstance(audio_input, dict):
+            logging.error("Audio input must be a dictionary")
+            return None
+        
+        if 'array' not in audio_input or 'sampling_rate' not in audio_input:
+            logging.error("Audio input must contain 'array' and 'sampling_rate'")
+            return None
+
+        # Get the audio array
+        audio_array = audio_input['array']
+        
+        # Convert to numpy array if needed
+        if not isinstance(audio_array, np.ndarray):
+            try:
+                audio_array = np.array(audio_array, dtype=np.float32)
+            except Exception as e:
+                logging.error(f"Failed to convert audio to numpy array: {e}")
+                return None
+        
+        # Validate audio array
+        if audio_array.size == 0:
+            logging.error("Audio array is empty")
+            return None
+        
+        if not np.isfinite(audio_array).all():
+            logging.error("Audio array contains invalid values")
+            return None
+
+        # Ensure audio is float32 and normalized
+        audio_array = audio_array.astype(np.float32)
+
+        # Ring buffer views are only valid until capture wraps past their start;
+        # checked after the copy above, so the copied samples are the right ones
+        ring = audio_input.get("ring")
+        if ring is not None and audio_input["ring_start"] < ring.oldest_position:
+            self.overwritten_segments += 1
+            logging.warning(f"Dropped a segment overwritten by capture before decoding "
+                            f"({self.overwritten_segments} so far); transcription is falling behind")
+            return None
+        max_val = np.abs(audio_array).max()
+        if max_val > 0:
+            audio_array = audio_array / max_val
+
+        # Resample audio if needed
+        if audio_input["sampling_rate"] != self.model_sample_rate:
+            logging.info(f"Resampling audio from {audio_input['sampling_rate']}Hz to {self.model_sample_rate}Hz")
+            audio_array = self.resample_audio(
+                audio_array, 
+                audio_input["sampling_rate"]
+            )
+        return audio_array
+
+    def set_decoding_profile(self, name):
+        """Select the decoding profile ('fast', 'balanced', 'accurate') for queued segments"""
+        get_profile(name)
+        self.decoding_profile = name
+        logging.info(f"Whisper decoding profile: {name}")
+
+    def decode(self, audio_array, profile=None):
+        """Run Whisper on a prepared 16 kHz array and return the stripped text"""
+        return self.decode_batch([audio_array], profile=profile)[0]
+
+    def decode_batch(self, audio_arrays, profile=None):
+        """Run Whisper once over several prepared 16 kHz arrays; texts come back in order"""
+        # Length budget follows the longest segment in the batch
+        duration = max(len(audio) for audio in audio_arrays) / self.model_sample_rate
+        gen_kwargs = generation_kwargs(profile or self.decoding_profile, duration)
+
+        # Log-mel features for the whole batch
+        input_features = self.feature_extractor(audio_arrays)
+
+        input_features = input_features.to(self.device)
+        if self.backend.name == "torch":
+            # Features come out float32; a float16/bfloat16 model needs them in its own dtype
+            input_features = input_features.to(self.model.dtype)
+
+        if self.trimmed_encoder and duration <= self.trim_max_seconds:
+            return self._decode_trimmed(audio_arrays, input_features, duration, gen_kwargs)
+        return self._generate(input_features, gen_kwargs)
+
+    def _generate(self, input_features, gen_kwargs, encoder_outputs=None):
+        with torch.no_grad():
+            if encoder_outputs is not None:
+                predicted_ids = self.model.generate(
+                    encoder_outputs=encoder_outputs,
+                    temperature=0.0,
+                    **gen_kwargs
+                )
+            else:
+                predicted_ids = self.model.generate(
+                    input_features,
+                    temperature=0.0,
+                    **gen_kwargs
+                )
+            transcription = self.processor.batch_decode(
+                predicted_ids, 
+                skip_special_tokens=True
+            )
+        return [text.strip() for text in transcription]
+
+    def _decode_trimmed(self, audio_arrays, input_features, duration, gen_kwargs):
+        """Decode from a shortened encoder window; redo doubtful results on the full window"""
+        frames_per_second = self.model_sample_rate / self.feature_extractor.hop_length
+        frames = trimmed_frame_count(duration, frames_per_second, input_features.shape[-1])
+        with torch.no_grad():
+            encoder_outputs = encode_trimmed(self.model, input_features[..., :frames])
+        texts = self._generate(None, gen_kwargs, encoder_outputs=encoder_outputs)
+        self.trimmed_decodes += len(texts)
+
+        retry = [i for i, (audio, text) in enumerate(zip(audio_arrays, texts))
+                 if looks_unreliable(text, len(audio) / self.model_sample_rate)]
+        if retry:
+            self.trim_fallbacks += len(retry)
+            logging.info(f"Trimmed decode unreliable for {len(retry)} segment(s), using full window")
+            for i, text in zip(retry, self._generate(input_features[retry], gen_kwargs)):
+                texts[i] = text
+        return texts
+
+    def transcribe_audio(self, audio_input, profile=None):
         try:
-            # Input validation
-            if not isinstance(audio_input, dict):
-                logging.error("Audio input must be a dictionary")
-                return ""
-            
-            if 'array' not in audio_input or 'sampling_rate' not in audio_input:
-                logging.error("Audio input must contain 'array' and 'sampling_rate'")
+            audio_array = self.prepare_audio(audio_input)
+            if audio_array is None:
                 return ""
 
-            # Get the audio array
-            audio_array = audio_input['array']
-            
-            # Convert to numpy array if needed
-            if not isinstance(audio_array, np.ndarray):
-                try:
-                    audio_array = np.array(audio_array, dtype=np.float32)
-                except Exception as e:
-                    logging.error(f"Failed to convert audio to numpy array: {e}")
-                    return ""
-            
-            # Validate audio array
-            if audio_array.size == 0:
-                logging.error("Audio array is empty")
-                return ""
-            
-            if not np.isfinite(audio_array).all():
-                logging.error("Audio array contains invalid values")
+            try:
+                result = self.decode(audio_array, profile=profile)
+            except Exception as e:
+                logging.error(f"Model generation failed: {e}")
                 return ""
 
-            # Ensure audio is float32 and normalized
-            audio_array = audio_array.astype(np.float32)
-            max_val = np.abs(audio_array).max()
-            if max_val > 0:
-                audio_array = audio_array / max_val
-
-            # Resample audio if needed
-            if audio_input["sampling_rate"] != self.model_sample_rate:
-                logging.info(f"Resampling audio from {audio_input['sampling_rate']}Hz to {self.model_sample_rate}Hz")
-                audio_array = self.resample_audio(
-                    audio_array, 
-                    audio_input["sampling_rate"]
-                )
-
-            # Process with whisper
-            input_features = self.processor(
-                audio_array, 
-                sampling_rate=self.model_sample_rate, 
-                return_tensors="pt"
-            ).input_features
+            if not result:
+                logging.warning("Empty transcription result")
+                return ""
 
-            if torch.cuda.is_available():
-                input_features = input_features.to("cuda")
-            
-            # Generate transcription
-            with torch.no_grad():
-                try:
-                    predicted_ids = self.model.generate(
-                        input_features,
-                        max_length=448,
-                        num_beams=5,
-                        temperature=0.0
-                    )
-                    transcription = self.processor.batch_decode(
-                        predicted_ids, 
-                        skip_special_tokens=True
-                    )
-                    
-                    if not transcription or not transcription[0].strip():
-                        logging.warning("Empty transcription result")
-                        return ""
-
-                    result = transcription[0].strip()
-                    logging.info(f"Successful transcription: {result}")
-                    return result
-
-                except Exception as e:
-                    logging.error(f"Model generation failed: {e}")
-                    return ""
+            logging.info(f"Successful transcription: {result}")
+            return result
 
         except Exception as e:
             logging.error(f"Transcription error: {e}", exc_info=True)
@@ -259,6 +452,32 @@ class WhisperManager:
             
             # Force sample rate to match device's native rate
             self.sample_rate = int(device_info['default_samplerate'])
+
+            # Capture is stored at the model rate, resampled block by block
+            self.resampler = PolyphaseResampler(self.sample_rate, self.model_sample_rate)
+
+            # Preallocate capture storage: longest segment + pre-roll + headroom
+            ring_seconds = self.max_segment_duration + self.pre_roll_duration + self.ring_headroom
+            self.ring = AudioRingBuffer(int(ring_seconds * self.model_sample_rate))
+            self.is_buffering = False
+            self.segment_start = None
+            self.vad.reset()
+
+            # Start the capture worker before audio starts flowing
+            self.block_queue = queue.Queue(maxsize=self.block_queue.maxsize)
+            self.capture_stop.clear()
+            self.capture_thread = threading.Thread(
+                target=self._capture_loop,
+                name="whisper-capture",
+                daemon=True
+            )
+            self.capture_thread.start()
+
+            self.transcripts.reopen()
+            if self.streaming is not None:
+                self.streaming.start()
+            else:
+                self.transcription_worker.start()
             
             try:
                 self.stream = sd.InputStream(
@@ -296,19 +515,78 @@ class WhisperManager:
             finally:
                 self.stream = None
 
-    def get_transcription(self):
-        if not self.audio_queue.empty():
-            audio_data = self.audio_queue.get()
-            return self.transcribe_audio(audio_data)
-        return "No speech detected."
+        if self.capture_thread is not None:
+            self.capture_stop.set()
+            try:
+                self.block_queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self.capture_thread.join(timeout=2)
+            self.capture_thread = None
+
+        if self.streaming is not None:
+            self.streaming.stop()
+        self.transcription_worker.stop()
+        # Wakes anyone blocked in next_transcript
+        self.transcripts.close()
+
+    def get_capture_stats(self):
+        """Return capture health counters"""
+        return {
+            "dropped_blocks": self.dropped_blocks,
+            "overflowed_blocks": self.overflowed_blocks,
+            "pending_blocks": self.block_queue.qsize(),
+            "pending_segments": self.audio_queue.qsize(),
+            "pending_transcripts": self.transcripts.qsize(),
+            "rejected_segments": self.rejected_segments,
+            "overwritten_segments": self.overwritten_segments,
+            "trimmed_decodes": self.trimmed_decodes,
+            "trim_fallbacks": self.trim_fallbacks,
+            "noise_floor_db": self.vad.noise_floor_db,
+            "transcription": self.transcription_worker.get_stats(),
+            "segment_writer": self.segment_writer.get_stats()
+        }
+
+    def next_transcript(self, timeout=None):
+        """Block until a segment is transcribed: {"text", "audio_file", ...}.
+
+        Returns None on timeout or once listening stops.
+        """
+        return self.transcripts.get(timeout)
+
+    async def next_transcript_async(self):
+        """Awaitable next_transcript for asyncio consumers"""
+        return await self.transcripts.get_async()
+
+    def get_transcription(self, timeout=None):
+        """Text of the next transcript, or None on timeout / when listening stops"""
+        transcript = self.next_transcript(timeout)
+        return transcript["text"] if transcript is not None else None
+
+    def get_partial_transcription(self):
+        """Latest partial hypothesis in streaming mode, or None"""
+        if self.streaming is None:
+            return None
+        partial = None
+        while True:
+            try:
+                partial = self.streaming.partial_queue.get_nowait()
+            except queue.Empty:
+                return partial
+
+    def release_model(self):
+        """Give up this manager's reference to the shared model"""
+        if self.model_key is not None:
+            registry.release(*self.model_key)
+            self.model_key = None
+            self.model = None
 
     def cleanup(self):
         """Clean up resources and temporary files"""
         try:
             self.stop_listening()
-            # Optionally clean up old audio files
-            # Uncomment if you want to delete old audio files
-            # for file in self.audio_save_dir.glob("*.wav"):
-            #     file.unlink()
+            self.release_model()
+            # Finish pending segment writes; old files are pruned by retention
+            self.segment_writer.close()
         except Exception as e:
             logging.error(f"Error during cleanup: {e}")
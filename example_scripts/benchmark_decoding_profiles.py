@@ -0,0 +1,98 @@
+"""Real-time factor and word error rate of each Whisper decoding profile.
+
+Runs every recorded segment in whisper_audio/ through each profile. Reference
+transcripts are read from whisper_audio/references.txt (lines of
+`filename|text`) when present; otherwise the 'accurate' profile's output is
+used as the reference, so WER is relative to the original configuration.
+Run from the repository root:
+    python example_scripts/benchmark_decoding_profiles.py [--limit 50]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import soundfile as sf
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from ears.decoding_profiles import DECODING_PROFILES
+from ears.whisper_manager import WhisperManager
+
+AUDIO_DIR = Path("whisper_audio")
+
+
+def words(text):
+    return re.sub(r"[^\w' ]", " ", text.lower()).split()
+
+
+def word_error_rate(reference, hypothesis):
+    ref, hyp = words(reference), words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    # Levenshtein distance over words, one row at a time
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def load_references():
+    path = AUDIO_DIR / "references.txt"
+    if not path.exists():
+        return {}
+    references = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if '|' in line:
+                name, text = line.rstrip('\n').split('|', 1)
+                references[name] = text
+    return references
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    files = sorted(p for p in AUDIO_DIR.glob("*") if p.suffix.lower() in (".wav", ".flac"))[:args.limit]
+    if not files:
+        print(f"No recorded segments found in {AUDIO_DIR}/")
+        sys.exit(1)
+
+    whisper = WhisperManager()
+    segments = []
+    for path in files:
+        audio, sample_rate = sf.read(str(path), dtype='float32')
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        prepared = whisper.prepare_audio({"array": audio, "sampling_rate": sample_rate})
+        if prepared is not None:
+            segments.append((path.name, prepared))
+    audio_seconds = sum(len(a) for _, a in segments) / whisper.model_sample_rate
+
+    references = load_references()
+    whisper.decode(segments[0][1], profile="fast")  # Warm-up
+
+    # Decode with 'accurate' first so it can serve as the fallback reference
+    profiles = ["accurate"] + [name for name in DECODING_PROFILES if name != "accurate"]
+    outputs = {}
+    timings = {}
+    for profile in profiles:
+        start = time.perf_counter()
+        outputs[profile] = {name: whisper.decode(audio, profile=profile) for name, audio in segments}
+        timings[profile] = time.perf_counter() - start
+
+    print(f"{len(segments)} segments, {audio_seconds:.1f}s of audio, "
+          f"references: {'references.txt' if references else 'accurate profile'}")
+    print(f"{'profile':>9} {'RTF':>7} {'WER':>7}")
+    for profile in profiles:
+        errors = [
+            word_error_rate(references.get(name, outputs["accurate"][name]), outputs[profile][name])
+            for name, _ in segments
+        ]
+        print(f"{profile:>9} {timings[profile] / audio_seconds:>7.3f} {sum(errors) / len(errors):>7.3f}")
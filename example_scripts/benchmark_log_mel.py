@@ -0,0 +1,68 @@
+"""Parity check and benchmark for the cached log-mel extractor.
+
+Compares ears.features.LogMelExtractor against the HuggingFace
+WhisperFeatureExtractor on 1-10 s clips: reports the largest feature
+difference (exits non-zero above --tolerance) and the time per clip for
+both. Uses the default extractor configuration, so no model download is
+needed; pass --n-mels 128 for large-v3. Run from the repository root:
+    python example_scripts/benchmark_log_mel.py [--repeats 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from transformers import WhisperFeatureExtractor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from ears.features import LogMelExtractor
+
+SAMPLE_RATE = 16000
+
+
+def speech_like_clip(seconds, rng):
+    """Harmonic tone with syllable-rate amplitude modulation over light noise"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    voiced = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 12))
+    envelope = (0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)) ** 2
+    return (0.2 * voiced * envelope + 0.01 * rng.standard_normal(t.size)).astype(np.float32)
+
+
+def time_call(fn, repeats):
+    fn()  # Warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--durations", type=float, nargs="+", default=[1, 2, 5, 10])
+    parser.add_argument("--n-mels", type=int, default=80)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=1e-4)
+    args = parser.parse_args()
+
+    reference = WhisperFeatureExtractor(feature_size=args.n_mels)
+    extractor = LogMelExtractor(reference)
+    rng = np.random.default_rng(0)
+
+    failed = False
+    print(f"{'clip':>6} {'max diff':>10} {'processor ms':>13} {'cached ms':>10} {'speedup':>8}")
+    for seconds in args.durations:
+        clip = [speech_like_clip(seconds, rng)]
+        expected = reference(clip, sampling_rate=SAMPLE_RATE, return_tensors="pt").input_features
+        actual = extractor(clip)
+        diff = float((expected - actual).abs().max())
+        failed |= diff > args.tolerance
+
+        reference_time = time_call(
+            lambda: reference(clip, sampling_rate=SAMPLE_RATE, return_tensors="pt"), args.repeats
+        )
+        cached_time = time_call(lambda: extractor(clip), args.repeats)
+        print(f"{seconds:>5.1f}s {diff:>10.2e} {reference_time * 1000:>13.2f} "
+              f"{cached_time * 1000:>10.2f} {reference_time / cached_time:>7.1f}x")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,95 @@
+"""Synthesis time and quality proxies vs. the number of F5 flow-matching steps.
+
+Synthesizes a fixed set of phrases at each step count with the same seed, so
+every run starts from the same noise, and compares against the 32-step
+output (the default before latency budgets):
+  - mel dist: RMS log-mel difference in dB against the 32-step audio
+  - WER: word error rate of a Whisper transcript against the input text (--asr)
+Also prints the calibrated cost model and the steps it would pick for a few
+budgets. Run from the repository root:
+    python example_scripts/benchmark_nfe_steps.py --model-dir D:/discord-assistant-cms [--asr]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from fivetts.tts_service import F5TTSService
+
+PHRASES = [
+    "Okay.",
+    "Sure, give me a second.",
+    "That's a fair point, but I think you're missing the bigger picture here.",
+    "Honestly, if you had spent half as long building the thing as you did talking about it, "
+    "we would have shipped it last week and moved on to something more interesting.",
+]
+
+
+def log_mel_db(tts, audio):
+    with torch.inference_mode():
+        mel = tts.model.mel_spec(torch.from_numpy(audio).unsqueeze(0).to(tts.device))
+    return 20 * torch.log10(mel.clamp(min=1e-5)).squeeze(0).cpu().numpy()
+
+
+def mel_distance(tts, audio, reference):
+    a, b = log_mel_db(tts, audio), log_mel_db(tts, reference)
+    frames = min(a.shape[-1], b.shape[-1])
+    return float(np.sqrt(np.mean((a[:, :frames] - b[:, :frames]) ** 2)))
+
+
+def run(model_dir, voice, step_counts, seed, asr_model):
+    tts = F5TTSService(model_dir=model_dir, voice_profile=voice, use_cache=False)
+    whisper = None
+    if asr_model:
+        from ears.whisper_manager import WhisperManager
+        from example_scripts.benchmark_decoding_profiles import word_error_rate
+        whisper = WhisperManager(model_name=asr_model, persist_segments=False)
+
+    def synthesize(text, steps):
+        torch.manual_seed(seed)
+        start = time.perf_counter()
+        audio, sample_rate = tts.synthesize_array(text, nfe_step=steps)
+        return audio, sample_rate, time.perf_counter() - start
+
+    tts.synthesize_array(PHRASES[0], nfe_step=8)  # Warm-up
+    references = [synthesize(text, 32)[0] for text in PHRASES]
+
+    header = f"{'steps':>5} {'seconds':>8} {'RTF':>6} {'mel dist':>9}"
+    print(header + (f" {'WER':>6}" if whisper else ""))
+    for steps in step_counts:
+        seconds, audio_seconds, distances, errors = 0.0, 0.0, [], []
+        for text, reference in zip(PHRASES, references):
+            audio, sample_rate, elapsed = synthesize(text, steps)
+            seconds += elapsed
+            audio_seconds += len(audio) / sample_rate
+            distances.append(mel_distance(tts, audio, reference))
+            if whisper:
+                prepared = whisper.prepare_audio({"array": audio, "sampling_rate": sample_rate})
+                errors.append(word_error_rate(text, whisper.decode(prepared, profile="accurate")))
+        line = f"{steps:>5} {seconds / len(PHRASES):>8.2f} {seconds / audio_seconds:>6.2f} {np.mean(distances):>9.2f}"
+        print(line + (f" {np.mean(errors):>6.3f}" if whisper else ""))
+
+    tts.set_latency_budget(1.0)
+    print()
+    print(f"Cost model: {tts.get_step_stats()}")
+    print(f"{'budget':>7} " + " ".join(f"{len(text):>5}ch" for text in PHRASES))
+    for budget in (0.5, 1.0, 2.0, 4.0):
+        choices = [tts._choose_steps(tts._plan(text, tts.voice), tts.voice, budget) for text in PHRASES]
+        print(f"{budget:>6.1f}s " + " ".join(f"{steps:>7}" for steps in choices))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model-dir", default="D:/discord-assistant-cms")
+    parser.add_argument("--voice", default="Peyton")
+    parser.add_argument("--steps", type=int, nargs="+", default=[4, 8, 12, 16, 24, 32])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--asr", nargs="?", const="openai/whisper-small", default=None,
+                        help="Also transcribe the output with this Whisper model and report WER")
+    args = parser.parse_args()
+
+    run(args.model_dir, args.voice, args.steps, args.seed, args.asr)
@@ -0,0 +1,97 @@
+"""Whisper encoder time vs. segment length: full 30 s window against trimmed.
+
+Times one encoder pass per segment length for the padded 30 s window and
+for the trimmed window WhisperManager uses with trimmed_encoder=True. With
+--compare, also decodes the recorded segments in whisper_audio/ both ways
+and reports word error rate of trimmed against full-window transcripts and
+how often the trimmed result fell back. Run from the repository root:
+    python example_scripts/benchmark_trimmed_encoder.py [--compare]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+import torch
+from transformers import WhisperFeatureExtractor, WhisperForConditionalGeneration
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from ears.features import LogMelExtractor
+from ears.trimmed_encoder import encode_trimmed, trimmed_frame_count
+
+SAMPLE_RATE = 16000
+
+
+def time_call(fn, repeats):
+    with torch.inference_mode():
+        fn()  # Warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def encoder_table(model_name, durations, repeats):
+    model = WhisperForConditionalGeneration.from_pretrained(model_name).eval()
+    extractor = LogMelExtractor(WhisperFeatureExtractor(feature_size=model.config.num_mel_bins))
+    encoder = model.model.encoder
+    rng = np.random.default_rng(0)
+
+    print(f"{'segment':>8} {'frames':>7} {'full ms':>9} {'trimmed ms':>11} {'speedup':>8}")
+    for seconds in durations:
+        features = extractor([(0.1 * rng.standard_normal(int(seconds * SAMPLE_RATE))).astype(np.float32)])
+        frames = trimmed_frame_count(seconds, SAMPLE_RATE / extractor.hop_length, features.shape[-1])
+        full = time_call(lambda: encoder(features), repeats)
+        trimmed = time_call(lambda: encode_trimmed(model, features[..., :frames]), repeats)
+        print(f"{seconds:>7.1f}s {frames:>7} {full * 1000:>9.1f} {trimmed * 1000:>11.1f} {full / trimmed:>7.1f}x")
+
+
+def compare_transcripts(model_name, profile, limit):
+    from ears.whisper_manager import WhisperManager
+    from example_scripts.benchmark_decoding_profiles import word_error_rate
+
+    files = sorted(p for p in Path("whisper_audio").glob("*") if p.suffix.lower() in (".wav", ".flac"))[:limit]
+    if not files:
+        print("No recorded segments in whisper_audio/ to compare")
+        return
+
+    full = WhisperManager(model_name=model_name, persist_segments=False)
+    trimmed = WhisperManager(model_name=model_name, persist_segments=False, trimmed_encoder=True)
+    errors, full_time, trimmed_time = [], 0.0, 0.0
+    for path in files:
+        audio, sample_rate = sf.read(str(path), dtype='float32')
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        audio = full.prepare_audio({"array": audio, "sampling_rate": sample_rate})
+        if audio is None:
+            continue
+        start = time.perf_counter()
+        reference = full.decode(audio, profile=profile)
+        full_time += time.perf_counter() - start
+        start = time.perf_counter()
+        hypothesis = trimmed.decode(audio, profile=profile)
+        trimmed_time += time.perf_counter() - start
+        errors.append(word_error_rate(reference, hypothesis))
+
+    print(f"Decoded {len(errors)} segments: full {full_time:.2f}s, trimmed {trimmed_time:.2f}s "
+          f"({full_time / trimmed_time:.2f}x)")
+    print(f"WER trimmed vs full: {np.mean(errors):.3f}; fallbacks to full window: "
+          f"{trimmed.trim_fallbacks}/{trimmed.trimmed_decodes}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="openai/whisper-small")
+    parser.add_argument("--durations", type=float, nargs="+", default=[1, 2, 3, 4, 6, 10])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--compare", action="store_true", help="Also compare transcripts on whisper_audio/")
+    parser.add_argument("--profile", default="accurate")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    encoder_table(args.model, args.durations, args.repeats)
+    if args.compare:
+        compare_transcripts(args.model, args.profile, args.limit)
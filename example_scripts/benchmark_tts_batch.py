@@ -0,0 +1,93 @@
+"""Throughput of batched vs. sentence-by-sentence F5 synthesis.
+
+Splits a few multi-sentence replies the way conversation mode does and
+synthesizes each reply both sequentially (synthesize_array per sentence) and
+as one synthesize_batch call. Reports seconds of audio produced per
+wall-clock second for both, and how far the batched audio is from the
+sequential audio when both start from the same noise seed (RMS log-mel
+difference in dB). Runs on CPU by default. Run from the repository root:
+    python example_scripts/benchmark_tts_batch.py --model-dir D:/discord-assistant-cms
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+REPLIES = [
+    "Sure. Give me a second to think about it. Okay, I've got it.",
+    "That's a fair point. But I think you're missing the bigger picture here. "
+    "Nobody asked for a tenth dashboard. What they asked for was a button that works.",
+    "Honestly? If you had spent half as long building the thing as you did talking about it, "
+    "we'd have shipped it last week. Anyway, what's next on the list?",
+]
+
+
+def run(model_dir, voice, nfe_step, repeats, max_batch_size):
+    import numpy as np
+    import torch
+    from fivetts.tts_service import F5TTSService
+    from modes.speech_stream import split_sentences
+
+    tts = F5TTSService(model_dir=model_dir, voice_profile=voice, use_cache=False)
+    replies = [split_sentences(reply) for reply in REPLIES]
+    tts.synthesize_batch(replies[0], nfe_step=nfe_step)  # Warm-up
+
+    def log_mel_db(audio):
+        with torch.inference_mode():
+            mel = tts.model.mel_spec(torch.from_numpy(np.ascontiguousarray(audio)).unsqueeze(0).to(tts.device))
+        return 20 * torch.log10(mel.clamp(min=1e-5)).squeeze(0).cpu().numpy()
+
+    print(f"{'reply':>5} {'sents':>5} {'audio s':>8} {'seq s':>7} {'batch s':>8} "
+          f"{'seq x':>6} {'batch x':>8} {'mel dist':>9}")
+    totals = {"audio": 0.0, "sequential": 0.0, "batched": 0.0}
+    for index, sentences in enumerate(replies):
+        sequential = batched = 0.0
+        for _ in range(repeats):
+            start = time.perf_counter()
+            outputs = [tts.synthesize_array(sentence, nfe_step=nfe_step) for sentence in sentences]
+            sequential += time.perf_counter() - start
+            start = time.perf_counter()
+            tts.synthesize_batch(sentences, nfe_step=nfe_step, max_batch_size=max_batch_size)
+            batched += time.perf_counter() - start
+        sequential /= repeats
+        batched /= repeats
+        audio_seconds = sum(len(audio) / rate for audio, rate in outputs)
+
+        # Parity: same seed per sentence, one padded batch vs one call each
+        distances = []
+        voice_conditioning = tts.voice
+        plans = [tts._plan(sentence, voice_conditioning) for sentence in sentences]
+        items = [item for plan in plans for item in plan]
+        batch_waves = tts._infer_batch(items, voice_conditioning, nfe_step, seed=0)
+        for item, batch_wave in zip(items, batch_waves):
+            single_wave = tts._infer([item], voice_conditioning, nfe_step, seed=0)
+            a, b = log_mel_db(single_wave), log_mel_db(batch_wave)
+            frames = min(a.shape[-1], b.shape[-1])
+            distances.append(float(np.sqrt(np.mean((a[:, :frames] - b[:, :frames]) ** 2))))
+
+        totals["audio"] += audio_seconds
+        totals["sequential"] += sequential
+        totals["batched"] += batched
+        print(f"{index:>5} {len(sentences):>5} {audio_seconds:>8.2f} {sequential:>7.2f} {batched:>8.2f} "
+              f"{audio_seconds / sequential:>6.2f} {audio_seconds / batched:>8.2f} {np.mean(distances):>9.2f}")
+
+    print(f"Throughput (audio s per wall s): sequential {totals['audio'] / totals['sequential']:.2f}, "
+          f"batched {totals['audio'] / totals['batched']:.2f} "
+          f"({totals['sequential'] / totals['batched']:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model-dir", default="D:/discord-assistant-cms")
+    parser.add_argument("--voice", default="Peyton")
+    parser.add_argument("--nfe-step", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=2)
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    parser.add_argument("--gpu", action="store_true", help="Use CUDA if available instead of forcing CPU")
+    args = parser.parse_args()
+
+    if not args.gpu:
+        os.environ["CUDA_VISIBLE_DEVICES"] = ""  # Before torch is imported
+    run(args.model_dir, args.voice, args.nfe_step, args.repeats, args.max_batch_size)
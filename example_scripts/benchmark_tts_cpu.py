@@ -0,0 +1,87 @@
+"""Real-time factor and spectral distance of the F5 CPU profiles.
+
+Loads the service once per profile (fp32, int8, bf16) on CPU and
+synthesizes a fixed set of phrases at each thread count with the same
+seed, so every profile starts from the same noise. Reports the real-time
+factor (synthesis seconds per second of audio, lower is faster) and the
+log-spectral distance in dB to the fp32 output. Run from the repository root:
+    python example_scripts/benchmark_tts_cpu.py --model-dir D:/discord-assistant-cms --threads 2 4 8
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ["CUDA_VISIBLE_DEVICES"] = ""  # CPU profiles only; before torch is imported
+
+import numpy as np
+import torch
+from f5_tts.infer.utils_infer import target_sample_rate
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from fivetts.cpu_profile import CPU_PROFILES
+from fivetts.tts_service import F5TTSService
+
+PHRASES = [
+    "Sure, give me a second.",
+    "That's a fair point, but I think you're missing the bigger picture here.",
+    "Honestly, if you had spent half as long building the thing as you did talking about it, "
+    "we would have shipped it last week.",
+]
+
+
+def log_spectral_distance(audio, reference, n_fft=1024, hop_length=256):
+    """RMS over frequency of the dB difference of power spectra, averaged over frames"""
+    samples = min(len(audio), len(reference))
+    window = torch.hann_window(n_fft)
+
+    def power_db(x):
+        spec = torch.stft(torch.from_numpy(np.ascontiguousarray(x[:samples])), n_fft, hop_length,
+                          window=window, return_complex=True)
+        return 10 * torch.log10(spec.abs() ** 2 + 1e-10)
+
+    diff = power_db(audio) - power_db(reference)
+    return float(torch.sqrt((diff ** 2).mean(dim=0)).mean())
+
+
+def synthesize_all(tts, nfe_step, seed):
+    outputs, seconds = [], 0.0
+    for text in PHRASES:
+        voice = tts.voice
+        start = time.perf_counter()
+        audio = tts._infer(tts._plan(text, voice), voice, nfe_step, seed=seed)
+        seconds += time.perf_counter() - start
+        outputs.append(audio)
+    return outputs, seconds
+
+
+def run(model_dir, voice, profiles, thread_counts, nfe_step, seed):
+    references = None
+    print(f"{'profile':>8} {'threads':>7} {'seconds':>8} {'RTF':>6} {'LSD dB':>7}")
+    for profile in profiles:
+        tts = F5TTSService(model_dir=model_dir, voice_profile=voice, use_cache=False, cpu_profile=profile)
+        tts.warm_up()
+        for threads in thread_counts:
+            torch.set_num_threads(threads)
+            outputs, seconds = synthesize_all(tts, nfe_step, seed)
+            if references is None:
+                if profile != "fp32":
+                    raise ValueError("The first profile must be fp32, it is the reference")
+                references = outputs
+            audio_seconds = sum(len(audio) for audio in outputs) / target_sample_rate
+            distance = np.mean([log_spectral_distance(a, r) for a, r in zip(outputs, references)])
+            print(f"{profile:>8} {threads:>7} {seconds:>8.2f} {seconds / audio_seconds:>6.2f} {distance:>7.2f}")
+        del tts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model-dir", default="D:/discord-assistant-cms")
+    parser.add_argument("--voice", default="Peyton")
+    parser.add_argument("--profiles", nargs="+", default=list(CPU_PROFILES), choices=CPU_PROFILES)
+    parser.add_argument("--threads", type=int, nargs="+", default=[torch.get_num_threads()])
+    parser.add_argument("--nfe-step", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run(args.model_dir, args.voice, args.profiles, args.threads, args.nfe_step, args.seed)
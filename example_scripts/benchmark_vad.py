@@ -0,0 +1,70 @@
+"""Estimate how many Whisper calls the frame VAD saves on recorded segments.
+
+Every segment in whisper_audio/ was sent to Whisper by the old RMS gate.
+Each one is scored with FrameVAD, its RMS floor set by --threshold (the
+WhisperManager default unless given), and counted as avoided when its confidence is below --min-confidence or it holds
+less than --min-speech seconds of speech. Also reports VAD throughput.
+Run from the repository root:
+    python example_scripts/benchmark_vad.py --directory whisper_audio --verbose
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import soundfile as sf
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from ears.resampler import resample
+from ears.vad import DEFAULT_MIN_SEGMENT_CONFIDENCE, FrameVAD
+
+MODEL_SAMPLE_RATE = 16000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--directory", default="whisper_audio")
+    parser.add_argument("--threshold", type=float, default=0.03)
+    parser.add_argument("--min-confidence", type=float, default=DEFAULT_MIN_SEGMENT_CONFIDENCE)
+    parser.add_argument("--min-speech", type=float, default=0.2)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    files = sorted(p for p in Path(args.directory).glob("*") if p.suffix.lower() in (".wav", ".flac"))
+    if not files:
+        sys.exit(f"No recorded segments in {args.directory}/")
+
+    # Saved segments are peak-normalized, so the RMS floor sees them louder than
+    # they were captured; lower --threshold to let the relative features decide
+    vad = FrameVAD(MODEL_SAMPLE_RATE, min_rms=args.threshold)
+    avoided = 0
+    audio_seconds = 0.0
+    avoided_seconds = 0.0
+    vad_time = 0.0
+    for path in files:
+        audio, sample_rate = sf.read(str(path), dtype='float32')
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        if sample_rate != MODEL_SAMPLE_RATE:
+            audio = resample(audio, sample_rate, MODEL_SAMPLE_RATE)
+        duration = audio.size / MODEL_SAMPLE_RATE
+
+        start = time.perf_counter()
+        confidence, speech_seconds = vad.score_segment(audio)
+        vad_time += time.perf_counter() - start
+
+        rejected = confidence < args.min_confidence or speech_seconds < args.min_speech
+        audio_seconds += duration
+        if rejected:
+            avoided += 1
+            avoided_seconds += duration
+        if args.verbose:
+            print(f"{path.name}: {duration:5.2f}s confidence {confidence:.2f} "
+                  f"speech {speech_seconds:.2f}s{' -> skipped' if rejected else ''}")
+
+    print(f"Segments: {len(files)} ({audio_seconds:.1f}s of audio)")
+    print(f"Whisper calls avoided: {avoided} ({100 * avoided / len(files):.1f}%), "
+          f"{avoided_seconds:.1f}s of audio not decoded")
+    print(f"VAD cost: {1000 * vad_time / audio_seconds:.3f} ms per second of audio "
+          f"(real-time factor {vad_time / audio_seconds:.5f})")
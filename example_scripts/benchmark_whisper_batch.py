@@ -0,0 +1,54 @@
+"""Measure Whisper decoding throughput (segments/s) for batch sizes 1-8 on CPU.
+
+Uses the recorded segments in whisper_audio/ when there are enough of them,
+otherwise synthetic 2 s clips. Run from the repository root:
+    python example_scripts/benchmark_whisper_batch.py [--segments 16]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from ears.whisper_manager import WhisperManager
+
+
+def load_segments(whisper, count):
+    files = sorted(Path("whisper_audio").glob("*.*"))[:count]
+    segments = []
+    for path in files:
+        audio, sample_rate = sf.read(str(path), dtype='float32')
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        segments.append(whisper.prepare_audio({"array": audio, "sampling_rate": sample_rate}))
+    rng = np.random.default_rng(0)
+    while len(segments) < count:
+        segments.append((0.1 * rng.standard_normal(2 * whisper.model_sample_rate)).astype(np.float32))
+    return segments
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--segments", type=int, default=16)
+    parser.add_argument("--profile", default="accurate", help="fast, balanced or accurate")
+    args = parser.parse_args()
+
+    if torch.cuda.is_available():
+        print("CUDA is available; hide it with CUDA_VISIBLE_DEVICES= to measure CPU throughput")
+
+    whisper = WhisperManager()
+    segments = load_segments(whisper, args.segments)
+    whisper.decode_batch(segments[:1], profile=args.profile)  # Warm-up
+
+    print(f"{'batch':>5} {'seconds':>8} {'segments/s':>11}")
+    for batch_size in range(1, 9):
+        start = time.perf_counter()
+        for i in range(0, len(segments), batch_size):
+            whisper.decode_batch(segments[i:i + batch_size], profile=args.profile)
+        elapsed = time.perf_counter() - start
+        print(f"{batch_size:>5} {elapsed:>8.2f} {len(segments) / elapsed:>11.2f}")
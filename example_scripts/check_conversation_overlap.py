@@ -0,0 +1,183 @@
+"""Check that conversation turns overlap in the LLM -> TTS -> playback pipeline.
+
+Runs ConversationManager with stand-ins for the LLM, Whisper, the TTS
+service and the output device, each taking a fixed time, and hands it two
+transcripts back to back. Passes when the reply to the second turn is
+requested while the first is still being synthesized or played, and the
+second reply only starts playing once the first has finished and the echo
+window has passed. Exits non-zero otherwise. Run from the repository root:
+    python example_scripts/check_conversation_overlap.py
+"""
+import os
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import modes.conversation as conversation
+from ears.transcript_channel import TranscriptChannel
+
+LLM_SECONDS = 0.3
+PIECE_SECONDS = 0.2  # Synthesis time per piece
+PIECES = 3
+SAMPLE_RATE = 24000
+AUDIO_SECONDS = 0.5  # Playback time per piece
+ECHO_WINDOW = 0.5
+
+events = []  # (perf_counter, turn text, what)
+events_lock = threading.Lock()
+
+
+def record(text, what):
+    with events_lock:
+        events.append((time.perf_counter(), text, what))
+
+
+class FakeText:
+    def __init__(self, api_key):
+        pass
+
+    def text_to_text(self, system_prompt, user_prompt):
+        record(user_prompt, "llm start")
+        time.sleep(LLM_SECONDS)
+        record(user_prompt, "llm end")
+        return types.SimpleNamespace(content=f"{user_prompt}.")
+
+
+class FakeTTS:
+    def has_voice(self, voice):
+        return True
+
+    def synthesize_stream(self, text, voice=None):
+        turn = text.rstrip(".")
+        record(turn, "tts start")
+        for _ in range(PIECES):
+            time.sleep(PIECE_SECONDS)
+            yield np.full(int(AUDIO_SECONDS * SAMPLE_RATE), int(turn.split()[-1]), np.float32), SAMPLE_RATE
+        record(turn, "tts end")
+
+
+class FakeLoader:
+    ready = True
+
+    def __init__(self):
+        self.service = FakeTTS()
+
+    def start(self, **kwargs):
+        pass
+
+    def wait(self, timeout=None, stop_event=None):
+        return self.service
+
+
+class FakeWhisper:
+    def __init__(self, **kwargs):
+        self.transcripts = TranscriptChannel()
+
+    def start_listening(self, **kwargs):
+        self.transcripts.reopen()
+        return True
+
+    def stop_listening(self):
+        self.transcripts.close()
+
+    async def next_transcript_async(self):
+        return await self.transcripts.get_async()
+
+    def get_capture_stats(self):
+        return {}
+
+
+class FakePlayer:
+    """Plays each piece in real time on a thread, like ChunkPlayer on a device"""
+
+    def __init__(self, sample_rate, device=None):
+        self.sample_rate = sample_rate
+        self.pieces = []
+        self.finished = threading.Event()
+        self.done = threading.Event()
+        self.first_audio_time = None
+        self.underruns = 0
+
+    def enqueue(self, audio):
+        self.pieces.append(audio)
+
+    def start(self):
+        threading.Thread(target=self._play, daemon=True).start()
+
+    def _play(self):
+        played = 0
+        while not (self.finished.is_set() and played == len(self.pieces)):
+            if played == len(self.pieces):
+                time.sleep(0.01)
+                continue
+            turn = "turn %d" % int(self.pieces[played][0])
+            if played == 0:
+                self.first_audio_time = time.perf_counter()
+                record(turn, "playback start")
+            time.sleep(self.pieces[played].size / self.sample_rate)
+            played += 1
+        record(turn, "playback end")
+        self.done.set()
+
+    def finish(self):
+        self.finished.set()
+
+    def wait(self):
+        self.done.wait()
+
+    def close(self):
+        pass
+
+
+def when(text, what):
+    return next(t for t, turn, event in events if turn == text and event == what)
+
+
+if __name__ == "__main__":
+    conversation.TextManager = FakeText
+    conversation.WhisperManager = FakeWhisper
+    conversation.tts_loader = FakeLoader()
+    conversation.ChunkPlayer = FakePlayer
+    conversation.ConversationLogger = lambda: types.SimpleNamespace(
+        start_session=lambda: None, end_session=lambda: None, set_system_prompt=lambda prompt: None)
+
+    manager = conversation.ConversationManager(
+        "unused", audio_config={"input_device": None, "output_device": None, "sample_rate": 48000},
+        log_conversations=False)
+    manager.echo_window = ECHO_WINDOW
+    thread = manager.start()
+    while manager.pipeline is None:
+        time.sleep(0.01)
+
+    # Pieces are filled with the turn number, so the player can tell the turns apart
+    first, second = "turn 1", "turn 2"
+    manager.whisper.transcripts.put({"text": first})
+    manager.whisper.transcripts.put({"text": second})
+    deadline = time.time() + 30
+    while len([e for e in events if e[2] == "playback end"]) < 2 and time.time() < deadline:
+        time.sleep(0.05)
+    manager.stop()
+    thread.join(5)
+
+    start = events[0][0]
+    for t, turn, what in sorted(events):
+        print(f"{t - start:6.2f}s  {turn}: {what}")
+
+    checks = {
+        "second LLM call starts before the first reply has finished playing":
+            when(second, "llm start") < when(first, "playback end"),
+        "second LLM call starts before the first reply has finished synthesizing":
+            when(second, "llm start") < when(first, "tts end"),
+        "second reply starts playing after the first ends and the echo window passes":
+            when(second, "playback start") >= when(first, "playback end") + ECHO_WINDOW,
+    }
+    for name, ok in checks.items():
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+    stats = manager.get_pipeline_stats()["stages"]
+    print("Mean queued seconds per stage: " +
+          ", ".join(f"{name} {stage['mean_queued']:.2f}" for name, stage in stats.items()))
+    sys.exit(0 if all(checks.values()) else 1)
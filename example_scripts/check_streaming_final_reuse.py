@@ -0,0 +1,77 @@
+"""Check that streaming finals reuse the last partial under the default decoding profile.
+
+Drives StreamingTranscriber, set up the way WhisperManager sets it up, with
+a stand-in manager on the default profile. Its decode records each call and
+takes as long as a real beam-search decode might. One partial covers all
+the speech of a segment, and then the segment closes. Passes when the final
+comes from that partial without another decode, and when switching the
+manager to another profile makes the final decode again with that profile.
+Exits non-zero otherwise. Run from the repository root:
+    python example_scripts/check_streaming_final_reuse.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from ears.decoding_profiles import DEFAULT_PROFILE
+from ears.streaming import StreamingTranscriber
+
+SAMPLE_RATE = 16000
+DECODE_SECONDS = 0.3
+
+
+class FakeWhisper:
+    model_sample_rate = SAMPLE_RATE
+
+    def __init__(self, audio):
+        self.decoding_profile = DEFAULT_PROFILE
+        self.audio = audio
+        self.decodes = []  # (profile, seconds of audio)
+
+    def current_segment(self):
+        return 1, self.audio, self.audio.size / SAMPLE_RATE
+
+    def prepare_audio(self, audio_input):
+        return audio_input["array"]
+
+    def decode(self, audio, profile=None):
+        self.decodes.append((profile, audio.size / SAMPLE_RATE))
+        time.sleep(DECODE_SECONDS)
+        return "hello there"
+
+
+def run(switch_to=None):
+    audio = np.zeros(3 * SAMPLE_RATE, np.float32)
+    whisper = FakeWhisper(audio)
+    streaming = StreamingTranscriber(whisper, 0.5)  # As WhisperManager creates it
+    streaming._decode_partial()
+    if switch_to is not None:
+        whisper.decoding_profile = switch_to
+    partial_decodes = len(whisper.decodes)
+
+    started = time.perf_counter()
+    streaming._finalize({"segment_id": 1, "array": audio, "last_speech_time": 2.2})
+    final = streaming.final_queue.get_nowait()
+    return whisper.decodes, partial_decodes, final, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    checks = {}
+
+    decodes, partial_decodes, final, seconds = run()
+    print(f"Default profile '{DEFAULT_PROFILE}': decodes {decodes}, final '{final['text']}' "
+          f"in {seconds * 1000:.0f} ms")
+    checks["partials use the manager's profile"] = decodes[0][0] == DEFAULT_PROFILE
+    checks["final is served from the partial"] = len(decodes) == partial_decodes and bool(final["text"])
+
+    other = "fast" if DEFAULT_PROFILE != "fast" else "accurate"
+    decodes, partial_decodes, final, seconds = run(switch_to=other)
+    print(f"Switched to '{other}' mid-segment: decodes {decodes}, final in {seconds * 1000:.0f} ms")
+    checks["final decodes again after a profile switch"] = decodes[partial_decodes:] == [(other, 3.0)]
+
+    for name, ok in checks.items():
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+    sys.exit(0 if all(checks.values()) else 1)
@@ -0,0 +1,72 @@
+"""Check that the int8 and ONNX STT backends transcribe like the fp32 torch backend.
+
+Decodes the recorded segments in whisper_audio/ (or synthetic clips when
+there are none) with every backend and reports word error rate against the
+torch transcripts plus relative decode time. Exits non-zero if any backend's
+mean WER exceeds --max-wer. The ONNX export is cached under model_cache/onnx/
+on first run. Run from the repository root:
+    python example_scripts/check_stt_backend_parity.py [--backends int8 onnx]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from ears.whisper_manager import WhisperManager
+from example_scripts.benchmark_decoding_profiles import word_error_rate
+
+
+def load_clips(whisper, limit):
+    files = sorted(p for p in Path("whisper_audio").glob("*") if p.suffix.lower() in (".wav", ".flac"))
+    clips = []
+    for path in files[:limit]:
+        audio, sample_rate = sf.read(str(path), dtype='float32')
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        prepared = whisper.prepare_audio({"array": audio, "sampling_rate": sample_rate})
+        if prepared is not None:
+            clips.append(prepared)
+    if not clips:
+        rng = np.random.default_rng(0)
+        clips = [(0.1 * rng.standard_normal(3 * whisper.model_sample_rate)).astype(np.float32)]
+    return clips
+
+
+def transcribe_all(whisper, clips, profile):
+    start = time.perf_counter()
+    texts = [whisper.decode(clip, profile=profile) for clip in clips]
+    return texts, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=["int8", "onnx"])
+    parser.add_argument("--profile", default="accurate")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--max-wer", type=float, default=0.1)
+    args = parser.parse_args()
+
+    reference = WhisperManager(backend="torch")
+    clips = load_clips(reference, args.limit)
+    reference_texts, reference_time = transcribe_all(reference, clips, args.profile)
+    print(f"torch: {len(clips)} clips in {reference_time:.2f}s")
+
+    failed = False
+    for backend in args.backends:
+        whisper = WhisperManager(backend=backend)
+        texts, elapsed = transcribe_all(whisper, clips, args.profile)
+        wer = np.mean([word_error_rate(ref, hyp) for ref, hyp in zip(reference_texts, texts)])
+        status = "OK" if wer <= args.max_wer else "MISMATCH"
+        failed |= wer > args.max_wer
+        print(f"{backend}: WER vs torch {wer:.3f}, time {elapsed:.2f}s "
+              f"({reference_time / elapsed:.2f}x) {status}")
+        for ref, hyp in zip(reference_texts, texts):
+            if ref != hyp:
+                print(f"    torch: {ref}\n    {backend}: {hyp}")
+
+    sys.exit(1 if failed else 0)
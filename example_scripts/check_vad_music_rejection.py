@@ -0,0 +1,140 @@
+"""Check that FrameVAD keeps speech and rejects music before it reaches Whisper.
+
+Replays clips through FrameVAD block by block, over a faint noise floor and
+with WhisperManager's default --min-rms, and cuts segments the way
+WhisperManager does: a segment closes after 0.8 s without speech and is kept
+when the mean probability of its speech frames reaches --min-confidence and
+it holds at least --min-speech seconds of speech. Synthetic clips are
+always included: a held three-note chord, a rhythmic plucked melody, and a
+syllabic speech-like signal (glottal pulses through moving formants). Speech
+files are scaled to -20 dBFS RMS and music files to a 0.3 peak, looped to
+--music-seconds. Exits non-zero if a music clip keeps any segment or a
+speech clip keeps none. Run from the repository root:
+    python example_scripts/check_vad_music_rejection.py [--speech a.wav ...] [--music b.wav ...]
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import scipy.signal
+import soundfile as sf
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from ears.resampler import resample
+from ears.vad import DEFAULT_MIN_SEGMENT_CONFIDENCE, FrameVAD
+
+SAMPLE_RATE = 16000
+BLOCK = 341  # A 1024-frame capture block at 48 kHz, after resampling
+SILENCE_DURATION = 0.8
+
+
+def chord(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return amplitude / 3 * sum(np.sin(2 * np.pi * f * t) for f in (261.6, 329.6, 392.0))
+
+
+def plucked_melody(seconds, amplitude=0.3, bpm=120):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    beat = 60 / bpm
+    notes = np.array([220, 277, 330, 440])[(t // beat).astype(int) % 4]
+    tone = sum(np.sin(2 * np.pi * notes * k * t) / k for k in (1, 2, 3))
+    return amplitude * np.exp(-(t % beat) * 8) * tone / 1.8
+
+
+def syllables(seconds, amplitude=0.3, seed=0):
+    """Gliding-pitch pulse train through moving formants, gated into ~4 syllables a second"""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    f0 = 120 + 25 * np.sin(2 * np.pi * 0.7 * t) + 10 * np.sin(2 * np.pi * 3.1 * t)
+    pulses = (np.diff(np.floor(np.cumsum(f0 / SAMPLE_RATE)), prepend=0) > 0).astype(np.float64)
+
+    voiced = np.zeros(n)
+    step = int(0.02 * SAMPLE_RATE)
+    for start in range(0, n, step):
+        f1 = 500 + 300 * np.sin(start / SAMPLE_RATE * 5.3)
+        f2 = 1500 + 600 * np.sin(start / SAMPLE_RATE * 3.7)
+        for frequency, bandwidth in ((f1, 80), (f2, 120), (2500, 200)):
+            r = np.exp(-np.pi * bandwidth / SAMPLE_RATE)
+            theta = 2 * np.pi * frequency / SAMPLE_RATE
+            voiced[start:start + step] += scipy.signal.lfilter(
+                [1 - r], [1, -2 * r * np.cos(theta), r * r], pulses[start:start + step])
+
+    envelope = np.zeros(n)
+    position = 0
+    while position < n:
+        length = int(rng.uniform(0.12, 0.3) * SAMPLE_RATE)
+        envelope[position:position + length] = np.hanning(length)[:n - position]
+        position += length + int(rng.uniform(0.04, 0.15) * SAMPLE_RATE)
+    voiced *= envelope
+    return amplitude * voiced / np.abs(voiced).max()
+
+
+def load(path):
+    audio, sample_rate = sf.read(path, dtype='float32')
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    if sample_rate != SAMPLE_RATE:
+        audio = resample(audio, sample_rate, SAMPLE_RATE)
+    return audio
+
+
+def kept_segments(vad, audio, noise_rms, min_confidence, min_speech, seed=1):
+    """Replay `audio` between 1 s of noise before and 2 s after; returns kept segments' speech seconds"""
+    rng = np.random.default_rng(seed)
+    lead, tail = np.zeros(SAMPLE_RATE), np.zeros(2 * SAMPLE_RATE)
+    signal = np.concatenate([lead, audio, tail])
+    signal = (signal + rng.normal(0, noise_rms, signal.size)).astype(np.float32)
+
+    vad.reset()
+    probabilities, states = zip(*(vad.process(signal[i:i + BLOCK]) for i in range(0, signal.size, BLOCK)))
+    probabilities, states = np.concatenate(probabilities), np.concatenate(states)
+
+    frame_seconds = vad.frame_length / SAMPLE_RATE
+    gap = int(SILENCE_DURATION / frame_seconds)
+    speech = np.flatnonzero(states)
+    kept = []
+    # Segments are runs of speech frames separated by less than the closing silence
+    for run in np.split(speech, np.flatnonzero(np.diff(speech) >= gap) + 1) if speech.size else []:
+        confidence = float(probabilities[run].mean())
+        speech_seconds = run.size * frame_seconds
+        if confidence >= min_confidence and speech_seconds >= min_speech:
+            kept.append(speech_seconds)
+    return kept
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--speech", nargs="*", default=[])
+    parser.add_argument("--music", nargs="*", default=[])
+    parser.add_argument("--music-seconds", type=float, default=10.0)
+    parser.add_argument("--noise-rms", type=float, default=0.002)
+    parser.add_argument("--min-rms", type=float, default=0.03)
+    parser.add_argument("--min-confidence", type=float, default=DEFAULT_MIN_SEGMENT_CONFIDENCE)
+    parser.add_argument("--min-speech", type=float, default=0.2)
+    args = parser.parse_args()
+
+    clips = [("speech", "synthetic syllables", syllables(6))]
+    for path in args.speech:
+        audio = load(path)
+        clips.append(("speech", os.path.basename(path), audio * 0.1 / np.sqrt(np.mean(audio ** 2))))
+    clips.append(("music", "synthetic chord", chord(args.music_seconds)))
+    clips.append(("music", "synthetic plucked melody", plucked_melody(args.music_seconds)))
+    for path in args.music:
+        audio = load(path)
+        audio = np.resize(audio * 0.3 / np.abs(audio).max(), int(args.music_seconds * SAMPLE_RATE))
+        clips.append(("music", os.path.basename(path), audio))
+
+    vad = FrameVAD(SAMPLE_RATE, min_rms=args.min_rms)
+    failed = []
+    for kind, name, audio in clips:
+        kept = kept_segments(vad, audio, args.noise_rms, args.min_confidence, args.min_speech)
+        ok = bool(kept) if kind == "speech" else not kept
+        if not ok:
+            failed.append(name)
+        print(f"{kind:6} {name}: {len(kept)} segment(s) kept, {sum(kept):.2f}s of speech frames"
+              f"{'' if ok else ' -> FAIL'}")
+
+    print(f"{len(clips) - len(failed)}/{len(clips)} clips handled as expected")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,41 @@
+"""CPU inference profiles for the F5 DiT.
+
+- fp32: the model as trained
+- int8: the attention and feed-forward Linear layers of every DiT block are
+  dynamically quantized (int8 weights, activations quantized on the fly).
+  Embeddings, the adaptive-norm modulation and the output projection stay
+  fp32; they are small and the output is most sensitive to them.
+- bf16: the sampler runs under bfloat16 autocast. Only worth it on CPUs with
+  native bf16 (AVX512-BF16 / AMX); elsewhere it is slower than fp32.
+
+int8 and bf16 don't combine: quantized Linear kernels only take fp32 input.
+The vocoder always runs in fp32. example_scripts/benchmark_tts_cpu.py
+reports speed and spectral distance to fp32 for each profile.
+"""
+import contextlib
+import logging
+
+import torch
+
+CPU_PROFILES = ("fp32", "int8", "bf16")
+
+# DiTBlock submodules whose Linear layers are quantized in the int8 profile
+QUANTIZED_BLOCK_PARTS = {"attn", "ff"}
+
+
+def apply_cpu_profile(model, profile):
+    """Prepare a loaded CFM model for `profile`; call after the checkpoint is loaded"""
+    if profile not in CPU_PROFILES:
+        raise ValueError(f"Unknown TTS CPU profile '{profile}', expected one of {CPU_PROFILES}")
+    if profile == "int8":
+        for block in model.transformer.transformer_blocks:
+            torch.ao.quantization.quantize_dynamic(block, QUANTIZED_BLOCK_PARTS, dtype=torch.qint8, inplace=True)
+        logging.info(f"Quantized the Linear layers of {len(model.transformer.transformer_blocks)} DiT blocks to int8")
+    return model
+
+
+def sampler_precision(profile):
+    """Context for the CFM sampler call under `profile`"""
+    if profile == "bf16":
+        return torch.autocast("cpu", dtype=torch.bfloat16)
+    return contextlib.nullcontext()
@@ -0,0 +1,192 @@
+"""Content-addressed cache of synthesized phrases.
+
+Entries are keyed on a hash of the normalized text plus everything that
+changes the output: voice profile, checkpoint hash and the inference
+settings. A small in-memory LRU tier serves repeated lines without touching
+disk; an on-disk tier (one .npz per phrase) survives restarts and is kept
+under a byte cap by evicting the least recently used files.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+
+def normalize_text(text):
+    """Unicode-normalize and collapse whitespace; case and punctuation affect prosody, so they stay"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def checkpoint_hash(path):
+    """SHA-256 of a checkpoint, remembered in a sidecar file until the checkpoint changes"""
+    stat = os.stat(path)
+    sidecar = Path(f"{path}.sha256")
+    stamp = f"{stat.st_size}:{stat.st_mtime_ns}"
+    try:
+        saved_stamp, digest = sidecar.read_text().split()
+        if saved_stamp == stamp:
+            return digest
+    except (OSError, ValueError):
+        pass
+
+    logging.info(f"Hashing TTS checkpoint {path} (once per checkpoint)")
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(16 * 1024 * 1024), b""):
+            sha.update(block)
+    digest = sha.hexdigest()
+    try:
+        sidecar.write_text(f"{stamp} {digest}")
+    except OSError:
+        pass  # Read-only model directory: hash again next time
+    return digest
+
+
+class PhraseCache:
+    def __init__(self, directory, memory_items=64, disk_max_bytes=512 * 1024 ** 2, max_text_chars=300):
+        self.directory = Path(directory)
+        self.memory_items = memory_items
+        self.disk_max_bytes = disk_max_bytes
+        self.max_text_chars = max_text_chars  # Longer texts are one-off replies, not phrases
+
+        self._memory = OrderedDict()  # key -> (audio, sample_rate)
+        self._disk = OrderedDict()  # key -> file size, least recently used first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._scan_disk()
+
+    def _scan_disk(self):
+        files = []
+        for path in self.directory.glob("*.npz"):
+            try:
+                stat = path.stat()
+                files.append((stat.st_mtime, path.stem, stat.st_size))
+            except OSError:
+                continue
+        for _, key, size in sorted(files):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def key(self, text, voice, checkpoint, **settings):
+        """Cache key for `text` spoken by `voice` with this checkpoint and inference settings"""
+        payload = json.dumps({
+            "text": normalize_text(text),
+            "voice": voice,
+            "checkpoint": checkpoint,
+            "settings": settings
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def cacheable(self, text):
+        return len(text) <= self.max_text_chars
+
+    def get(self, key):
+        """(audio, sample_rate) for `key`, or None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry
+            on_disk = key in self._disk
+
+        if on_disk:
+            path = self._path(key)
+            try:
+                with np.load(path) as data:
+                    entry = (data["audio"], int(data["sample_rate"]))
+                os.utime(path)  # Recency for eviction across restarts
+            except (OSError, KeyError, ValueError) as e:
+                logging.warning(f"Dropping unreadable TTS cache entry {path.name}: {e}")
+                self._remove_disk(key)
+                entry = None
+            if entry is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    if key in self._disk:
+                        self._disk.move_to_end(key)
+                    self._remember(key, entry)
+                return entry
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, audio, sample_rate):
+        audio = np.asarray(audio, dtype=np.float32)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{key}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(f, audio=audio, sample_rate=sample_rate)
+            os.replace(tmp_path, path)  # Readers never see a partial file
+            size = path.stat().st_size
+        except OSError as e:
+            logging.warning(f"Could not write TTS cache entry: {e}")
+            size = None
+
+        with self._lock:
+            self.stores += 1
+            self._remember(key, (audio, sample_rate))
+            if size is not None:
+                self._disk_bytes += size - self._disk.pop(key, 0)
+                self._disk[key] = size
+                self._evict_disk()
+
+    def _remember(self, key, entry):
+        entry[0].setflags(write=False)  # Shared by every hit, so nobody may modify it
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        while self._disk and self._disk_bytes > self.disk_max_bytes:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def _remove_disk(self, key):
+        with self._lock:
+            size = self._disk.pop(key, None)
+            if size is not None:
+                self._disk_bytes -= size
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _path(self, key):
+        return self.directory / f"{key}.npz"
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "stores": self.stores,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes
+            }
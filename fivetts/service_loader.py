@@ -0,0 +1,101 @@
+"""The process's one TTS service, loaded in the background.
+
+Loading the DiT checkpoint and vocoder takes long enough that doing it at
+import time kept the web UI from coming up, and every mode that built its
+own F5TTSService loaded another copy. start() kicks off a single load on a
+background thread; modes call wait() for the shared instance and the web UI
+polls status(). Modes never clean the service up themselves, since others
+may still be using it; shutdown() does that once, at process exit.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from fivetts.tts_service import F5TTSService
+from fivetts.tts_worker import TTSWorkerClient
+
+
+class TTSServiceLoader:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ready = threading.Event()  # Set once loading finished, successfully or not
+        self._thread = None
+        self.service = None
+        self.error = None
+        self.started_at = None
+        self.load_seconds = None
+        self.worker = False
+
+    def start(self, worker=False, **service_kwargs):
+        """Begin loading unless a load already started; the first caller's settings win"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.worker = worker
+            self.started_at = time.perf_counter()
+            self._thread = threading.Thread(
+                target=self._load, args=(worker, service_kwargs), daemon=True, name="tts-loader"
+            )
+            self._thread.start()
+            atexit.register(self.shutdown)
+
+    def _load(self, worker, service_kwargs):
+        try:
+            # In worker mode synthesis runs in its own process, away from capture and Whisper
+            service_class = TTSWorkerClient if worker else F5TTSService
+            self.service = service_class(**service_kwargs)
+            self.load_seconds = time.perf_counter() - self.started_at
+            logging.info(f"TTS service ready after {self.load_seconds:.1f}s")
+        except Exception as e:
+            self.error = str(e)
+            logging.error(f"Failed to load TTS service: {e}")
+        finally:
+            self._ready.set()
+
+    @property
+    def ready(self):
+        return self.service is not None
+
+    def wait(self, timeout=None, stop_event=None):
+        """The shared service once loaded, or None on timeout/stop; raises if loading failed"""
+        if self._thread is None:
+            self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._ready.wait(0.5):
+            if stop_event is not None and stop_event.is_set():
+                return None
+            if deadline is not None and time.monotonic() > deadline:
+                return None
+        if self.service is None:
+            raise RuntimeError(f"TTS service failed to load: {self.error}")
+        return self.service
+
+    def shutdown(self):
+        """Release the shared service's temp files (and worker process); runs at exit"""
+        service, self.service = self.service, None
+        if service is None:
+            return
+        service.cleanup()
+        if isinstance(service, TTSWorkerClient):
+            service.close()
+
+    def status(self):
+        if self._thread is None:
+            state = "not_started"
+        elif self.service is not None:
+            state = "ready"
+        elif self.error is not None:
+            state = "failed"
+        else:
+            state = "loading"
+        return {
+            "state": state,
+            "worker": self.worker,
+            "error": self.error,
+            "load_seconds": self.load_seconds,
+            "elapsed": time.perf_counter() - self.started_at if self.started_at else None
+        }
+
+
+loader = TTSServiceLoader()
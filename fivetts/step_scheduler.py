@@ -0,0 +1,113 @@
+"""Chooses the number of flow-matching steps (NFE) that fits a latency budget.
+
+Synthesis time is modelled per text batch as
+
+    steps * (step_base + step_per_frame * frames) + vocoder_per_frame * generated_frames
+
+where `frames` is the reference plus generated mel length the DiT runs over.
+The coefficients are measured on this machine at startup (calibrate); after
+that every real synthesis updates a load factor, the running ratio of
+measured to predicted time, so a busy machine is given fewer steps and an
+idle one gets them back.
+"""
+import logging
+import math
+import time
+
+# Fewer steps than this audibly smear the output; more than this buys nothing
+MIN_STEPS = 8
+MAX_STEPS = 32
+
+
+class StepScheduler:
+    def __init__(self, min_steps=MIN_STEPS, max_steps=MAX_STEPS, load_smoothing=0.3):
+        self.min_steps = min_steps
+        self.max_steps = max_steps
+        self.load_smoothing = load_smoothing  # Weight of the newest measurement in the load factor
+
+        self.step_base = None  # Seconds per step independent of length
+        self.step_per_frame = None  # Seconds per step per mel frame
+        self.vocoder_per_frame = None  # Seconds per generated mel frame
+        self.load_factor = 1.0
+        self.decisions = 0
+        self.over_budget = 0
+
+    @property
+    def calibrated(self):
+        return self.step_per_frame is not None
+
+    def calibrate(self, run_steps, run_vocoder, frame_counts=(200, 800), probe_steps=(2, 6)):
+        """Fit the cost model from timed runs.
+
+        `run_steps(frames, steps)` runs the DiT sampler over `frames` mel
+        frames; `run_vocoder(frames)` decodes that many frames. Timing two
+        step counts cancels fixed per-call overhead (text embedding, setup),
+        and two lengths give the per-frame slope.
+        """
+        low_steps, high_steps = probe_steps
+        run_steps(frame_counts[0], low_steps)  # Warm-up: kernels, allocator
+
+        per_step = []
+        for frames in frame_counts:
+            low = _timed(run_steps, frames, low_steps)
+            high = _timed(run_steps, frames, high_steps)
+            per_step.append(max(high - low, 1e-6) / (high_steps - low_steps))
+        vocoder = [_timed(run_vocoder, frames) for frames in frame_counts]
+
+        span = frame_counts[1] - frame_counts[0]
+        self.step_per_frame = max(per_step[1] - per_step[0], 0.0) / span
+        self.step_base = max(per_step[0] - self.step_per_frame * frame_counts[0], 0.0)
+        self.vocoder_per_frame = max(vocoder) / frame_counts[vocoder.index(max(vocoder))]
+        self.load_factor = 1.0
+        logging.info(
+            f"NFE calibration: {self.step_base * 1000:.2f} ms/step + "
+            f"{self.step_per_frame * 1e6:.1f} us/step/frame, vocoder {self.vocoder_per_frame * 1e6:.1f} us/frame"
+        )
+
+    def estimate(self, plan, steps):
+        """Predicted seconds to synthesize `plan` [(frames, generated_frames), ...] with `steps`"""
+        seconds = sum(
+            steps * (self.step_base + self.step_per_frame * frames) + self.vocoder_per_frame * generated
+            for frames, generated in plan
+        )
+        return seconds * self.load_factor
+
+    def choose(self, plan, budget):
+        """Most steps whose predicted time fits `budget` seconds, within [min_steps, max_steps]"""
+        if not self.calibrated or budget is None:
+            return self.max_steps
+        per_step = sum(self.step_base + self.step_per_frame * frames for frames, _ in plan) * self.load_factor
+        fixed = sum(self.vocoder_per_frame * generated for _, generated in plan) * self.load_factor
+        steps = math.floor((budget - fixed) / per_step) if per_step > 0 else self.max_steps
+        steps = min(self.max_steps, max(self.min_steps, steps))
+        self.decisions += 1
+        if self.estimate(plan, steps) > budget:
+            self.over_budget += 1  # Even min_steps doesn't fit; quality floor wins
+        return steps
+
+    def observe(self, plan, steps, seconds):
+        """Fold a measured synthesis time into the load factor"""
+        if not self.calibrated:
+            return
+        predicted = self.estimate(plan, steps) / self.load_factor
+        if predicted <= 0:
+            return
+        ratio = min(4.0, max(0.25, seconds / predicted))
+        self.load_factor += self.load_smoothing * (ratio - self.load_factor)
+
+    def get_stats(self):
+        return {
+            "calibrated": self.calibrated,
+            "step_base_ms": self.step_base * 1000 if self.calibrated else None,
+            "step_per_frame_us": self.step_per_frame * 1e6 if self.calibrated else None,
+            "vocoder_per_frame_us": self.vocoder_per_frame * 1e6 if self.calibrated else None,
+            "load_factor": self.load_factor,
+            "decisions": self.decisions,
+            "over_budget": self.over_budget
+        }
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
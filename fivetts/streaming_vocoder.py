@@ -0,0 +1,62 @@
+"""Vocoder decoding in overlapping chunks, so playback can start early.
+
+Flow matching produces a text batch's whole mel at once, but the vocoder
+doesn't have to wait for anything else: decode_chunks runs vocos on a
+window around each chunk of frames (context_frames on both sides, enough
+to cover its receptive field) and keeps only the chunk's own samples. The
+window for frame range [a, b) starts at frame ws, and output sample j of
+that window is global sample ws * hop + j, so the pieces line up exactly
+with a whole-mel decode. Consecutive pieces also overlap by a few samples
+and are cross-faded, which hides any residual edge error.
+
+The first chunk is short (about 200 ms) to get audio out quickly; later
+chunks are longer to keep the redundant context decoding cheap.
+"""
+import numpy as np
+import torch
+
+
+def decode_chunks(vocoder, mel, hop_length, first_chunk_frames=20, chunk_frames=64, context_frames=16,
+                  fade_samples=256):
+    """Yield float32 audio for `mel` (1, n_mels, frames) piece by piece.
+
+    The pieces concatenate to the same (frames - 1) * hop_length samples
+    vocoder.decode(mel) returns.
+    """
+    frames = mel.shape[-1]
+    total_samples = (frames - 1) * hop_length
+    fade_samples = min(fade_samples, context_frames * hop_length)
+    fade_in = np.linspace(0, 1, fade_samples, dtype=np.float32)
+
+    tail = None  # Overlap samples decoded by the previous chunk, to blend into this one
+    start = 0
+    size = first_chunk_frames
+    while start * hop_length < total_samples:
+        end = min(frames, start + size)
+        last = end >= frames or end * hop_length >= total_samples
+
+        window_start = max(0, start - context_frames)
+        window_end = min(frames, end + context_frames)
+        # Scoped per chunk: inference mode must not stay on in the consumer between yields
+        with torch.inference_mode():
+            wave = vocoder.decode(mel[..., window_start:window_end])
+        wave = wave.squeeze(0).float().cpu().numpy()
+
+        # Global sample range of this chunk, plus the overlap for the next one
+        first = start * hop_length
+        stop = total_samples if last else min(end * hop_length + fade_samples, total_samples)
+        piece = wave[first - window_start * hop_length:stop - window_start * hop_length]
+
+        if tail is not None:
+            overlap = min(len(tail), len(piece))
+            piece = piece.copy()
+            piece[:overlap] = tail[:overlap] * (1 - fade_in[:overlap]) + piece[:overlap] * fade_in[:overlap]
+        if last:
+            yield piece
+            return
+        keep = (end - start) * hop_length
+        tail = piece[keep:]
+        yield piece[:keep]
+
+        start = end
+        size = chunk_frames
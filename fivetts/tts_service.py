@@ -8,19 +8,45 @@ from f5_tts.model import DiT, CFM
 from f5_tts.infer.utils_infer import (
     load_vocoder,
     load_model,
-    preprocess_ref_audio_text,
-    infer_process,
+    chunk_text,
     target_sample_rate,
+    target_rms,
+    cross_fade_duration,
+    hop_length,
 )
+from f5_tts.model.utils import convert_char_to_pinyin
 import logging
 import time
+import uuid
+import contextlib
+import threading
 import sounddevice as sd
 import numpy as np
 
+from fivetts.phrase_cache import PhraseCache, checkpoint_hash
+from fivetts.voice_conditioning import VoicePool
+from fivetts.step_scheduler import StepScheduler, MIN_STEPS
+from fivetts.cpu_profile import CPU_PROFILES, apply_cpu_profile, sampler_precision
+from fivetts.streaming_vocoder import decode_chunks
+
+# Log-mel value of silence in F5's vocos features (log of the 1e-5 clamp)
+MEL_SILENCE = -11.5129
+
 class F5TTSService:
-    def __init__(self, model_dir="D:/discord-assistant-cms", voice_profile="Peyton"):
+    def __init__(self, model_dir="D:/discord-assistant-cms", voice_profile="Peyton", use_cache=True,
+                 cache_memory_items=64, cache_disk_bytes=512 * 1024 ** 2, max_loaded_voices=4,
+                 latency_budget=None, min_nfe_step=MIN_STEPS, cpu_profile="fp32", cpu_threads=None):
         """Initialize F5 TTS service with model and voice profile"""
         self.device = torch.device('cuda:0' if torch.cuda.is_available() else 'cpu')
+
+        # CPU-only tuning (see fivetts/cpu_profile.py); ignored on GPU
+        if cpu_profile not in CPU_PROFILES:
+            raise ValueError(f"Unknown TTS CPU profile '{cpu_profile}', expected one of {CPU_PROFILES}")
+        self.cpu_profile = cpu_profile if self.device.type == "cpu" else "fp32"
+        if cpu_threads and self.device.type == "cpu":
+            # Process-wide: in worker mode this only limits the TTS process, otherwise Whisper too
+            torch.set_num_threads(cpu_threads)
+            logging.info(f"TTS using {cpu_threads} intra-op threads")
         
         # Validate model directory
         if not os.path.exists(model_dir):
@@ -46,10 +72,36 @@ class F5TTSService:
         if not os.path.exists(self.voice_profile_dir):
             raise FileNotFoundError(f"Voice profile not found at: {self.voice_profile_dir}")
         
+        # Inference settings (part of the phrase cache key)
+        self.nfe_step = 32
+        self.cfg_strength = 2.0
+        self.sway_sampling_coef = -1.0
+        self.speed = 1.0
+
+        # With a latency budget (seconds per synthesize call), nfe_step becomes the ceiling
+        # and the scheduler picks fewer steps when the text is long or the machine is busy
+        self.latency_budget = latency_budget
+        self.steps = StepScheduler(min_steps=min_nfe_step, max_steps=self.nfe_step)
+
+        # Repeated phrases are served from memory or disk instead of re-synthesized
+        self.cache = None
+        if use_cache:
+            self.cache = PhraseCache(
+                os.path.join(model_dir, "tts_cache"),
+                memory_items=cache_memory_items,
+                disk_max_bytes=cache_disk_bytes
+            )
+            self.checkpoint_hash = checkpoint_hash(self.checkpoint_path)
+        
         # Initialize components
         self.vocab_char_map = None
         self.model = None
         self.vocoder = None
+        self.voice = None  # Conditioning of the default voice
+        self.voices = None  # Pool of voice profiles sharing this model
+        self.max_loaded_voices = max_loaded_voices
+        self.voices_dir = os.path.join(model_dir, "voice_profiles")
+        self._inference_lock = None
         self.ref_audio = None
         self.ref_text = None
         
@@ -68,12 +120,17 @@ class F5TTSService:
             
             # Load checkpoint
             self._load_checkpoint()
+            apply_cpu_profile(self.model, self.cpu_profile)
             
             # Load vocoder
             self.vocoder = load_vocoder(vocoder_name="vocos", is_local=False)
             
             # Load reference audio
             self._load_reference_audio()
+
+            # Measure per-step cost on this machine
+            if self.latency_budget is not None:
+                self._calibrate_steps()
             
             logging.info(f"F5TTS Service initialized successfully using {self.device}")
             return True
@@ -135,40 +192,187 @@ class F5TTSService:
     def _load_checkpoint(self):
         """Load model checkpoint"""
         try:
-            checkpoint = torch.load(self.checkpoint_path, map_location=self.device)
+            start = time.perf_counter()
+            try:
+                # Memory-mapped: only the model weights are paged in, not optimizer/EMA state
+                checkpoint = torch.load(self.checkpoint_path, map_location=self.device, mmap=True)
+            except RuntimeError as e:
+                # Legacy (pre-zipfile) checkpoints can't be mapped
+                logging.info(f"Checkpoint can't be memory-mapped ({e}), loading it fully")
+                checkpoint = torch.load(self.checkpoint_path, map_location=self.device)
             self.model.load_state_dict(checkpoint['model_state_dict'])
+            del checkpoint
+            logging.info(f"Loaded TTS checkpoint in {time.perf_counter() - start:.1f}s")
             
         except Exception as e:
             logging.error(f"Error loading checkpoint: {e}")
             raise
 
     def _load_reference_audio(self):
-        """Load reference audio from voice profile"""
+        """Set up the voice pool and load the default voice's conditioning (cached under .conditioning/)"""
         try:
-            samples_file = os.path.join(self.voice_profile_dir, "samples.txt")
-            if not os.path.exists(samples_file):
-                raise FileNotFoundError(f"Voice profile samples not found: {samples_file}")
-                
-            with open(samples_file, 'r') as f:
-                first_sample = f.readline().strip().split('|')
-                if len(first_sample) != 2:
-                    raise ValueError("Invalid sample format in samples.txt")
-                    
-                audio_file, text = first_sample
-                self.ref_audio, self.ref_text = preprocess_ref_audio_text(audio_file, text)
+            self.voices = VoicePool(self.voices_dir, self.model.mel_spec, self.device, self.max_loaded_voices)
+            # Older f5_tts DiT versions cache text embeddings on the module itself,
+            # which is only safe with one synthesis at a time
+            if not hasattr(self.model.transformer, "_get_cache_local"):
+                self._inference_lock = threading.Lock()
+            self.voice = self.voices.get(self.voice_profile)
+            self.ref_audio = self.voice.audio
+            self.ref_text = self.voice.ref_text
                 
         except Exception as e:
             logging.error(f"Error loading reference audio: {e}")
             raise
 
-    def synthesize(self, text, output_path=None):
+    def _plan(self, text, voice):
+        """Text batches and their total mel lengths (reference + generated), as infer_process splits them"""
+        # Longer references leave room for less text per batch
+        max_chars = int(len(voice.ref_text.encode("utf-8")) / voice.duration * (22 - voice.duration) * self.speed)
+        ref_text_len = len(self._ref_text(voice).encode("utf-8"))
+        ref_audio_len = voice.audio.shape[-1] // hop_length
+
+        plan = []
+        for gen_text in chunk_text(text, max_chars=max_chars):
+            local_speed = self.speed if len(gen_text.encode("utf-8")) >= 10 else 0.3
+            gen_text_len = len(gen_text.encode("utf-8"))
+            duration = ref_audio_len + int(ref_audio_len / ref_text_len * gen_text_len / local_speed)
+            plan.append((gen_text, duration))
+        return plan
+
+    @staticmethod
+    def _ref_text(voice):
+        ref_text = voice.ref_text
+        if len(ref_text[-1].encode("utf-8")) == 1:
+            ref_text = ref_text + " "
+        return ref_text
+
+    def _sample(self, **kwargs):
+        """CFM.sample under the CPU profile's precision"""
+        with sampler_precision(self.cpu_profile):
+            return self.model.sample(**kwargs)
+
+    def _infer(self, plan, voice, nfe_step, seed=None):
+        """F5 inference from precomputed conditioning; mirrors f5_tts infer_process"""
+        ref_text = self._ref_text(voice)
+        ref_audio_len = voice.audio.shape[-1] // hop_length
+
+        waves = []
+        with torch.inference_mode(), self._inference_lock or contextlib.nullcontext():
+            for gen_text, duration in plan:
+                # The reference mel is passed as `cond`, so CFM.sample skips its own mel extraction
+                generated, _ = self._sample(
+                    cond=voice.mel,
+                    text=convert_char_to_pinyin([ref_text + gen_text]),
+                    duration=duration,
+                    steps=nfe_step,
+                    cfg_strength=self.cfg_strength,
+                    sway_sampling_coef=self.sway_sampling_coef,
+                    seed=seed
+                )
+                generated = generated.to(torch.float32)[:, ref_audio_len:, :].permute(0, 2, 1)
+                wave = self.vocoder.decode(generated)
+                if voice.ref_rms < target_rms:
+                    wave = wave * voice.ref_rms / target_rms
+                waves.append(wave.squeeze().cpu().numpy())
+
+        return _cross_fade(waves, int(cross_fade_duration * target_sample_rate))
+
+    def _infer_stream(self, plan, voice, nfe_step, seed=None):
+        """Like _infer, but yields the audio in pieces as the vocoder decodes them"""
+        ref_text = self._ref_text(voice)
+        ref_audio_len = voice.audio.shape[-1] // hop_length
+        fade_samples = int(cross_fade_duration * target_sample_rate)
+        gain = voice.ref_rms / target_rms if voice.ref_rms < target_rms else 1.0
+
+        held = np.zeros(0, dtype=np.float32)  # End of the previous text batch, cross-faded into the next
+        emitted = 0
+        for index, (gen_text, duration) in enumerate(plan):
+            with torch.inference_mode(), self._inference_lock or contextlib.nullcontext():
+                generated, _ = self._sample(
+                    cond=voice.mel,
+                    text=convert_char_to_pinyin([ref_text + gen_text]),
+                    duration=duration,
+                    steps=nfe_step,
+                    cfg_strength=self.cfg_strength,
+                    sway_sampling_coef=self.sway_sampling_coef,
+                    seed=seed
+                )
+                mel = generated.to(torch.float32)[:, ref_audio_len:, :].permute(0, 2, 1)
+
+            # Same overlap _cross_fade uses between text batches
+            batch_samples = (mel.shape[-1] - 1) * hop_length
+            overlap = min(fade_samples, emitted + len(held), batch_samples, len(held)) if index else 0
+            if len(held) > overlap:
+                yield held[:len(held) - overlap]
+                emitted += len(held) - overlap
+            tail = held[len(held) - overlap:]
+
+            # Hold back what the next batch's fade-in will overlap
+            hold_back = fade_samples if index < len(plan) - 1 else 0
+            buffer = np.zeros(0, dtype=np.float32)
+            blended = overlap == 0
+            for piece in decode_chunks(self.vocoder, mel, hop_length):
+                buffer = np.concatenate([buffer, piece * gain])
+                if not blended:
+                    if len(buffer) < overlap:
+                        continue
+                    buffer[:overlap] = tail * np.linspace(1, 0, overlap) + buffer[:overlap] * np.linspace(0, 1, overlap)
+                    blended = True
+                release = len(buffer) - hold_back
+                if release > 0:
+                    yield buffer[:release]
+                    emitted += release
+                    buffer = buffer[release:]
+            held = buffer
+        if len(held):
+            yield held
+
+    def _infer_batch(self, items, voice, nfe_step, seed=None):
+        """One padded CFM sampler and vocoder pass over several (gen_text, duration) items
+
+        Returns one waveform per item, trimmed to the length a single-item
+        call would produce.
         """
-        Synthesize speech from text
+        ref_text = self._ref_text(voice)
+        ref_audio_len = voice.audio.shape[-1] // hop_length
+        durations = [duration for _, duration in items]
+
+        with torch.inference_mode(), self._inference_lock or contextlib.nullcontext():
+            # CFM.sample masks each row beyond its own duration, so the padding doesn't leak into attention
+            generated, _ = self._sample(
+                cond=voice.mel.expand(len(items), -1, -1),
+                text=convert_char_to_pinyin([ref_text + gen_text for gen_text, _ in items]),
+                duration=torch.tensor(durations, dtype=torch.long, device=self.device),
+                steps=nfe_step,
+                cfg_strength=self.cfg_strength,
+                sway_sampling_coef=self.sway_sampling_coef,
+                seed=seed
+            )
+            generated = generated.to(torch.float32)[:, ref_audio_len:, :]
+
+            # Beyond each row's duration the sampler output is meaningless; decode it as silence
+            # so the vocoder's receptive field sees the same thing as at the end of a single clip
+            frames = torch.tensor(durations, device=generated.device) - ref_audio_len
+            padding = torch.arange(generated.shape[1], device=generated.device)[None, :] >= frames[:, None]
+            generated = generated.masked_fill(padding.unsqueeze(-1), MEL_SILENCE)
+            waves = self.vocoder.decode(generated.permute(0, 2, 1))
+            if voice.ref_rms < target_rms:
+                waves = waves * voice.ref_rms / target_rms
+            waves = waves.cpu().numpy()
+
+        # The vocoder yields (frames - 1) * hop samples for a clip of `frames` mel frames
+        return [waves[i, :(n - 1) * hop_length] for i, n in enumerate(frames.tolist())]
+
+    def synthesize_array(self, text, voice=None, nfe_step=None, latency_budget=None):
+        """
+        Synthesize speech from text in memory
         Args:
             text: Text to synthesize
-            output_path: Optional path to save audio file. If None, creates temp file
+            voice: Voice profile name; the default voice if None
+            nfe_step: Exact number of flow-matching steps, overriding the scheduler
+            latency_budget: Seconds this call may take; the service budget if None
         Returns:
-            Path to the generated audio file
+            (float32 audio array, sample rate), or None on failure
         """
         if not text or not isinstance(text, str):
             logging.error(f"Invalid text input: {text}")
@@ -178,69 +382,336 @@ class F5TTSService:
             logging.info(f"Starting synthesis for text: {text[:50]}...")
             
             # Validate model state
-            if self.model is None or self.vocoder is None or self.ref_audio is None or self.ref_text is None:
+            if self.model is None or self.vocoder is None or self.voices is None:
                 logging.error("Model components not fully initialized")
                 return None
+
+            voice_name = voice or self.voice_profile
+            voice = self.voices.get(voice_name)
+
+            # Before step scheduling, so a hit doesn't depend on the current load
+            cache_key = None
+            if self.cache is not None and self.cache.cacheable(text):
+                cache_key = self._cache_key(text, voice, nfe_step)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logging.info("Using cached speech for phrase")
+                    return cached
+
+            plan = self._plan(text, voice)
+            if not plan:
+                logging.error("No synthesizable text after batching")
+                return None
+            nfe_step = nfe_step or self._choose_steps(plan, voice, latency_budget)
             
             # Generate audio with torch.no_grad() for efficiency
             with torch.no_grad():
                 # Generate audio
-                logging.info("Generating audio...")
-                audio, sample_rate, _ = infer_process(
-                    self.ref_audio,
-                    self.ref_text,
-                    text,
-                    self.model,
-                    self.vocoder,
-                    mel_spec_type="vocos",
-                    speed=1.0,
-                    nfe_step=32,
-                    cfg_strength=2.0,
-                    sway_sampling_coef=-1.0
-                )
+                logging.info(f"Generating audio with {nfe_step} steps...")
+                start = time.perf_counter()
+                audio = self._infer(plan, voice, nfe_step)
+                sample_rate = target_sample_rate
                 
                 # Wait for GPU operations to complete
                 if torch.cuda.is_available():
                     torch.cuda.synchronize()
+                self.steps.observe(self._frame_plan(plan, voice), nfe_step, time.perf_counter() - start)
                 
-                if audio is None or len(audio) == 0:
-                    logging.error("Generated audio is empty or invalid")
-                    return None
-                
-                # Setup output path
-                if output_path is None:
-                    temp_dir = os.path.join(self.voice_profile_dir, "temp")
-                    os.makedirs(temp_dir, exist_ok=True)
-                    output_path = os.path.join(temp_dir, f"speech_{int(time.time())}.wav")
-                
-                # Save audio file with high quality settings
-                logging.info(f"Saving audio to {output_path}")
-                try:
-                    sf.write(
-                        output_path,
-                        audio,
-                        sample_rate,
-                        'PCM_16',
-                        format='WAV'
-                    )
-                    # Ensure file is written completely
-                    sf.SoundFile(output_path).close()
-                except Exception as write_error:
-                    logging.error(f"Failed to write audio file: {write_error}")
-                    return None
-                
-                # Verify file
-                if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
-                    logging.error("Output file is invalid")
-                    return None
-                
-                logging.info("Successfully generated speech file")
-                return output_path
+            if audio is None or len(audio) == 0:
+                logging.error("Generated audio is empty or invalid")
+                return None
+            
+            audio = np.asarray(audio, dtype=np.float32)
+            if cache_key is not None:
+                self.cache.put(cache_key, audio, sample_rate)
+            return audio, sample_rate
             
         except Exception as e:
             logging.error(f"Error synthesizing speech: {str(e)}", exc_info=True)
             return None
 
+    def synthesize_stream(self, text, voice=None, nfe_step=None, latency_budget=None):
+        """
+        Synthesize speech from text, yielding audio as soon as the vocoder decodes it
+        Args:
+            text: Text to synthesize
+            voice: Voice profile name; the default voice if None
+            nfe_step: Exact number of flow-matching steps, overriding the scheduler
+            latency_budget: Seconds this call may take; the service budget if None
+        Yields:
+            (float32 audio piece, sample rate); the pieces join into synthesize_array's audio
+        """
+        if not text or not isinstance(text, str):
+            logging.error(f"Invalid text input: {text}")
+            return
+
+        try:
+            if self.model is None or self.vocoder is None or self.voices is None:
+                logging.error("Model components not fully initialized")
+                return
+
+            voice_name = voice or self.voice_profile
+            voice = self.voices.get(voice_name)
+
+            # Before step scheduling, so a hit doesn't depend on the current load
+            cache_key = None
+            if self.cache is not None and self.cache.cacheable(text):
+                cache_key = self._cache_key(text, voice, nfe_step)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logging.info("Using cached speech for phrase")
+                    yield cached
+                    return
+
+            plan = self._plan(text, voice)
+            if not plan:
+                logging.error("No synthesizable text after batching")
+                return
+            nfe_step = nfe_step or self._choose_steps(plan, voice, latency_budget)
+
+            logging.info(f"Streaming audio with {nfe_step} steps...")
+            pieces = []
+            stream = self._infer_stream(plan, voice, nfe_step)
+            # Only time spent producing pieces; the consumer's time between them isn't synthesis
+            busy = 0.0
+            while True:
+                start = time.perf_counter()
+                piece = next(stream, None)
+                busy += time.perf_counter() - start
+                if piece is None:
+                    break
+                piece = np.asarray(piece, dtype=np.float32)
+                pieces.append(piece)
+                yield piece, target_sample_rate
+            self.steps.observe(self._frame_plan(plan, voice), nfe_step, busy)
+
+            if cache_key is not None and pieces:
+                self.cache.put(cache_key, np.concatenate(pieces), target_sample_rate)
+
+        except Exception as e:
+            logging.error(f"Error streaming speech: {str(e)}", exc_info=True)
+
+    def _cache_key(self, text, voice, nfe_step):
+        """voice is the resolved conditioning; nfe_step is the caller's pinned count, or None when the scheduler picks it"""
+        # Scheduled audio is cached once at whatever step count load allowed; keying it on
+        # the chosen count would make hits depend on the drifting load factor
+        return self.cache.key(
+            text,
+            voice=voice.name,
+            # A re-recorded reference clip under the same name must not serve the old voice
+            voice_fingerprint=voice.fingerprint,
+            checkpoint=self.checkpoint_hash,
+            nfe_step=nfe_step,
+            cfg_strength=self.cfg_strength,
+            sway_sampling_coef=self.sway_sampling_coef,
+            speed=self.speed,
+            # Reduced-precision profiles sound slightly different from fp32
+            cpu_profile=self.cpu_profile
+        )
+
+    @staticmethod
+    def _frame_plan(plan, voice):
+        ref_audio_len = voice.audio.shape[-1] // hop_length
+        return [(duration, duration - ref_audio_len) for _, duration in plan]
+
+    def _choose_steps(self, plan, voice, latency_budget=None):
+        """nfe_step, or fewer steps when a latency budget applies and the full count wouldn't fit"""
+        budget = latency_budget if latency_budget is not None else self.latency_budget
+        if budget is None or not self.steps.calibrated:
+            return self.nfe_step
+        steps = self.steps.choose(self._frame_plan(plan, voice), budget)
+        logging.debug(f"Scheduled {steps} steps for a {budget:.2f}s budget")
+        return steps
+
+    def _calibrate_steps(self):
+        """Time the sampler and vocoder on dummy text with the default voice"""
+        voice = self.voice
+        ref_text = self._ref_text(voice)
+        ref_audio_len = voice.audio.shape[-1] // hop_length
+
+        def sync():
+            if torch.cuda.is_available():
+                torch.cuda.synchronize()
+
+        def run_steps(frames, steps):
+            with torch.inference_mode():
+                self._sample(
+                    cond=voice.mel,
+                    text=convert_char_to_pinyin([ref_text + "calibration " * ((frames - ref_audio_len) // 40)]),
+                    duration=frames,
+                    steps=steps,
+                    cfg_strength=self.cfg_strength,
+                    sway_sampling_coef=self.sway_sampling_coef
+                )
+            sync()
+
+        def run_vocoder(frames):
+            with torch.inference_mode():
+                self.vocoder.decode(torch.zeros(1, voice.mel.shape[-1], frames, device=self.device))
+            sync()
+
+        start = time.perf_counter()
+        # Frame counts are the total lengths the DiT sees, reference included
+        self.steps.calibrate(
+            run_steps,
+            run_vocoder,
+            frame_counts=(ref_audio_len + 100, ref_audio_len + 600)
+        )
+        logging.info(f"NFE step calibration took {time.perf_counter() - start:.1f}s")
+
+    def set_latency_budget(self, seconds):
+        """Seconds per synthesize call, or None to always use nfe_step"""
+        self.latency_budget = seconds
+        if seconds is not None and not self.steps.calibrated:
+            self._calibrate_steps()
+
+    def get_step_stats(self):
+        stats = self.steps.get_stats()
+        stats["latency_budget"] = self.latency_budget
+        stats["max_nfe_step"] = self.nfe_step
+        return stats
+
+    def has_voice(self, voice):
+        return self.voices.has_voice(voice)
+
+    def warm_up(self, text="Hello there, this is a warm-up."):
+        """One uncached synthesis, so kernel and allocator setup happens before the first real reply"""
+        start = time.perf_counter()
+        with torch.no_grad():
+            self._infer(self._plan(text, self.voice), self.voice, self.steps.min_steps)
+        return time.perf_counter() - start
+
+    def set_default_voice(self, voice):
+        """Switch the voice used when synthesize calls don't name one; no model reload"""
+        if not self.voices.has_voice(voice):
+            raise ValueError(f"Unknown voice profile '{voice}'")
+        self.voice = self.voices.get(voice)
+        self.voice_profile = voice
+        self.ref_audio = self.voice.audio
+        self.ref_text = self.voice.ref_text
+        logging.info(f"Default voice set to '{voice}'")
+
+    def list_voices(self):
+        """Available, loaded and default voices"""
+        stats = self.voices.get_stats()
+        stats["default"] = self.voice_profile
+        return stats
+
+    def get_cache_stats(self):
+        """Phrase cache hit/miss counters, or None when caching is off"""
+        return self.cache.get_stats() if self.cache is not None else None
+
+    def save_audio(self, audio, sample_rate, output_path=None):
+        """
+        Write synthesized audio to a WAV file
+        Args:
+            audio: Audio array from synthesize_array
+            sample_rate: Its sample rate
+            output_path: Optional path. If None, creates a uniquely named file in the temp dir
+        Returns:
+            Path to the written file, or None on failure
+        """
+        if output_path is None:
+            temp_dir = os.path.join(self.voice_profile_dir, "temp")
+            os.makedirs(temp_dir, exist_ok=True)
+            # Timestamp for ordering, random suffix so calls within the same second can't collide
+            output_path = os.path.join(
+                temp_dir, f"speech_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.wav"
+            )
+        
+        logging.info(f"Saving audio to {output_path}")
+        try:
+            sf.write(output_path, audio, sample_rate, 'PCM_16', format='WAV')
+        except Exception as write_error:
+            logging.error(f"Failed to write audio file: {write_error}")
+            return None
+        return output_path
+
+    def synthesize_batch(self, texts, voice=None, nfe_step=None, latency_budget=None, max_batch_size=8):
+        """
+        Synthesize several texts (e.g. the sentences of one reply) in padded batches
+        Args:
+            texts: List of texts to synthesize
+            voice: Voice profile name; the default voice if None
+            nfe_step: Exact number of flow-matching steps, overriding the scheduler
+            latency_budget: Seconds the whole list may take; the service budget if None
+            max_batch_size: Most text batches run through the sampler at once
+        Returns:
+            List with (float32 audio array, sample rate) or None per text
+        """
+        results = [None] * len(texts)
+        try:
+            if self.model is None or self.vocoder is None or self.voices is None:
+                logging.error("Model components not fully initialized")
+                return results
+
+            voice_name = voice or self.voice_profile
+            voice = self.voices.get(voice_name)
+            plans = [self._plan(text, voice) if text and isinstance(text, str) else [] for text in texts]
+
+            # Serve cached phrases; everything else goes into the batch
+            cache_keys = [None] * len(texts)
+            pending = []  # (text index, batch index within that text, item)
+            for i, (text, plan) in enumerate(zip(texts, plans)):
+                if not plan:
+                    logging.error(f"Invalid text input: {text}")
+                    continue
+                if self.cache is not None and self.cache.cacheable(text):
+                    cache_keys[i] = self._cache_key(text, voice, nfe_step)
+                    cached = self.cache.get(cache_keys[i])
+                    if cached is not None:
+                        results[i] = cached
+                        continue
+                pending.extend((i, j, item) for j, item in enumerate(plan))
+            if not pending:
+                return results
+            # Only the misses count against the budget. Conservative: the scheduler's
+            # model is sequential, batching only makes it faster
+            nfe_step = nfe_step or self._choose_steps([item for _, _, item in pending], voice, latency_budget)
+
+            # Similar lengths batch together, so little compute goes to padding
+            pending.sort(key=lambda entry: entry[2][1])
+            waves = {}
+            logging.info(f"Generating {len(pending)} text batches with {nfe_step} steps...")
+            for start in range(0, len(pending), max_batch_size):
+                group = pending[start:start + max_batch_size]
+                for (i, j, _), wave in zip(group, self._infer_batch([item for _, _, item in group], voice, nfe_step)):
+                    waves[(i, j)] = wave
+            if torch.cuda.is_available():
+                torch.cuda.synchronize()
+
+            fade_samples = int(cross_fade_duration * target_sample_rate)
+            for i, plan in enumerate(plans):
+                if results[i] is not None or not plan:
+                    continue
+                audio = np.asarray(_cross_fade([waves[(i, j)] for j in range(len(plan))], fade_samples), dtype=np.float32)
+                results[i] = (audio, target_sample_rate)
+                if cache_keys[i] is not None:
+                    self.cache.put(cache_keys[i], audio, target_sample_rate)
+            return results
+
+        except Exception as e:
+            logging.error(f"Error synthesizing speech batch: {str(e)}", exc_info=True)
+            return results
+
+    def synthesize(self, text, output_path=None, voice=None, nfe_step=None, latency_budget=None):
+        """
+        Synthesize speech from text to a file
+        Args:
+            text: Text to synthesize
+            output_path: Optional path to save audio file. If None, creates temp file
+            voice: Voice profile name; the default voice if None
+            nfe_step: Exact number of flow-matching steps, overriding the scheduler
+            latency_budget: Seconds this call may take; the service budget if None
+        Returns:
+            Path to the generated audio file
+        """
+        result = self.synthesize_array(text, voice=voice, nfe_step=nfe_step, latency_budget=latency_budget)
+        if result is None:
+            return None
+        audio, sample_rate = result
+        return self.save_audio(audio, sample_rate, output_path)
+
     def cleanup(self):
         """Cleanup any temporary files and resources"""
         try:
@@ -284,4 +755,17 @@ class F5TTSService:
                 logging.error(f"Error during playback: {e}")
                 
         except Exception as e:
-            logging.error(f"Error playing audio: {e}") 
\ No newline at end of file
+            logging.error(f"Error playing audio: {e}") 
+
+
+def _cross_fade(waves, fade_samples):
+    """Join text batches with a linear cross-fade, as infer_batch_process does"""
+    final_wave = waves[0]
+    for next_wave in waves[1:]:
+        samples = min(fade_samples, len(final_wave), len(next_wave))
+        if samples <= 0:
+            final_wave = np.concatenate([final_wave, next_wave])
+            continue
+        overlap = final_wave[-samples:] * np.linspace(1, 0, samples) + next_wave[:samples] * np.linspace(0, 1, samples)
+        final_wave = np.concatenate([final_wave[:-samples], overlap, next_wave[samples:]])
+    return final_wave
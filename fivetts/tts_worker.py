@@ -0,0 +1,401 @@
+"""F5TTSService in a separate process.
+
+Synthesis holds the GIL and torch's intra-op threads for seconds at a time,
+which starves audio capture, Whisper and Flask when they share a process
+with it. TTSWorkerClient starts the service in its own interpreter
+(`python -m fivetts.tts_worker`) and forwards calls to it over an
+authenticated multiprocessing connection. Only small request and reply
+dicts are pickled: audio comes back through shared-memory slots the client
+owns, so arrays are copied once out of the slot and never serialized.
+
+A worker that dies is restarted (up to max_restarts); requests in flight
+fail like a failed synthesis would. Each start ends with a warm-up
+synthesis, so the first real reply doesn't pay for kernel and allocator
+setup.
+"""
+import argparse
+import atexit
+import itertools
+import logging
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+import torch
+
+from fivetts.tts_service import F5TTSService
+
+AUTHKEY_ENV = "TTS_WORKER_AUTHKEY"
+
+# Service methods callable through the worker
+WORKER_METHODS = {
+    "synthesize_array", "synthesize_batch", "warm_up", "has_voice", "set_default_voice",
+    "list_voices", "get_cache_stats", "get_step_stats", "set_latency_budget"
+}
+
+
+def _attach(name):
+    """Open a segment the client owns without this process's resource tracker adopting it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        if os.name == "posix":
+            # Otherwise the tracker unlinks the client's segment when this worker exits
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _pack(result, slot):
+    """Move every array in `result` into `slot`, leaving a (offset, shape, dtype) reference behind"""
+    offset = 0
+
+    def pack(value):
+        nonlocal offset
+        if isinstance(value, np.ndarray):
+            array = np.ascontiguousarray(value)
+            if offset + array.nbytes > slot.size:
+                logging.warning(f"Audio of {array.nbytes} bytes doesn't fit the shared slot, sending it inline")
+                return {"inline": array}
+            np.ndarray(array.shape, array.dtype, buffer=slot.buf, offset=offset)[...] = array
+            ref = {"shm": (offset, array.shape, array.dtype.str)}
+            offset += array.nbytes
+            return ref
+        if isinstance(value, (list, tuple)):
+            return type(value)(pack(item) for item in value)
+        return value
+
+    return pack(result)
+
+
+def _unpack(payload, slot):
+    def unpack(value):
+        if isinstance(value, dict) and "shm" in value:
+            offset, shape, dtype = value["shm"]
+            return np.ndarray(shape, np.dtype(dtype), buffer=slot.buf, offset=offset).copy()
+        if isinstance(value, dict) and "inline" in value:
+            return value["inline"]
+        if isinstance(value, (list, tuple)):
+            return type(value)(unpack(item) for item in value)
+        return value
+
+    return unpack(payload)
+
+
+def serve(address, authkey):
+    """Worker side: load the service, then answer requests until the client goes away"""
+    conn = Client(address, authkey=authkey)
+    init = conn.recv()
+    if init.get("torch_threads"):
+        torch.set_num_threads(init["torch_threads"])
+    slots = [_attach(name) for name in init["slots"]]
+
+    try:
+        service = F5TTSService(**init["service"])
+    except Exception as e:
+        conn.send({"ready": False, "error": str(e)})
+        return
+    conn.send({"ready": True, "voice_profile": service.voice_profile, "voice_profile_dir": service.voice_profile_dir})
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        if request is None:
+            break
+
+        try:
+            if request["method"] not in WORKER_METHODS:
+                raise ValueError(f"Method not available in the TTS worker: {request['method']}")
+            result = getattr(service, request["method"])(*request["args"], **request["kwargs"])
+            response = {"id": request["id"], "ok": True, "result": _pack(result, slots[request["slot"]])}
+        except Exception as e:
+            response = {"id": request["id"], "ok": False, "error": str(e), "error_type": type(e).__name__}
+        conn.send(response)
+
+    for slot in slots:
+        slot.close()
+
+
+class TTSWorkerClient:
+    """Drop-in for F5TTSService that runs synthesis in a worker process"""
+
+    def __init__(self, torch_threads=None, slots=2, slot_seconds=120, max_restarts=5,
+                 startup_timeout=900, call_timeout=300, warm_up_text="Hello there, this is a warm-up.",
+                 **service_kwargs):
+        self.service_kwargs = service_kwargs
+        self.torch_threads = torch_threads
+        self.max_restarts = max_restarts
+        self.startup_timeout = startup_timeout
+        self.call_timeout = call_timeout  # A call taking longer means the worker is stuck
+        self.warm_up_text = warm_up_text
+        self.voice_profile = service_kwargs.get("voice_profile")
+        self.voice_profile_dir = None
+
+        # float32 at 24 kHz; the client owns the segments so they outlive any one worker
+        slot_bytes = int(slot_seconds * 24000 * 4)
+        self._slots = [shared_memory.SharedMemory(create=True, size=slot_bytes) for _ in range(slots)]
+        self._free_slots = queue.Queue()
+        for index in range(slots):
+            self._free_slots.put(index)
+
+        self._ids = itertools.count()
+        self._pending = {}  # request id -> [Event, response]
+        self._pending_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._closing = False
+        self._down = False  # Gave up restarting
+        self.process = None
+        self._conn = None
+        self.restarts = 0
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+
+        try:
+            self._start()
+        except Exception:
+            self._release_slots()
+            raise
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True, name="tts-worker-dispatch")
+        self._dispatcher.start()
+        atexit.register(self.close)
+
+    def _start(self):
+        """Launch a worker, hand it the service settings and shared slots, then warm it up"""
+        authkey = secrets.token_bytes(32)
+        with Listener(("127.0.0.1", 0), authkey=authkey) as listener:
+            env = dict(os.environ)
+            env[AUTHKEY_ENV] = authkey.hex()
+            # Repository root, so `fivetts` resolves in the worker whatever the working directory
+            root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+            host, port = listener.address
+            self.process = subprocess.Popen(
+                [sys.executable, "-m", "fivetts.tts_worker", "--host", host, "--port", str(port)], env=env
+            )
+            # Accept on a helper thread so a worker that dies on import doesn't hang us
+            accepted = []
+            acceptor = threading.Thread(target=lambda: accepted.append(listener.accept()), daemon=True)
+            acceptor.start()
+            while acceptor.is_alive():
+                acceptor.join(0.5)
+                if self.process.poll() is not None and not accepted:
+                    raise RuntimeError(f"TTS worker exited with code {self.process.returncode} before connecting")
+            conn = accepted[0]
+
+        conn.send({
+            "service": self.service_kwargs,
+            "slots": [slot.name for slot in self._slots],
+            "torch_threads": self.torch_threads
+        })
+        ready = self._recv(conn, self.startup_timeout)
+        if not ready.get("ready"):
+            self.process.wait(timeout=10)
+            raise RuntimeError(f"TTS worker failed to initialize: {ready.get('error')}")
+        self.voice_profile = ready["voice_profile"]
+        self.voice_profile_dir = ready["voice_profile_dir"]
+
+        # Warm-up runs before anyone else can send, so no slot juggling is needed
+        conn.send({"id": -1, "method": "warm_up", "args": (self.warm_up_text,), "kwargs": {}, "slot": 0})
+        warm = self._recv(conn, self.startup_timeout)
+        if warm.get("ok"):
+            logging.info(f"TTS worker (pid {self.process.pid}) warmed up in {warm['result']:.2f}s")
+        else:
+            logging.warning(f"TTS worker warm-up failed: {warm.get('error')}")
+        self._conn = conn
+        self._ready.set()
+
+    def _recv(self, conn, timeout):
+        deadline = time.monotonic() + timeout
+        while not conn.poll(0.5):
+            if self.process.poll() is not None:
+                raise RuntimeError(f"TTS worker exited with code {self.process.returncode} during startup")
+            if time.monotonic() > deadline:
+                raise RuntimeError("TTS worker did not respond in time")
+        return conn.recv()
+
+    def _dispatch(self):
+        """Route replies to waiting callers; restart the worker when it dies"""
+        while not self._closing:
+            try:
+                if self._conn.poll(0.5):
+                    response = self._conn.recv()
+                    with self._pending_lock:
+                        waiter = self._pending.get(response["id"])
+                    if waiter is not None:
+                        waiter[1] = response
+                        waiter[0].set()
+                elif self.process.poll() is not None:
+                    raise EOFError(f"exit code {self.process.returncode}")
+            except (EOFError, OSError) as e:
+                if self._closing:
+                    break
+                self._handle_crash(e)
+
+    def _handle_crash(self, reason):
+        self._ready.clear()
+        logging.error(f"TTS worker died: {reason!r}")
+        with self._pending_lock:
+            for waiter in self._pending.values():
+                waiter[1] = {"ok": False, "error": "TTS worker exited", "error_type": "RuntimeError"}
+                waiter[0].set()
+        try:
+            self._conn.close()
+        except OSError:
+            pass
+
+        while not self._closing and self.restarts < self.max_restarts:
+            self.restarts += 1
+            logging.info(f"Restarting TTS worker ({self.restarts}/{self.max_restarts})")
+            try:
+                self._start()
+                return
+            except Exception as e:
+                logging.error(f"TTS worker restart failed: {e}")
+                if self.process is not None and self.process.poll() is None:
+                    self.process.kill()
+                time.sleep(min(30, 2 ** self.restarts))
+        logging.error("TTS worker is down; synthesis will fail until the service is recreated")
+        self._down = True
+        self._closing = True
+        self._ready.set()  # Wake callers waiting for a restart so they fail now
+
+    def _call(self, method, *args, **kwargs):
+        """Run `method` on the worker's service and return its result"""
+        # Waits out a restart in progress
+        if not self._ready.wait(self.startup_timeout) or self._down or self._closing:
+            raise RuntimeError("TTS worker is not available")
+        slot = self._free_slots.get()
+        request_id = next(self._ids)
+        waiter = [threading.Event(), None]
+        with self._pending_lock:
+            self._pending[request_id] = waiter
+        try:
+            with self._send_lock:
+                process = self.process
+                self._conn.send({"id": request_id, "method": method, "args": args, "kwargs": kwargs, "slot": slot})
+            self.requests += 1
+            if not waiter[0].wait(self.call_timeout):
+                # A hung worker never crashes on its own; kill it and let the dispatcher restart it
+                self.timeouts += 1
+                logging.error(f"TTS worker did not answer {method} within {self.call_timeout}s, restarting it")
+                if process.poll() is None:
+                    self._ready.clear()  # Later callers wait for the restart instead of the dead pipe
+                    process.kill()
+                raise RuntimeError("TTS worker timed out")
+            response = waiter[1]
+            if not response["ok"]:
+                self.failures += 1
+                error = ValueError if response.get("error_type") == "ValueError" else RuntimeError
+                raise error(response["error"])
+            return _unpack(response["result"], self._slots[slot])
+        finally:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            self._free_slots.put(slot)
+
+    def synthesize_array(self, text, voice=None, nfe_step=None, latency_budget=None):
+        try:
+            return self._call("synthesize_array", text, voice=voice, nfe_step=nfe_step, latency_budget=latency_budget)
+        except (RuntimeError, OSError) as e:
+            logging.error(f"Error synthesizing speech in TTS worker: {e}")
+            return None
+
+    def synthesize_batch(self, texts, voice=None, nfe_step=None, latency_budget=None, max_batch_size=8):
+        try:
+            return self._call("synthesize_batch", texts, voice=voice, nfe_step=nfe_step,
+                              latency_budget=latency_budget, max_batch_size=max_batch_size)
+        except (RuntimeError, OSError) as e:
+            logging.error(f"Error synthesizing speech batch in TTS worker: {e}")
+            return [None] * len(texts)
+
+    def synthesize_stream(self, text, voice=None, nfe_step=None, latency_budget=None):
+        # Generators don't cross the pipe, so the worker sends each sentence whole
+        result = self.synthesize_array(text, voice=voice, nfe_step=nfe_step, latency_budget=latency_budget)
+        if result is not None:
+            yield result
+
+    def synthesize(self, text, output_path=None, voice=None, nfe_step=None, latency_budget=None):
+        result = self.synthesize_array(text, voice=voice, nfe_step=nfe_step, latency_budget=latency_budget)
+        if result is None:
+            return None
+        audio, sample_rate = result
+        return self.save_audio(audio, sample_rate, output_path)
+
+    # File helpers only touch voice_profile_dir, so they run in this process
+    save_audio = F5TTSService.save_audio
+    cleanup = F5TTSService.cleanup
+
+    def has_voice(self, voice):
+        return self._call("has_voice", voice)
+
+    def set_default_voice(self, voice):
+        self._call("set_default_voice", voice)
+        self.voice_profile = voice
+
+    def list_voices(self):
+        return self._call("list_voices")
+
+    def get_cache_stats(self):
+        return self._call("get_cache_stats")
+
+    def get_step_stats(self):
+        return self._call("get_step_stats")
+
+    def set_latency_budget(self, seconds):
+        self._call("set_latency_budget", seconds)
+
+    def get_worker_stats(self):
+        return {
+            "pid": self.process.pid if self.process else None,
+            "alive": self.process is not None and self.process.poll() is None,
+            "ready": self._ready.is_set(),
+            "restarts": self.restarts,
+            "requests": self.requests,
+            "failures": self.failures,
+            "timeouts": self.timeouts
+        }
+
+    def close(self):
+        """Stop the worker and free the shared slots"""
+        if self._closing and self.process is None:
+            return
+        self._closing = True
+        self._ready.clear()
+        if self.process is not None and self.process.poll() is None:
+            try:
+                with self._send_lock:
+                    self._conn.send(None)
+                self.process.wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+        self.process = None
+        self._release_slots()
+
+    def _release_slots(self):
+        for slot in self._slots:
+            try:
+                slot.close()
+                slot.unlink()
+            except (OSError, FileNotFoundError):
+                pass
+        self._slots = []
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s tts-worker %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, required=True)
+    args = parser.parse_args()
+    serve((args.host, args.port), bytes.fromhex(os.environ[AUTHKEY_ENV]))
@@ -0,0 +1,245 @@
+"""Precomputed reference-voice conditioning for F5TTS voice profiles.
+
+Each voice profile (voice_profiles/<name>/) gets a `.conditioning/`
+directory holding the preprocessed reference audio (silence-clipped,
+loudness-normalized, resampled to 24 kHz) and its mel spectrogram as .npy
+files, plus a meta.json with the reference text. Startup memory-maps these
+instead of re-running preprocess_ref_audio_text, and every synthesis
+reuses the mel instead of recomputing it.
+
+The artifact is rebuilt when the cache version, the mel settings, samples.txt
+or the reference clip itself change.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import torch
+import torchaudio
+from f5_tts.infer.utils_infer import preprocess_ref_audio_text, target_rms, target_sample_rate
+
+# Bump when the artifact layout or preprocessing changes
+CONDITIONING_VERSION = 1
+CONDITIONING_DIR = ".conditioning"
+
+
+class VoiceConditioning:
+    """Reference audio, text and mel for one voice, ready for CFM.sample"""
+
+    def __init__(self, name, audio, mel, ref_text, ref_rms, fingerprint=None):
+        self.name = name
+        self.audio = audio  # (1, samples) at 24 kHz, normalized to target_rms if it was quieter
+        self.mel = mel  # (1, frames, n_mels), the `cond` passed to CFM.sample
+        self.ref_text = ref_text
+        self.ref_rms = ref_rms  # Loudness of the original clip; generated audio is scaled back to it
+        self.fingerprint = fingerprint  # Hash of the reference clip and mel settings this was built from
+
+    @property
+    def duration(self):
+        return self.audio.shape[-1] / target_sample_rate
+
+    def to(self, device):
+        return VoiceConditioning(
+            self.name, self.audio.to(device), self.mel.to(device), self.ref_text, self.ref_rms, self.fingerprint)
+
+
+def read_samples_file(voice_profile_dir):
+    """(reference clip path, reference text) from the first line of samples.txt"""
+    samples_file = os.path.join(voice_profile_dir, "samples.txt")
+    if not os.path.exists(samples_file):
+        raise FileNotFoundError(f"Voice profile samples not found: {samples_file}")
+
+    with open(samples_file, 'r') as f:
+        first_sample = f.readline().strip().split('|')
+    if len(first_sample) != 2:
+        raise ValueError("Invalid sample format in samples.txt")
+
+    audio_file, text = first_sample
+    if not os.path.isabs(audio_file) and not os.path.exists(audio_file):
+        # Allow clip paths relative to the profile directory
+        candidate = os.path.join(voice_profile_dir, audio_file)
+        if os.path.exists(candidate):
+            audio_file = candidate
+    return audio_file, text
+
+
+def _fingerprint(voice_profile_dir, audio_file, mel_spec):
+    """Everything the artifact depends on, hashed"""
+    sha = hashlib.sha256()
+    sha.update(f"v{CONDITIONING_VERSION}".encode())
+    sha.update(json.dumps({
+        "sample_rate": mel_spec.target_sample_rate,
+        "n_mels": mel_spec.n_mel_channels,
+        "n_fft": mel_spec.n_fft,
+        "hop_length": mel_spec.hop_length,
+        "win_length": mel_spec.win_length,
+        "extractor": getattr(mel_spec.extractor, "__name__", "")
+    }, sort_keys=True).encode())
+    with open(os.path.join(voice_profile_dir, "samples.txt"), "rb") as f:
+        sha.update(f.read())
+    with open(audio_file, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _load_artifact(cache_dir, fingerprint):
+    try:
+        with open(os.path.join(cache_dir, "meta.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get("version") != CONDITIONING_VERSION or meta.get("fingerprint") != fingerprint:
+            return None
+        # Copy-on-write maps: pages load on demand, tensors can wrap them without copying
+        audio = np.load(os.path.join(cache_dir, "audio.npy"), mmap_mode='c')
+        mel = np.load(os.path.join(cache_dir, "mel.npy"), mmap_mode='c')
+        return meta, audio, mel
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _build_artifact(cache_dir, fingerprint, audio_file, text, mel_spec):
+    ref_audio_path, ref_text = preprocess_ref_audio_text(audio_file, text)
+    audio, sr = torchaudio.load(ref_audio_path)
+    if audio.shape[0] > 1:
+        audio = torch.mean(audio, dim=0, keepdim=True)
+
+    # Same normalization infer_batch_process applies to the reference on every call
+    ref_rms = torch.sqrt(torch.mean(torch.square(audio))).item()
+    if ref_rms < target_rms:
+        audio = audio * target_rms / ref_rms
+    if sr != target_sample_rate:
+        audio = torchaudio.transforms.Resample(sr, target_sample_rate)(audio)
+
+    with torch.inference_mode():
+        mel = mel_spec(audio.to(mel_spec.dummy.device)).permute(0, 2, 1).cpu()
+
+    # Write into a scratch directory and swap it in, so readers never see half an artifact
+    tmp_dir = f"{cache_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    np.save(os.path.join(tmp_dir, "audio.npy"), audio.numpy().astype(np.float32))
+    np.save(os.path.join(tmp_dir, "mel.npy"), mel.numpy().astype(np.float32))
+    meta = {
+        "version": CONDITIONING_VERSION,
+        "fingerprint": fingerprint,
+        "source_audio": os.path.abspath(audio_file),
+        "ref_text": ref_text,
+        "ref_rms": ref_rms,
+        "sample_rate": target_sample_rate
+    }
+    with open(os.path.join(tmp_dir, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+    return _load_artifact(cache_dir, fingerprint)
+
+
+def load_voice_conditioning(voice_profile_dir, mel_spec, device="cpu"):
+    """Conditioning for the profile, from its cached artifact when still valid"""
+    name = os.path.basename(os.path.normpath(voice_profile_dir))
+    audio_file, text = read_samples_file(voice_profile_dir)
+    if not os.path.exists(audio_file):
+        raise FileNotFoundError(f"Reference audio not found: {audio_file}")
+
+    cache_dir = os.path.join(voice_profile_dir, CONDITIONING_DIR)
+    fingerprint = _fingerprint(voice_profile_dir, audio_file, mel_spec)
+    artifact = _load_artifact(cache_dir, fingerprint)
+    if artifact is None:
+        logging.info(f"Preprocessing reference voice '{name}' (cached for next time)")
+        artifact = _build_artifact(cache_dir, fingerprint, audio_file, text, mel_spec)
+    else:
+        logging.info(f"Loaded cached conditioning for voice '{name}'")
+
+    meta, audio, mel = artifact
+    conditioning = VoiceConditioning(
+        name,
+        torch.from_numpy(audio),
+        torch.from_numpy(mel),
+        meta["ref_text"],
+        meta["ref_rms"],
+        meta["fingerprint"]
+    )
+    return conditioning.to(device) if str(device) != "cpu" else conditioning
+
+
+def valid_voice_name(name):
+    """Voice names come from the web UI; only a plain directory name may reach the filesystem"""
+    if not isinstance(name, str) or name in ("", ".", ".."):
+        return False
+    return os.path.basename(name) == name and not (os.altsep and os.altsep in name)
+
+
+class VoicePool:
+    """Conditioning for every voice under voice_profiles/, loaded on first use.
+
+    The model and vocoder are shared; only the small per-voice conditioning
+    lives here. At most `max_loaded` voices stay resident, least recently
+    used first out; an evicted voice reloads from its cached artifact.
+    """
+
+    def __init__(self, voices_dir, mel_spec, device="cpu", max_loaded=4):
+        self.voices_dir = voices_dir
+        self.mel_spec = mel_spec
+        self.device = device
+        self.max_loaded = max_loaded
+
+        self._loaded = OrderedDict()  # name -> VoiceConditioning, least recently used first
+        self._lock = threading.Lock()
+        self._load_locks = {}  # name -> Lock held while that voice loads
+        self.loads = 0
+        self.evictions = 0
+
+    def available(self):
+        """Names of the voice profiles on disk"""
+        if not os.path.isdir(self.voices_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.voices_dir)
+            if os.path.exists(os.path.join(self.voices_dir, name, "samples.txt"))
+        )
+
+    def has_voice(self, name):
+        return valid_voice_name(name) and os.path.exists(os.path.join(self.voices_dir, name, "samples.txt"))
+
+    def get(self, name):
+        """Conditioning for `name`, loading it (and evicting the stalest voice) if needed"""
+        if not valid_voice_name(name):
+            raise ValueError(f"Invalid voice profile name '{name}'")
+        with self._lock:
+            voice = self._loaded.get(name)
+            if voice is not None:
+                self._loaded.move_to_end(name)
+                return voice
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # One loader per voice; other voices keep being served meanwhile
+        with load_lock:
+            with self._lock:
+                voice = self._loaded.get(name)
+            if voice is None:
+                if not self.has_voice(name):
+                    raise ValueError(f"Unknown voice profile '{name}'")
+                voice = load_voice_conditioning(os.path.join(self.voices_dir, name), self.mel_spec, self.device)
+                with self._lock:
+                    self.loads += 1
+                    self._loaded[name] = voice
+                    while len(self._loaded) > self.max_loaded:
+                        evicted, _ = self._loaded.popitem(last=False)
+                        self.evictions += 1
+                        logging.info(f"Evicted voice '{evicted}' from the voice pool")
+            return voice
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "available": self.available(),
+                "loaded": list(self._loaded),
+                "max_loaded": self.max_loaded,
+                "loads": self.loads,
+                "evictions": self.evictions
+            }
@@ -15,7 +15,8 @@ import sys
 import logging
 import subprocess
 from pathlib import Path
-from fivetts.tts_service import F5TTSService
+from fivetts.service_loader import loader as tts_loader
+from ears.model_registry import registry as stt_model_registry
 
 # Load environment variables
 load_dotenv()
@@ -79,6 +80,13 @@ app = Flask(__name__)
 DISCORD_USER = os.getenv('DISCORD_USER')
 DISCORD_PASS = os.getenv('DISCORD_PASS')
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+STT_BACKEND = os.getenv('STT_BACKEND', 'torch')  # torch, int8 or onnx
+LOG_CONVERSATIONS = os.getenv('LOG_CONVERSATIONS', '1').lower() not in ('0', 'false', 'no')
+STT_TRIMMED_ENCODER = os.getenv('STT_TRIMMED_ENCODER', '0').lower() in ('1', 'true', 'yes')
+TTS_LATENCY_BUDGET = float(os.getenv('TTS_LATENCY_BUDGET')) if os.getenv('TTS_LATENCY_BUDGET') else None
+TTS_WORKER = os.getenv('TTS_WORKER', '0').lower() in ('1', 'true', 'yes')
+TTS_CPU_PROFILE = os.getenv('TTS_CPU_PROFILE', 'fp32')  # fp32, int8 or bf16
+TTS_THREADS = int(os.getenv('TTS_THREADS')) if os.getenv('TTS_THREADS') else None
 CHANNELS_FILE = 'channels.json'
 SETTINGS_FILE = 'settings.json'
 
@@ -106,15 +114,19 @@ class DiscordAssistant:
             self.youtube_manager = None
             self.conversation_manager = ConversationManager(
                 openai_api_key=OPENAI_API_KEY,
-                audio_config=self.audio_config
+                audio_config=self.audio_config,
+                stt_backend=STT_BACKEND,
+                log_conversations=LOG_CONVERSATIONS,
+                trimmed_encoder=STT_TRIMMED_ENCODER,
+                tts_latency_budget=TTS_LATENCY_BUDGET,
+                tts_worker=TTS_WORKER
             )
             self.mode_threads = {}
             self.channels = self.load_channels()
             self.settings = self.load_settings()
             self.initialize_audio_devices()
             
-            # Initialize TTS Service
-            self.tts_service = F5TTSService()
+            # TTS is the shared service from tts_loader, started before the assistant
             # Configure output device for TTS
             sd.default.device[1] = self.audio_config['output_device']
             
@@ -347,10 +359,13 @@ class DiscordAssistant:
                     
             elif mode == "youtube":
                 system_prompt = kwargs.get('system_prompt')
+                decoding_profile = kwargs.get('decoding_profile')
                 if not self.youtube_manager:
                     self.youtube_manager = YouTubeManager(OPENAI_API_KEY)
                 if system_prompt:
                     self.youtube_manager.set_system_prompt(system_prompt)
+                if decoding_profile:
+                    self.youtube_manager.whisper.set_decoding_profile(decoding_profile)
                 
                 youtube_thread = self.youtube_manager.start()
                 self.mode_threads[mode] = youtube_thread
@@ -359,6 +374,8 @@ class DiscordAssistant:
             elif mode == "conversation":
                 system_prompt = kwargs.get('system_prompt')
                 audio_config = kwargs.get('audio_config')
+                decoding_profile = kwargs.get('decoding_profile')
+                voice = kwargs.get('voice')
                 
                 # Ensure we have valid audio device info
                 if not audio_config or 'input_device' not in audio_config:
@@ -373,12 +390,20 @@ class DiscordAssistant:
                             'input_device': audio_config['input_device'],  # CABLE Output for listening
                             'output_device': audio_config['output_device'],  # CABLE Input for speaking
                             'sample_rate': audio_config['sample_rate']
-                        }
+                        },
+                        stt_backend=STT_BACKEND,
+                        log_conversations=LOG_CONVERSATIONS,
+                        trimmed_encoder=STT_TRIMMED_ENCODER,
+                        tts_latency_budget=TTS_LATENCY_BUDGET,
+                        tts_worker=TTS_WORKER
                     )
                     logging.info(f"Created conversation manager with audio config: {audio_config}")
                 
                 if system_prompt:
                     self.conversation_manager.set_system_prompt(system_prompt)
+                if decoding_profile:
+                    self.conversation_manager.set_decoding_profile(decoding_profile)
+                self.conversation_manager.set_voice(voice)
                 
                 conversation_thread = self.conversation_manager.start()
                 self.mode_threads[mode] = conversation_thread
@@ -403,6 +428,14 @@ class DiscordAssistant:
             return True
         return False
 
+# Load the one shared TTS service in the background; the UI reports its progress
+tts_loader.start(
+    worker=TTS_WORKER,
+    latency_budget=TTS_LATENCY_BUDGET,
+    cpu_profile=TTS_CPU_PROFILE,
+    cpu_threads=TTS_THREADS
+)
+
 # Initialize DiscordAssistant with audio_config before starting the browser
 assistant = DiscordAssistant(audio_config=audio_config)
 
@@ -487,6 +520,58 @@ def set_audio_devices():
     success = assistant.set_audio_devices(input_device, output_device)
     return jsonify({"success": success})
 
+@app.route('/api/models/memory', methods=['GET'])
+def get_model_memory():
+    """Report which shared STT models are resident and how much memory they hold"""
+    return jsonify(stt_model_registry.report())
+
+@app.route('/api/tts/status', methods=['GET'])
+def get_tts_status():
+    """Whether the shared TTS service is loading, ready or failed"""
+    return jsonify(tts_loader.status())
+
+@app.route('/api/tts/cache', methods=['GET'])
+def get_tts_cache_stats():
+    """Phrase cache hit/miss counters of the shared TTS service"""
+    if not tts_loader.ready:
+        return jsonify({"success": False, "error": "TTS service not loaded yet"})
+    return jsonify(tts_loader.service.get_cache_stats())
+
+@app.route('/api/tts/steps', methods=['GET'])
+def get_tts_step_stats():
+    """Latency budget, calibrated step costs and how often the budget was exceeded"""
+    if not tts_loader.ready:
+        return jsonify({"success": False, "error": "TTS service not loaded yet"})
+    return jsonify(tts_loader.service.get_step_stats())
+
+@app.route('/api/tts/voices', methods=['GET'])
+def get_tts_voices():
+    """Voice profiles on disk, which are loaded, and the conversation's current voice"""
+    if not tts_loader.ready:
+        return jsonify({"success": False, "error": "TTS service not loaded yet"})
+    voices = tts_loader.service.list_voices()
+    manager = assistant.conversation_manager
+    voices["current"] = (manager.voice if manager else None) or voices["default"]
+    return jsonify(voices)
+
+@app.route('/api/tts/voice', methods=['POST'])
+def set_tts_voice():
+    """Switch the running conversation to another voice without reloading the model"""
+    if not assistant.conversation_manager:
+        return jsonify({"success": False, "error": "Conversation manager not initialized"})
+    try:
+        assistant.conversation_manager.set_voice(request.json.get('voice'))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)})
+    return jsonify({"success": True})
+
+@app.route('/api/conversation/pipeline', methods=['GET'])
+def get_conversation_pipeline():
+    """Queue depth and timing spans of each conversation stage, plus recent turn latencies"""
+    if not assistant.conversation_manager:
+        return jsonify({"success": False, "error": "Conversation manager not initialized"})
+    return jsonify(assistant.conversation_manager.get_pipeline_stats())
+
 @app.route('/api/browser/status', methods=['GET'])
 def get_browser_status():
     if assistant.browser:
@@ -1,7 +1,9 @@
+import asyncio
 import threading
 import time
 from chatgpt.text import TextManager
-from fivetts.tts_service import F5TTSService
+from fivetts.service_loader import loader as tts_loader
+from fivetts.voice_conditioning import valid_voice_name
 from ears.whisper_manager import WhisperManager
 from collections import deque
 import soundfile as sf
@@ -9,13 +11,36 @@ import numpy as np
 import sounddevice as sd
 import logging
 import scipy.signal
-import os
 from .conversation_logger import ConversationLogger
+from .pipeline import Pipeline, Stage
+from .speech_stream import ChunkPlayer, split_sentences
+
+
+class Turn:
+    """One user utterance and the reply to it, on its way through the pipeline"""
+
+    def __init__(self, turn_id, user_text, user_audio_path=None):
+        self.turn_id = turn_id
+        self.user_text = user_text
+        self.user_audio_path = user_audio_path
+        self.heard_at = time.perf_counter()
+        self.reply = None
+        self.reply_ready_at = None
+        self.llm_seconds = 0.0
+        self.synthesis_seconds = 0.0
+        self.chunks = 0
+        self.audio_parts = []
+        self.sample_rate = None
+
 
 class ConversationManager:
-    def __init__(self, openai_api_key, audio_config=None):
+    def __init__(self, openai_api_key, audio_config=None, streaming_stt=False, stt_backend="torch",
+                 log_conversations=True, trimmed_encoder=False, tts_latency_budget=None, tts_worker=False):
         self.text_manager = TextManager(openai_api_key)
-        self.speech_manager = F5TTSService()
+        # TTS is the process-wide shared service, loading in the background; if main.py
+        # already started it, its settings are used. With a latency budget each sentence
+        # gets as many synthesis steps as fit in it
+        tts_loader.start(worker=tts_worker, latency_budget=tts_latency_budget)
         
         # Validate audio configuration
         if not audio_config:
@@ -29,148 +54,243 @@ class ConversationManager:
         # Initialize whisper to listen to Discord's audio output
         self.whisper = WhisperManager(
             threshold=0.03,
-            input_device=self.input_device  # Listen to CABLE Output where Discord audio comes out
+            input_device=self.input_device,  # Listen to CABLE Output where Discord audio comes out
+            streaming=streaming_stt,  # Decode while the user is still talking
+            backend=stt_backend,  # torch, int8 or onnx
+            persist_segments=log_conversations,  # Segments are only kept for the conversation log
+            trimmed_encoder=trimmed_encoder  # Skip encoding the padding of short utterances
         )
         
         self.conversation_history = deque(maxlen=5)
         self.stop_event = threading.Event()
         self.system_prompt = "You are a helpful assistant."
         
-        # Audio configuration
-        self.channels = 1
-        self.chunk_duration = 0.5
-        self.chunk_size = int(self.sample_rate * self.chunk_duration)
-        self.audio_format = np.float32
-        
-        # Stream configuration
-        self.stream_config = {
-            'channels': self.channels,
-            'samplerate': self.sample_rate,
-            'blocksize': self.chunk_size,
-            'dtype': self.audio_format
-        }
-        
-        self.is_speaking = False
-        self.last_speech_time = 0
-        self.last_speech_duration = 0
+        # All capture (device stream, VAD, segmentation) lives in WhisperManager;
+        # this mode only consumes its transcriptions
+        self.capture_channels = 2  # Match Discord's stereo output
+
+        self.log_conversations = log_conversations
         self.logger = ConversationLogger()
 
+        # Turns run through asyncio stages (see _build_pipeline) on the conversation
+        # thread; replies are spoken piece by piece as they are synthesized
+        self.voice = None  # Voice profile for this mode; the service default if None
+        self.pipeline = None
+        self._loop = None
+        self._task = None
+        self.player = None  # Output stream of the reply being spoken
+        self.turn_count = 0
+        self.echo_window = 2.0  # Seconds our own voice is ignored after a reply
+        self.quiet_at = 0.0  # time.monotonic() when the echo window closes
+        self.turn_timings = deque(maxlen=50)  # Per-turn time-to-first-audio and synthesis stats
+
     def set_system_prompt(self, prompt):
         """Allow user to set the system prompt for the conversation"""
         self.system_prompt = prompt
         self.logger.set_system_prompt(prompt)
         print(f"System prompt updated to: {prompt}")
 
-    def transcribe_audio_stream(self):
-        """Continuously check for and process transcriptions"""
+    @property
+    def speech_manager(self):
+        """The shared TTS service; blocks until it has loaded"""
+        return tts_loader.wait()
+
+    def set_voice(self, voice):
+        """Speak with another voice profile from the next sentence on; the model stays loaded"""
+        # While TTS is still loading the name is checked once it's ready (see _run)
+        if voice and not valid_voice_name(voice):
+            raise ValueError(f"Invalid voice profile name '{voice}'")
+        if voice and tts_loader.ready and not self.speech_manager.has_voice(voice):
+            raise ValueError(f"Unknown voice profile '{voice}'")
+        self.voice = voice or None
+        print(f"Voice set to: {voice or 'default'}")
+
+    def set_decoding_profile(self, profile):
+        """Select the Whisper decoding profile ('fast', 'balanced', 'accurate') for this mode"""
+        self.whisper.set_decoding_profile(profile)
+
+    def _build_pipeline(self):
+        """LLM -> TTS -> playback; capture, VAD and STT run upstream in WhisperManager"""
+        # One worker per stage: replies must be spoken in order, history is appended
+        # in order, and there is one output stream. The next turn's reply is written
+        # and synthesized while the current one plays; queues are small so a turn
+        # stuck behind a slow stage doesn't build up a backlog of stale work
+        return Pipeline([
+            Stage("llm", self._respond, concurrency=1, maxsize=2,
+                  key=lambda turn: turn.turn_id),
+            Stage("tts", self._synthesize, concurrency=1, maxsize=2,
+                  on_error=self._synthesis_failed, key=lambda turn: turn.turn_id),
+            Stage("playback", self._play, concurrency=1, maxsize=16,
+                  on_error=self._playback_failed, key=lambda piece: piece[0].turn_id)
+        ])
+
+    async def _converse(self):
+        """Feed transcripts into the pipeline until listening stops or the task is cancelled"""
+        self._loop = asyncio.get_running_loop()
+        self.pipeline = self._build_pipeline()
+        self.pipeline.start()
         try:
             while not self.stop_event.is_set():
-                try:
-                    # Check if we're currently speaking or recently finished
-                    current_time = time.time()
-                    if hasattr(self, 'is_speaking') and self.is_speaking:
-                        time.sleep(0.1)
-                        continue
-                    
-                    if hasattr(self, 'last_speech_time') and hasattr(self, 'last_speech_duration'):
-                        time_since_speech = current_time - self.last_speech_time
-                        if time_since_speech < self.last_speech_duration:
-                            time.sleep(0.1)
-                            continue
-
-                    # Get transcription from whisper queue
-                    transcription = self.whisper.get_transcription()
-                    
-                    # Only process if we got a valid transcription and we're not speaking
-                    if (transcription and 
-                        transcription.strip() and 
-                        transcription not in ["No speech detected.", "Transcription failed."] and
-                        not getattr(self, 'is_speaking', False)):
-                        
-                        # Get the audio file path from whisper
-                        user_audio_path = self.whisper.last_audio_file
-                        
-                        logging.info(f"User said: {transcription}")
-                        
-                        # Add to conversation history
-                        self.conversation_history.append({
-                            "role": "user", 
-                            "content": transcription
-                        })
-                        
-                        # Generate and speak response
-                        self.generate_response(transcription)
-                        
-                        # Log the interaction after response is generated
-                        if hasattr(self, 'last_assistant_audio'):
-                            self.logger.log_interaction(
-                                user_audio_path=user_audio_path,
-                                assistant_audio_path=self.last_assistant_audio,
-                                user_text=transcription,
-                                assistant_text=self.conversation_history[-1]["content"],
-                                conversation_history=list(self.conversation_history)
-                            )
-                    
-                    time.sleep(0.1)
-                        
-                except Exception as e:
-                    logging.error(f"Error in transcription loop: {e}", exc_info=True)
-                    time.sleep(1)
+                # Wakes when a segment is transcribed; None once listening stops
+                transcript = await self.whisper.next_transcript_async()
+                if transcript is None:
+                    break
+                transcription = transcript["text"].strip()
+                if not transcription:
                     continue
-                    
-        except Exception as e:
-            logging.error(f"Fatal error in transcription stream: {e}", exc_info=True)
-            self.stop()
 
-    def generate_response(self, user_input):
-        """Generate and speak assistant response"""
+                # Answered at once; only its playback waits for the assistant to be quiet
+                self.turn_count += 1
+                turn = Turn(self.turn_count, transcription, transcript.get("audio_file"))
+                logging.info(f"User said: {transcription}")
+                self.conversation_history.append({"role": "user", "content": transcription})
+                await self.pipeline.put(turn)
+        finally:
+            await self.pipeline.stop()
+            self._close_player()
+
+    async def _until_quiet(self):
+        """Wait for the echo window of the previous reply to pass"""
+        remaining = self.quiet_at - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+    def _end_turn(self):
+        self.quiet_at = time.monotonic() + self.echo_window
+
+    async def _respond(self, turn, emit):
+        """LLM stage: the assistant's reply text"""
+        started = time.perf_counter()
+        response = await asyncio.to_thread(
+            self.text_manager.text_to_text,
+            system_prompt=self.system_prompt,
+            user_prompt=turn.user_text
+        )
+        turn.reply = response.content
+        turn.llm_seconds = time.perf_counter() - started
+        print(f"Assistant said: {turn.reply}")
+        self.conversation_history.append({"role": "assistant", "content": turn.reply})
+        await emit(turn)
+
+    async def _synthesize(self, turn, emit):
+        """TTS stage: audio pieces of the reply, sentence by sentence, then an end marker"""
+        turn.reply_ready_at = time.perf_counter()
+        chunks = split_sentences(turn.reply)
+        turn.chunks = len(chunks)
+        for i, chunk in enumerate(chunks):
+            pieces = self.speech_manager.synthesize_stream(chunk, voice=self.voice)
+            produced = False
+            while True:
+                piece_start = time.perf_counter()
+                piece = await asyncio.to_thread(next, pieces, None)
+                turn.synthesis_seconds += time.perf_counter() - piece_start
+                if piece is None:
+                    break
+                produced = True
+                audio, rate = piece
+                await emit((turn, audio, rate))
+            if not produced:
+                logging.warning(f"Skipping chunk {i + 1}/{len(chunks)} that failed to synthesize")
+        await emit((turn, None, None))
+
+    async def _play(self, piece, emit):
+        """Playback stage: pieces go out back-to-back; the end marker waits for them to finish"""
+        turn, audio, rate = piece
+        if audio is not None:
+            if self.player is None:
+                # The previous reply has finished playing (pieces arrive in order);
+                # start as soon as its echo window has passed
+                await self._until_quiet()
+                turn.sample_rate = rate
+                self.player = ChunkPlayer(rate, device=self.output_device)
+                self.player.enqueue(audio)
+                self.player.start()
+            elif rate != turn.sample_rate:
+                logging.warning(f"Chunk sample rate {rate} differs from stream rate {turn.sample_rate}, skipping")
+                return
+            else:
+                self.player.enqueue(audio)
+            turn.audio_parts.append(audio)
+            return
+
+        player = self.player
+        if player is not None:
+            player.finish()
+            await asyncio.to_thread(player.wait)
+            self._close_player()
+            self._finish_turn(turn, player)
+            self._end_turn()
+
+    def _finish_turn(self, turn, player):
+        """Record the spoken turn's timings and log it off the speech path"""
+        audio = np.concatenate(turn.audio_parts)
+        first_audio = player.first_audio_time
+        timings = {
+            "turn": turn.turn_id,
+            "chunks": turn.chunks,
+            "llm_seconds": turn.llm_seconds,
+            "time_to_first_audio": first_audio - turn.reply_ready_at if first_audio else None,
+            "response_latency": first_audio - turn.heard_at if first_audio else None,
+            "synthesis_seconds": turn.synthesis_seconds,
+            "audio_seconds": audio.size / turn.sample_rate,
+            "underruns": player.underruns
+        }
+        self.turn_timings.append(timings)
+        # No first audio when playback was cut before the device took a block
+        first_audio_after = (f"{timings['time_to_first_audio']:.2f}s"
+                             if timings['time_to_first_audio'] is not None else "n/a")
+        logging.info(f"Reply spoken: {timings['chunks']} chunks, LLM {turn.llm_seconds:.2f}s, first audio after "
+                     f"{first_audio_after}, synthesis {timings['synthesis_seconds']:.2f}s "
+                     f"for {timings['audio_seconds']:.2f}s of audio, {timings['underruns']} underruns")
+
+        # Only the conversation log needs a file; write it off the speech path
+        if self.log_conversations:
+            threading.Thread(
+                target=self._log_turn,
+                args=(audio, turn.sample_rate, turn.user_text, turn.user_audio_path, turn.reply,
+                      list(self.conversation_history)),
+                name="conversation-log",
+                daemon=True
+            ).start()
+
+    async def _synthesis_failed(self, turn, error, emit):
+        # Play whatever was synthesized and close the turn
+        await emit((turn, None, None))
+
+    async def _playback_failed(self, piece, error, emit):
         try:
-            # Get assistant response
-            response = self.text_manager.text_to_text(
-                system_prompt=self.system_prompt,
-                user_prompt=user_input
-            )
-            print(f"Assistant said: {response.content}")
-            # Add response to history
-            self.conversation_history.append({"role": "assistant", "content": response.content})
-            
-            # Convert response to speech using F5TTS in a separate thread
-            speech_thread = threading.Thread(
-                target=self._generate_and_play_speech,
-                args=(response.content,),
-                daemon=False
-            )
-            speech_thread.start()
-            
-        except Exception as e:
-            print(f"Error generating response: {e}")
+            self._close_player()
+        finally:
+            # Part of the reply may have played
+            self._end_turn()
+
+    def _close_player(self):
+        player, self.player = self.player, None
+        if player is not None:
+            player.close()
 
-    def _generate_and_play_speech(self, text):
-        """Helper method to generate and play speech to virtual microphone"""
+    def get_pipeline_stats(self):
+        """Per-stage queue depth and timing spans, recent turns, and the capture/STT counters"""
+        return {
+            "stages": self.pipeline.get_stats() if self.pipeline is not None else None,
+            "turns": list(self.turn_timings)[-10:],
+            "capture": self.whisper.get_capture_stats()
+        }
+
+    def _log_turn(self, audio, samplerate, user_text, user_audio_path, assistant_text, history):
+        """Write the spoken reply to disk and record the interaction"""
         try:
-            self.is_speaking = True
-            
-            # Generate and play speech
-            speech_file = self.speech_manager.synthesize(text)
-            if speech_file and os.path.exists(speech_file):
-                # Store the speech file path for logging
-                self.last_assistant_audio = speech_file
-                
-                # Read and play the audio
-                data, samplerate = sf.read(speech_file)
-                
-                duration = len(data) / samplerate
-                self.last_speech_time = time.time()
-                self.last_speech_duration = duration + 2.0
-                
-                sd.play(data, samplerate, device=self.output_device, blocking=True)
-                time.sleep(1.0)
-                
-            self.is_speaking = False
-                
+            speech_file = self.speech_manager.save_audio(audio, samplerate)
+            self.last_assistant_audio = speech_file
+            self.logger.log_interaction(
+                user_audio_path=self.whisper.resolve_audio_file(user_audio_path),
+                assistant_audio_path=speech_file,
+                user_text=user_text,
+                assistant_text=assistant_text,
+                conversation_history=history
+            )
         except Exception as e:
-            self.is_speaking = False
-            logging.error(f"Error in speech generation/playback: {e}")
+            logging.error(f"Error logging conversation turn: {e}")
 
     def play_audio_file(self, file_path):
         """Play audio file through default output device"""
@@ -201,37 +321,65 @@ class ConversationManager:
     def stop(self):
         """Stop the conversation manager"""
         self.stop_event.set()
+        # Cuts playback at once; the stages are cancelled on the conversation thread
+        self._close_player()
+        loop, task = self._loop, self._task
+        if loop is not None and task is not None:
+            loop.call_soon_threadsafe(task.cancel)
         self.logger.end_session()  # End logging session
         if hasattr(self, 'whisper'):
             self.whisper.stop_listening()
-        if hasattr(self, 'speech_manager'):
-            self.speech_manager.cleanup()
+            logging.info(f"Audio capture stats: {self.whisper.get_capture_stats()}")
+        # The TTS service is shared with other modes and the log writer; the loader
+        # cleans it up at process exit
 
     def start(self):
-        """Start the conversation manager"""
+        """Start the conversation manager; listening begins once the shared TTS service is ready"""
         self.stop_event.clear()
         self.logger.start_session()  # Start new logging session
         
+        # Create non-daemon thread before starting it
+        conversation_thread = threading.Thread(
+            target=self._run,
+            daemon=False  # Set daemon status before starting
+        )
+        conversation_thread.start()
+        
+        return conversation_thread
+
+    async def _run_pipeline(self):
+        self._task = asyncio.current_task()
+        try:
+            await self._converse()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._task = None
+            self._loop = None
+
+    def _run(self):
         try:
+            # Nothing is heard until replies can be spoken, so nobody gets a stale answer
+            if not tts_loader.ready:
+                logging.info("Waiting for the TTS service to finish loading...")
+            speech_manager = tts_loader.wait(stop_event=self.stop_event)
+            if speech_manager is None:
+                return
+            if self.voice and not speech_manager.has_voice(self.voice):
+                logging.error(f"Unknown voice profile '{self.voice}', using the default voice")
+                self.voice = None
+
             # Start the whisper listening stream
             success = self.whisper.start_listening(
                 sample_rate=self.sample_rate,
-                channels=2  # Match Discord's stereo output
+                channels=self.capture_channels
             )
             
             if not success:
                 raise RuntimeError("Failed to start Whisper listening stream")
             
-            # Create non-daemon thread before starting it
-            transcription_thread = threading.Thread(
-                target=self.transcribe_audio_stream,
-                daemon=False  # Set daemon status before starting
-            )
-            transcription_thread.start()
-            
-            return transcription_thread
-            
+            asyncio.run(self._run_pipeline())
+
         except Exception as e:
             logging.error(f"Failed to start conversation: {e}")
-            self.stop()
-            raise
\ No newline at end of file
+            self.stop()
\ No newline at end of file
@@ -42,24 +42,23 @@ class ConversationLogger:
         if not self.current_session:
             self.start_session()
             
-        # Create paths for copied audio files
+        # Create paths for copied audio files, keeping each source's format
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        user_audio_name = f"user_{timestamp}.wav"
-        assistant_audio_name = f"assistant_{timestamp}.wav"
-        
-        # Copy audio files to log directory
-        user_audio_dest = self.base_dir / "audio" / user_audio_name
-        assistant_audio_dest = self.base_dir / "audio" / assistant_audio_name
+        user_audio_name = self._audio_name("user", timestamp, user_audio_path)
+        assistant_audio_name = self._audio_name("assistant", timestamp, assistant_audio_path)
         
         try:
-            shutil.copy2(user_audio_path, user_audio_dest)
-            shutil.copy2(assistant_audio_path, assistant_audio_dest)
+            # Copy audio files to log directory (a side may be missing if it wasn't persisted)
+            if user_audio_name:
+                shutil.copy2(user_audio_path, self.base_dir / "audio" / user_audio_name)
+            if assistant_audio_name:
+                shutil.copy2(assistant_audio_path, self.base_dir / "audio" / assistant_audio_name)
             
             # Create interaction data
             interaction = {
                 "timestamp": timestamp,
-                "user_audio": str(user_audio_name),
-                "assistant_audio": str(assistant_audio_name),
+                "user_audio": user_audio_name,
+                "assistant_audio": assistant_audio_name,
                 "user_text": user_text,
                 "assistant_text": assistant_text,
                 "conversation_history": [dict(msg) for msg in conversation_history]
@@ -71,6 +70,12 @@ class ConversationLogger:
         except Exception as e:
             logging.error(f"Error logging interaction: {e}")
             
+    def _audio_name(self, role, timestamp, source_path):
+        """Log file name for a copied audio file, or None when there is no source"""
+        if not source_path or not os.path.exists(source_path):
+            return None
+        return f"{role}_{timestamp}{Path(source_path).suffix or '.wav'}"
+
     def save_session(self):
         """Save current session data to JSON file"""
         if self.current_session:
@@ -0,0 +1,139 @@
+"""Asyncio stages connected by bounded queues.
+
+A Stage owns a bounded input queue and `concurrency` worker tasks, each
+running `handler(item, emit)` on one item at a time. Handlers pass results
+on with `await emit(item)`, which waits while the next stage's queue is
+full: a slow stage holds back the ones before it instead of letting work
+pile up, and everything upstream keeps running meanwhile. Blocking work
+(API calls, synthesis, waiting on audio) belongs in asyncio.to_thread so
+the loop stays free.
+
+Every handled item records a timing span (time spent queued, time spent
+in the handler); Pipeline.get_stats() summarizes them per stage. Stopping
+a stage cancels its in-flight handlers and drops whatever is still queued.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+
+
+class Stage:
+    def __init__(self, name, handler, concurrency=1, maxsize=4, on_error=None, key=None, max_spans=200):
+        self.name = name
+        self.handler = handler  # async handler(item, emit)
+        self.concurrency = concurrency  # Items handled at once
+        self.maxsize = maxsize  # Queued items before producers wait
+        self.on_error = on_error  # async on_error(item, error, emit) when the handler raises
+        self.key = key  # item -> label stored with its span
+        self.next = None
+
+        self.queue = None  # Created on the running loop by start()
+        self._tasks = []
+        self.spans = deque(maxlen=max_spans)
+        self.processed = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.wait_seconds = 0.0
+        self.busy_seconds = 0.0
+
+    def start(self):
+        self.queue = asyncio.Queue(self.maxsize)
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"{self.name}-{i}") for i in range(self.concurrency)
+        ]
+
+    async def put(self, item):
+        """Queue an item, waiting while the stage is full"""
+        await self.queue.put((time.perf_counter(), item))
+
+    async def emit(self, item):
+        """Hand an item to the next stage (dropped at the last one)"""
+        if self.next is not None:
+            await self.next.put(item)
+
+    async def _work(self):
+        while True:
+            queued_at, item = await self.queue.get()
+            started = time.perf_counter()
+            try:
+                await self.handler(item, self.emit)
+                self.processed += 1
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+            except Exception as e:
+                self.errors += 1
+                logging.error(f"Pipeline stage '{self.name}' failed: {e}", exc_info=True)
+                if self.on_error is not None:
+                    # A failing handler must not take the worker down with it
+                    try:
+                        await self.on_error(item, e, self.emit)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as handler_error:
+                        logging.error(f"Error handler of pipeline stage '{self.name}' failed: {handler_error}",
+                                      exc_info=True)
+            finally:
+                self._record(item, queued_at, started)
+                self.queue.task_done()
+
+    def _record(self, item, queued_at, started):
+        busy = time.perf_counter() - started
+        self.wait_seconds += started - queued_at
+        self.busy_seconds += busy
+        self.spans.append({
+            "item": self.key(item) if self.key is not None else None,
+            "queued": started - queued_at,
+            "busy": busy
+        })
+
+    async def stop(self):
+        """Cancel in-flight handlers and drop what is still queued"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.queue is not None:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.queue.task_done()
+
+    def get_stats(self):
+        handled = self.processed + self.errors + self.cancelled
+        return {
+            "concurrency": self.concurrency,
+            "maxsize": self.maxsize,
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "processed": self.processed,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "mean_queued": self.wait_seconds / handled if handled else 0.0,
+            "mean_busy": self.busy_seconds / handled if handled else 0.0,
+            "recent": list(self.spans)[-10:]
+        }
+
+
+class Pipeline:
+    """Stages chained in order; items enter at the first one"""
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+        for stage, following in zip(self.stages, self.stages[1:]):
+            stage.next = following
+
+    def start(self):
+        """Start every stage's workers; call from the loop that runs the pipeline"""
+        for stage in self.stages:
+            stage.start()
+
+    async def put(self, item):
+        await self.stages[0].put(item)
+
+    async def stop(self):
+        # Upstream first, so nothing new reaches a stage that is already stopped
+        for stage in self.stages:
+            await stage.stop()
+
+    def get_stats(self):
+        return {stage.name: stage.get_stats() for stage in self.stages}
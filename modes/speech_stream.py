@@ -0,0 +1,135 @@
+import re
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import sounddevice as sd
+
+_SENTENCE_END = re.compile(r'(?<=[.!?…])["\')\]]*\s+')
+_CLAUSE_END = re.compile(r'(?<=[,;:—–])\s+')
+
+
+def split_sentences(text, max_chars=180, min_chars=12):
+    """Split a reply into speakable chunks at sentence, then clause, boundaries.
+
+    Sentences longer than `max_chars` are cut at commas/semicolons/dashes;
+    fragments shorter than `min_chars` are merged into their neighbour so
+    prosody doesn't break up on things like "Yes." or "Well,".
+    """
+    pieces = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        current = ""
+        for clause in _CLAUSE_END.split(sentence):
+            if current and len(current) + len(clause) + 1 > max_chars:
+                pieces.append(current)
+                current = clause
+            else:
+                current = f"{current} {clause}".strip()
+        if current:
+            pieces.append(current)
+
+    chunks = []
+    for piece in pieces:
+        if chunks and (len(chunks[-1]) < min_chars or len(piece) < min_chars):
+            chunks[-1] = f"{chunks[-1]} {piece}"
+        else:
+            chunks.append(piece)
+    return chunks
+
+
+class ChunkPlayer:
+    """Plays audio chunks back-to-back on one output stream.
+
+    Chunks are appended while earlier ones play; the stream callback reads
+    straight through them, so consecutive chunks are gapless. If synthesis
+    falls behind, the callback plays silence and counts an underrun.
+    """
+
+    def __init__(self, sample_rate, device=None, blocksize=1024):
+        self.sample_rate = sample_rate
+        self.device = device
+        self.blocksize = blocksize
+
+        self._chunks = deque()
+        self._offset = 0  # Read position within the first chunk
+        self._lock = threading.Lock()
+        self._finished = False  # No more chunks will be added
+        self.done = threading.Event()  # Everything queued has been played
+
+        self.first_audio_time = None  # perf_counter when the first sample went out
+        self.underruns = 0
+        self.samples_played = 0
+        self.stream = None
+
+    def start(self):
+        self.stream = sd.OutputStream(
+            samplerate=self.sample_rate,
+            device=self.device,
+            channels=1,
+            dtype='float32',
+            blocksize=self.blocksize,
+            callback=self._callback
+        )
+        self.stream.start()
+
+    def enqueue(self, audio):
+        with self._lock:
+            self._chunks.append(np.asarray(audio, dtype=np.float32).reshape(-1))
+
+    def finish(self):
+        """Mark the end of the utterance; `done` is set once the queue drains"""
+        with self._lock:
+            self._finished = True
+            if not self._chunks:
+                self.done.set()
+
+    def _callback(self, outdata, frames, time_info, status):
+        out = outdata[:, 0]
+        written = 0
+        with self._lock:
+            while written < frames and self._chunks:
+                chunk = self._chunks[0]
+                count = min(frames - written, chunk.size - self._offset)
+                out[written:written + count] = chunk[self._offset:self._offset + count]
+                written += count
+                self._offset += count
+                if self._offset >= chunk.size:
+                    self._chunks.popleft()
+                    self._offset = 0
+            drained = not self._chunks
+            finished = self._finished
+
+        if written and self.first_audio_time is None:
+            self.first_audio_time = time.perf_counter()
+        if written < frames:
+            out[written:] = 0
+            if drained and not finished and self.first_audio_time is not None:
+                self.underruns += 1
+        self.samples_played += written
+        if drained and finished:
+            self.done.set()
+
+    def wait(self, timeout=None):
+        """Block until everything has played, then close the stream"""
+        self.done.wait(timeout)
+        stream, self.stream = self.stream, None
+        if stream is not None:
+            # Let the device flush the final block before closing
+            time.sleep(stream.latency)
+            stream.stop()
+            stream.close()
+
+    def close(self):
+        self.finish()
+        with self._lock:
+            self._chunks.clear()
+        self.done.set()
+        self.wait(0)
+
@@ -67,8 +67,9 @@ class YouTubeManager:
             if input_device is not None and output_device is not None:
                 # Set default devices
                 sd.default.device = [input_device, output_device]
-                # Re-initialize whisper with the correct input device
-                self.whisper = WhisperManager(threshold=0.03, input_device=input_device)
+                # Point whisper at the correct input device; the model itself is
+                # shared through the registry, so this doesn't load a second copy
+                self.whisper.input_device = input_device
                 return input_device, output_device
             else:
                 print("Warning: VB-Audio devices not found, using system defaults")